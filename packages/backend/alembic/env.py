@@ -31,6 +31,7 @@ from app.modules.assets.models import *
 from app.modules.learning.models import *
 from app.modules.reports.models import *
 from app.modules.tasks.models import *
+from app.modules.emails.models import *
 from app.modules.task_templates.models import *
 target_metadata = Base.metadata
 
@@ -0,0 +1,27 @@
+"""Add composite indexes backing keyset pagination on list endpoints
+
+Revision ID: 7a3d9e4b2c18
+Revises: 5e2f8a9c1d47
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '7a3d9e4b2c18'
+down_revision = '5e2f8a9c1d47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_owner_id_created_at_id', 'tasks', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+    op.create_index('ix_assets_created_at_id', 'assets', ['created_at', 'id'], unique=False)
+    op.create_index('ix_contacts_last_name_id', 'contacts', ['last_name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_last_name_id', table_name='contacts')
+    op.drop_index('ix_assets_created_at_id', table_name='assets')
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_owner_id_created_at_id', table_name='tasks')
@@ -0,0 +1,21 @@
+"""Add version stamp to task_templates for cached custom_data validators
+
+Revision ID: 9c4e1f7a2b63
+Revises: 7a3d9e4b2c18
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '9c4e1f7a2b63'
+down_revision = '7a3d9e4b2c18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('task_templates', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('task_templates', 'version')
@@ -0,0 +1,75 @@
+"""Add learning courses, modules and progress tables
+
+Revision ID: b3e8d1f6a925
+Revises: a7c2e9d4f158
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b3e8d1f6a925'
+down_revision = 'a7c2e9d4f158'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('courses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('module_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_courses_id'), 'courses', ['id'], unique=False)
+    op.create_index(op.f('ix_courses_title'), 'courses', ['title'], unique=False)
+    op.create_table('course_modules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_course_modules_id'), 'course_modules', ['id'], unique=False)
+    op.create_index('ix_course_modules_course_id_position', 'course_modules', ['course_id', 'position'], unique=False)
+    op.create_table('module_progress',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('module_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('percent', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['module_id'], ['course_modules.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'module_id')
+    )
+    op.create_index('ix_module_progress_user_id_course_id', 'module_progress', ['user_id', 'course_id'], unique=False)
+    op.create_table('course_progress',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('modules_completed', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'course_id')
+    )
+    op.create_index('ix_course_progress_course_id_completed_at', 'course_progress', ['course_id', 'completed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_course_progress_course_id_completed_at', table_name='course_progress')
+    op.drop_table('course_progress')
+    op.drop_index('ix_module_progress_user_id_course_id', table_name='module_progress')
+    op.drop_table('module_progress')
+    op.drop_index('ix_course_modules_course_id_position', table_name='course_modules')
+    op.drop_index(op.f('ix_course_modules_id'), table_name='course_modules')
+    op.drop_table('course_modules')
+    op.drop_index(op.f('ix_courses_title'), table_name='courses')
+    op.drop_index(op.f('ix_courses_id'), table_name='courses')
+    op.drop_table('courses')
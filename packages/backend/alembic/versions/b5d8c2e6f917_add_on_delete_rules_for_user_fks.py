@@ -0,0 +1,41 @@
+"""Add ON DELETE rules to foreign keys referencing users and roles
+
+Revision ID: b5d8c2e6f917
+Revises: 9c4e1f7a2b63
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b5d8c2e6f917'
+down_revision = '9c4e1f7a2b63'
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table, ON DELETE rule)
+FOREIGN_KEYS = [
+    ('user_roles', 'user_id', 'users', 'CASCADE'),
+    ('user_roles', 'role_id', 'roles', 'CASCADE'),
+    ('tasks', 'owner_id', 'users', 'SET NULL'),
+    ('assets', 'assignee_id', 'users', 'SET NULL'),
+    ('contacts', 'user_id', 'users', 'SET NULL'),
+]
+
+
+def _recreate(ondelete_for):
+    conn = op.get_bind()
+    # SQLite cannot alter constraints in place; fresh SQLite schemas get the rules from the models
+    if conn.dialect.name == "sqlite":
+        return
+    for table, column, referent, rule in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'], ondelete=ondelete_for(rule))
+
+
+def upgrade() -> None:
+    _recreate(lambda rule: rule)
+
+
+def downgrade() -> None:
+    _recreate(lambda rule: None)
@@ -0,0 +1,27 @@
+"""Add composite indexes backing task list filters and sort keys
+
+Revision ID: d3a7f1c9e824
+Revises: b5d8c2e6f917
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd3a7f1c9e824'
+down_revision = 'b5d8c2e6f917'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_owner_id_status_due_date', 'tasks', ['owner_id', 'status', 'due_date'], unique=False)
+    op.create_index('ix_tasks_status_updated_at', 'tasks', ['status', 'updated_at'], unique=False)
+    op.create_index('ix_tasks_due_date_id', 'tasks', ['due_date', 'id'], unique=False)
+    op.create_index('ix_tasks_template_id', 'tasks', ['template_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_template_id', table_name='tasks')
+    op.drop_index('ix_tasks_due_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_updated_at', table_name='tasks')
+    op.drop_index('ix_tasks_owner_id_status_due_date', table_name='tasks')
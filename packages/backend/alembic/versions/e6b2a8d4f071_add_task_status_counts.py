@@ -0,0 +1,35 @@
+"""Add task_status_counts table backing the task status board
+
+Revision ID: e6b2a8d4f071
+Revises: d3a7f1c9e824
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e6b2a8d4f071'
+down_revision = 'd3a7f1c9e824'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('task_status_counts',
+    sa.Column('owner_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='taskstatus', native_enum=False), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('owner_id', 'status')
+    )
+    # Backfill from existing tasks; owner 0 holds the org-wide totals
+    op.execute(
+        "INSERT INTO task_status_counts (owner_id, status, count) "
+        "SELECT owner_id, status, COUNT(*) FROM tasks WHERE owner_id IS NOT NULL GROUP BY owner_id, status"
+    )
+    op.execute(
+        "INSERT INTO task_status_counts (owner_id, status, count) "
+        "SELECT 0, status, COUNT(*) FROM tasks GROUP BY status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_status_counts')
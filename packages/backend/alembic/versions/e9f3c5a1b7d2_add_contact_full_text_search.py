@@ -0,0 +1,73 @@
+"""Add full-text search index over contacts
+
+Revision ID: e9f3c5a1b7d2
+Revises: e6b2a8d4f071
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e9f3c5a1b7d2'
+down_revision = 'e6b2a8d4f071'
+branch_labels = None
+depends_on = None
+
+# Snapshot of the search DDL at this revision; the model module may change later
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE contacts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS "
+    "(setweight(to_tsvector('simple', translate(coalesce(first_name, ''), '@.-_', '    ') || ' ' || "
+    "translate(coalesce(middle_name, ''), '@.-_', '    ') || ' ' || "
+    "translate(coalesce(preferred_name, ''), '@.-_', '    ') || ' ' || translate(coalesce(last_name, "
+    "''), '@.-_', '    ')), 'A') || setweight(to_tsvector('simple', translate(coalesce(email, ''), "
+    "'@.-_', '    ') || ' ' || translate(coalesce(personal_email, ''), '@.-_', '    ')), 'B') || "
+    "setweight(to_tsvector('simple', translate(coalesce(phone_number, ''), '@.-_', '    ') || ' ' || "
+    "translate(coalesce(membership_id, ''), '@.-_', '    ') || ' ' || "
+    "translate(coalesce(organizational_unit, ''), '@.-_', '    ')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_contacts_search_vector ON contacts USING gin (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(first_name, middle_name, "
+    "preferred_name, last_name, email, personal_email, phone_number, membership_id, "
+    "organizational_unit, content='contacts', content_rowid='id', tokenize='unicode61 "
+    "remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN INSERT INTO "
+    "contacts_fts(rowid, first_name, middle_name, preferred_name, last_name, email, personal_email, "
+    "phone_number, membership_id, organizational_unit) VALUES (new.id, new.first_name, "
+    "new.middle_name, new.preferred_name, new.last_name, new.email, new.personal_email, "
+    "new.phone_number, new.membership_id, new.organizational_unit); END",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN INSERT INTO "
+    "contacts_fts(contacts_fts, rowid, first_name, middle_name, preferred_name, last_name, email, "
+    "personal_email, phone_number, membership_id, organizational_unit) VALUES ('delete', old.id, "
+    "old.first_name, old.middle_name, old.preferred_name, old.last_name, old.email, "
+    "old.personal_email, old.phone_number, old.membership_id, old.organizational_unit); END",
+    "CREATE TRIGGER IF NOT EXISTS contacts_fts_au AFTER UPDATE ON contacts BEGIN INSERT INTO "
+    "contacts_fts(contacts_fts, rowid, first_name, middle_name, preferred_name, last_name, email, "
+    "personal_email, phone_number, membership_id, organizational_unit) VALUES ('delete', old.id, "
+    "old.first_name, old.middle_name, old.preferred_name, old.last_name, old.email, "
+    "old.personal_email, old.phone_number, old.membership_id, old.organizational_unit); INSERT INTO "
+    "contacts_fts(rowid, first_name, middle_name, preferred_name, last_name, email, personal_email, "
+    "phone_number, membership_id, organizational_unit) VALUES (new.id, new.first_name, "
+    "new.middle_name, new.preferred_name, new.last_name, new.email, new.personal_email, "
+    "new.phone_number, new.membership_id, new.organizational_unit); END",
+    "INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    # Postgres: generated tsvector column + GIN index; SQLite: FTS5 table kept in sync by triggers
+    dialect = op.get_bind().dialect.name
+    statements = {"postgresql": POSTGRES_SEARCH_DDL, "sqlite": SQLITE_SEARCH_DDL}.get(dialect, [])
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_contacts_search_vector")
+        op.execute("ALTER TABLE contacts DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("contacts_fts_ai", "contacts_fts_ad", "contacts_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS contacts_fts")
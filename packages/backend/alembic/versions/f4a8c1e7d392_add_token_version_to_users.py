@@ -0,0 +1,21 @@
+"""Add token_version to users for stateless token revocation
+
+Revision ID: f4a8c1e7d392
+Revises: e9f3c5a1b7d2
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f4a8c1e7d392'
+down_revision = 'e9f3c5a1b7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -1,20 +1,91 @@
+from typing import Optional
+
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env")
 
     DATABASE_URL: str
+    # Optional override; by default derived from DATABASE_URL (asyncpg / aiosqlite)
+    ASYNC_DATABASE_URL: Optional[str] = None
     SECRET_KEY: str = "supersecretkey"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Password hashing: changing BCRYPT_ROUNDS rehashes passwords on next login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 256
     BASELINE_ROLE: str = "user"
 
+    # Login throttling, checked before any database or bcrypt work
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    LOGIN_USERNAME_BURST: int = 10
+    # Refill rates must be positive; disable throttling with LOGIN_RATE_LIMIT_ENABLED instead
+    LOGIN_USERNAME_PER_MINUTE: float = Field(10.0, gt=0)
+    LOGIN_IP_BURST: int = 50
+    LOGIN_IP_PER_MINUTE: float = Field(60.0, gt=0)
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS: int = 32
+    # Comma-separated proxy addresses/CIDRs (e.g. the load balancer) whose X-Forwarded-For is believed
+    TRUSTED_PROXIES: str = ""
+
+    # Authenticated principal cache (set TTL to 0 to disable)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_SIZE: int = 4096
+
+    # Authorize RoleChecker routes from token claims, checking only a cached per-user token version
+    STATELESS_AUTH: bool = False
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 60.0
+    TOKEN_VERSION_CACHE_SIZE: int = 65536
+
     # Email settings
     SMTP_HOST: str = "smtp.example.com"
     SMTP_PORT: int = 587
     SMTP_USER: str = "your_email@example.com"
     SMTP_PASSWORD: str = "your_email_password"
+    SMTP_USE_TLS: bool = True
     EMAILS_FROM_EMAIL: str = "noreply@example.com"
     LOGIN_URL: str = "http://localhost:3002/login"
 
+    # Email outbox delivery worker
+    EMAIL_WORKER_ENABLED: bool = True
+    EMAIL_WORKER_POLL_SECONDS: float = 5.0
+    EMAIL_WORKER_BATCH_SIZE: int = 50
+    EMAIL_SMTP_POOL_SIZE: int = 2
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 30.0
+
+    # Task status board counters are recounted from `tasks` on this interval to repair drift
+    TASK_COUNTER_RECONCILER_ENABLED: bool = True
+    TASK_COUNTER_RECONCILE_SECONDS: float = 900.0
+
+    # Learning progress heartbeats are coalesced in memory and upserted in bulk on this interval
+    LEARNING_PROGRESS_FLUSH_ENABLED: bool = True
+    LEARNING_PROGRESS_FLUSH_SECONDS: float = 2.0
+    LEARNING_PROGRESS_MAX_PENDING: int = 10000
+    # Hard cap on buffered (user, module) keys; beyond it heartbeats get 503
+    LEARNING_PROGRESS_BUFFER_LIMIT: int = 100000
+    LEARNING_MODULE_CACHE_TTL_SECONDS: float = 60.0
+
+    # Serialize large list responses with precompiled TypeAdapters straight to JSON bytes
+    FAST_JSON_RESPONSES: bool = True
+
+    # Process-local caches; "postgres" broadcasts invalidations to other workers over LISTEN/NOTIFY
+    CACHE_INVALIDATION_BACKEND: str = "memory"
+    TEMPLATE_CACHE_TTL_SECONDS: float = 300.0
+
+    # Prometheus metrics on /metrics, scraped with `Authorization: Bearer <METRICS_TOKEN>`.
+    # Without a token the endpoint answers 404 unless METRICS_PUBLIC opts in to open scraping
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+    METRICS_PUBLIC: bool = False
+
+    # Opt-in log of statements slower than the threshold, with EXPLAIN plans on Postgres
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_SIZE: int = 100
+    SLOW_QUERY_EXPLAIN: bool = True
+
 settings = Settings()
@@ -0,0 +1,122 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from .config import settings
+
+
+@lru_cache(maxsize=None)
+def build_crypt_context(rounds: int) -> CryptContext:
+    """
+    bcrypt context pinned to ``rounds``: hashes made with any other cost are
+    reported as needing an update, so they are rehashed on the next login.
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+# Module-level so they can be pickled into worker processes
+def _hash(password: str, rounds: int) -> str:
+    return build_crypt_context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return build_crypt_context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited process pool that async code can await.
+
+    Work beyond ``max_pending`` outstanding jobs is rejected with a 503 rather
+    than queued, so a login storm cannot build an unbounded backlog. With
+    ``workers=0`` hashing runs on the default thread executor instead.
+    """
+
+    def __init__(self, workers: int, rounds: int, max_pending: int = 0):
+        self.workers = workers
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.max_pending and self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(fn, *args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify ``password``; the second item is a replacement hash when the stored
+        one was made with a different cost, otherwise None.
+        """
+        return await self._run(_verify_and_update, password, hashed_password, self.rounds)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            running = min(self._pending, self.workers) if self.workers > 0 else self._pending
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "queued": self._pending - running,
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    rounds=settings.BCRYPT_ROUNDS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,150 @@
+import json
+import logging
+import select
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Called with the invalidated key, or None to drop everything cached under the channel
+Listener = Callable[[Optional[str]], None]
+
+
+class InvalidationBus:
+    """
+    Publishes cache invalidations to every process serving the app.
+
+    This base implementation only reaches listeners in the current process,
+    which is enough for single-worker deployments and tests.
+    """
+
+    def __init__(self):
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel: str, listener: Listener) -> None:
+        with self._lock:
+            self._listeners.setdefault(channel, []).append(listener)
+
+    def publish(self, channel: str, key: Optional[str] = None) -> None:
+        """Invalidate ``key`` on ``channel``; call after the change is committed."""
+        self._dispatch(channel, key)
+
+    def _dispatch(self, channel: str, key: Optional[str]) -> None:
+        with self._lock:
+            listeners = list(self._listeners.get(channel, ()))
+        for listener in listeners:
+            try:
+                listener(key)
+            except Exception:
+                logger.exception("Cache invalidation listener failed for %s:%s", channel, key)
+
+    def _dispatch_all(self) -> None:
+        with self._lock:
+            channels = list(self._listeners)
+        for channel in channels:
+            self._dispatch(channel, None)
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class PostgresNotifyBus(InvalidationBus):
+    """
+    Invalidation bus over Postgres LISTEN/NOTIFY.
+
+    Local listeners run immediately on publish; other processes receive the
+    message on a background thread. If the listening connection drops, every
+    channel is flushed after reconnecting, since messages may have been missed.
+    """
+
+    PG_CHANNEL = "cache_invalidation"
+
+    def __init__(self, engine: Engine, reconnect_seconds: float = 5.0):
+        super().__init__()
+        self.engine = engine
+        self.reconnect_seconds = reconnect_seconds
+        self.origin = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, channel: str, key: Optional[str] = None) -> None:
+        super().publish(channel, key)
+        payload = json.dumps({"origin": self.origin, "channel": channel, "key": key})
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT pg_notify(:pg_channel, :payload)"), {"pg_channel": self.PG_CHANNEL, "payload": payload})
+                conn.commit()
+        except Exception:
+            # Other processes fall back to their cache TTL
+            logger.exception("Failed to publish cache invalidation for %s:%s", channel, key)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        first = True
+        while not self._stop.is_set():
+            try:
+                self._listen(flush=not first)
+            except Exception:
+                logger.exception("Cache invalidation listener lost its connection")
+            first = False
+            self._stop.wait(self.reconnect_seconds)
+
+    def _listen(self, flush: bool) -> None:
+        raw = self.engine.raw_connection()
+        try:
+            dbapi_connection = raw.driver_connection
+            dbapi_connection.autocommit = True
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"LISTEN {self.PG_CHANNEL}")
+            cursor.close()
+            if flush:
+                self._dispatch_all()
+            while not self._stop.is_set():
+                if select.select([dbapi_connection], [], [], 1.0) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    self._handle(dbapi_connection.notifies.pop(0).payload)
+        finally:
+            raw.invalidate()
+
+    def _handle(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.origin:
+            return
+        self._dispatch(message.get("channel"), message.get("key"))
+
+
+def build_invalidation_bus() -> InvalidationBus:
+    if settings.CACHE_INVALIDATION_BACKEND == "postgres":
+        from app.db.session import engine
+        return PostgresNotifyBus(engine)
+    return InvalidationBus()
+
+
+invalidation_bus = build_invalidation_bus()
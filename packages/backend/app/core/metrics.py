@@ -0,0 +1,308 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .request_context import route_template
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in values]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, collect: Optional[Callable[[], Iterable[Tuple[LabelValues, float]]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        # Optional callback read at scrape time instead of tracked values
+        self._collect = collect
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def samples(self) -> List[str]:
+        if self._collect is not None:
+            values = sorted(self._collect())
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in values]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        # Per label set: a count per bucket (the last one is +Inf), then the sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._values.items())
+        lines = []
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            samples = metric.samples()
+            if samples:
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status"),
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"),
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.",
+))
+http_request_statements = registry.register(Histogram(
+    "http_request_db_statements", "SQL statements executed per HTTP request.", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+))
+http_request_statement_duration = registry.register(Counter(
+    "http_request_db_statement_seconds_total", "Time spent in SQL statements by route template.", ("method", "route"),
+))
+db_statements = registry.register(Counter(
+    "db_statements_total", "SQL statements executed.", ("engine",),
+))
+db_statement_duration = registry.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time.", ("engine",), buckets=STATEMENT_BUCKETS,
+))
+db_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",),
+    buckets=STATEMENT_BUCKETS,
+))
+
+
+class _RequestStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Set for the duration of each request; copied into threadpool workers and greenlets
+_request_stats: contextvars.ContextVar[Optional[_RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+_instrumented: Dict[str, Engine] = {}
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Record statement counts, statement time and pool checkout waits for
+    ``engine`` (pass ``async_engine.sync_engine`` for async engines).
+    """
+    if _instrumented.get(name) is engine:
+        return
+    _instrumented[name] = engine
+    labels = (name,)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["metrics_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop("metrics_started", time.perf_counter())
+        db_statements.inc(labels)
+        db_statement_duration.observe(elapsed, labels)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+    # The pool has no "checkout started" event, so time the engine's checkout
+    # call itself; this also covers the async engine, which checks out through
+    # its sync engine.
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            db_checkout_wait.observe(time.perf_counter() - started, labels)
+
+    engine.raw_connection = timed_raw_connection
+
+
+def _pool_stats() -> Iterable[Tuple[LabelValues, float]]:
+    for name, engine in _instrumented.items():
+        pool = engine.pool
+        # Only queue pools report occupancy
+        for stat in ("size", "checkedout", "overflow"):
+            reader = getattr(pool, stat, None)
+            if callable(reader):
+                yield (name, stat), reader()
+
+
+registry.register(Gauge(
+    "db_pool_connections", "Connection pool occupancy (size, checkedout, overflow).", ("engine", "state"),
+    collect=_pool_stats,
+))
+
+
+def _password_hasher_stats() -> Iterable[Tuple[LabelValues, float]]:
+    from .hashing import password_hasher
+    for stat, value in password_hasher.stats().items():
+        yield (stat,), value
+
+
+registry.register(Gauge(
+    "password_hasher", "Password hashing pool state (workers, pending, queued, completed, rejected).", ("stat",),
+    collect=_password_hasher_stats,
+))
+
+
+def _login_throttle_stats() -> Iterable[Tuple[LabelValues, float]]:
+    from .rate_limit import login_throttle
+    for stat, value in login_throttle.stats().items():
+        yield (stat,), value
+
+
+registry.register(Gauge(
+    "login_throttle", "Login throttling state (in_flight verifications, throttled and shed attempts).", ("stat",),
+    collect=_login_throttle_stats,
+))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status, in-flight requests and SQL
+    statements per route template. Requests that match no route are grouped
+    under ``unmatched`` so arbitrary paths cannot grow the label set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            _request_stats.reset(token)
+            labels = (scope["method"], route_template(scope))
+            http_requests.inc(labels + (str(status_code),))
+            http_request_duration.observe(elapsed, labels)
+            http_request_statements.observe(stats.statements, labels)
+            http_request_statement_duration.inc(labels, stats.seconds)
@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+
+from .config import settings
+from .invalidation import InvalidationBus, invalidation_bus
+
+
+@dataclass(frozen=True)
+class RoleSnapshot:
+    # None when the principal was built from token claims, which carry role names only
+    id: Optional[int]
+    name: str
+    description: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Read-only snapshot of an authenticated user and their roles.
+
+    Returned by the auth dependencies instead of a session-bound ``User`` so it
+    can be cached across requests without triggering lazy loads.
+    """
+    id: int
+    email: str
+    is_active: bool
+    roles: Tuple[RoleSnapshot, ...] = ()
+
+    @property
+    def role_names(self) -> FrozenSet[str]:
+        return frozenset(role.name for role in self.roles)
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active if user.is_active is not None else True,
+            roles=tuple(RoleSnapshot(id=r.id, name=r.name, description=r.description) for r in user.roles),
+        )
+
+    @classmethod
+    def from_claims(cls, user_id: int, email: str, role_names: Iterable[str]) -> "Principal":
+        return cls(
+            id=user_id,
+            email=email,
+            is_active=True,
+            roles=tuple(RoleSnapshot(id=None, name=name) for name in role_names),
+        )
+
+
+PRINCIPALS_CHANNEL = "principals"
+
+
+class PrincipalCache:
+    """
+    In-process TTL + LRU cache of principals keyed by ``(subject, token)``.
+
+    Entries are also indexed by user id so role or account changes can drop
+    every cached token for that user. Each worker process has its own cache;
+    invalidations are broadcast on the invalidation bus, so the TTL only
+    bounds staleness if a broadcast is missed.
+    """
+
+    def __init__(self, bus: InvalidationBus, maxsize: int = 1024, ttl: float = 60.0):
+        self.bus = bus
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Principal]]" = OrderedDict()
+        self._by_user: Dict[int, Set[Hashable]] = {}
+        # Bumped on every invalidation so a load racing with a revocation is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+        bus.subscribe(PRINCIPALS_CHANNEL, self._drop)
+
+    def get(self, key: Hashable) -> Optional[Principal]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def put(self, key: Hashable, principal: Principal, generation: int) -> None:
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, principal)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop ``user_id``'s principals here and in every other worker; call after committing."""
+        self.bus.publish(PRINCIPALS_CHANNEL, str(user_id))
+
+    def clear(self) -> None:
+        self._drop(None)
+
+    def _drop(self, key: Optional[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+                self._by_user.clear()
+            else:
+                for cached in list(self._by_user.get(int(key), ())):
+                    self._discard(cached)
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1].id]
+
+
+TOKEN_VERSION_CHANNEL = "token_versions"
+
+# Returned by TokenVersionCache.get on a miss, since None is a meaningful cached value
+MISSING = object()
+
+
+class TokenVersionCache:
+    """
+    Process-local LRU map of user id -> current ``(token_version, email)``,
+    used to reject stale tokens when authorizing from claims alone. The email
+    ties a token to the account it was issued for, since ids can be reused.
+    Users that are deleted or inactive map to None, which no token matches.
+
+    Changes are broadcast on the invalidation bus, so the TTL only bounds
+    staleness if a broadcast is missed.
+    """
+
+    def __init__(self, bus: InvalidationBus, maxsize: int = 65536, ttl: float = 60.0):
+        self.bus = bus
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[float, Optional[Tuple[int, str]]]]" = OrderedDict()
+        # Bumped on every invalidation so a load racing with a revocation is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+        bus.subscribe(TOKEN_VERSION_CHANNEL, self._drop)
+
+    def get(self, user_id: int):
+        """The cached (version, email) (or None), or ``MISSING`` when it must be loaded."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                return MISSING
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def put(self, user_id: int, version: Optional[Tuple[int, str]], generation: int) -> None:
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user_id] = (time.monotonic() + self.ttl, version)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop ``user_id`` here and in every other worker; call after committing."""
+        self.bus.publish(TOKEN_VERSION_CHANNEL, str(user_id))
+
+    def clear(self) -> None:
+        self._drop(None)
+
+    def _drop(self, key: Optional[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(key), None)
+
+principal_cache = PrincipalCache(
+    invalidation_bus,
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+token_versions = TokenVersionCache(
+    invalidation_bus,
+    maxsize=settings.TOKEN_VERSION_CACHE_SIZE,
+    ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
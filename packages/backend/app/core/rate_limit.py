@@ -0,0 +1,235 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from .config import settings
+
+
+class TokenBucketStore(ABC):
+    """
+    Rate limiter backend: token buckets keyed by string, each holding up to
+    ``capacity`` tokens and refilling at ``rate`` tokens per second.
+    """
+
+    @abstractmethod
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        """
+        Take one token from ``key``'s bucket. Returns 0 when a token was
+        available, otherwise the seconds until one will be (nothing is taken).
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        ...
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """Process-local buckets; the least recently used are evicted beyond ``maxsize``."""
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SharedStore(ABC):
+    """
+    The atomic key-value operations a store shared by every worker must
+    provide, e.g. Redis (WATCH/MULTI) or memcached (gets/cas).
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def compare_and_set(self, key: str, expected: Optional[str], value: str, ttl: float) -> bool:
+        """Set ``key`` to ``value`` only if it currently holds ``expected`` (None: absent)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class InProcessSharedStore(SharedStore):
+    """Stand-in `SharedStore` for tests and single-process runs."""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._values.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._values.pop(key, None)
+            return None
+        return entry[1]
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._live(key)
+
+    def compare_and_set(self, key: str, expected: Optional[str], value: str, ttl: float) -> bool:
+        with self._lock:
+            if self._live(key) != expected:
+                return False
+            self._values[key] = (time.monotonic() + ttl, value)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class SharedTokenBucketStore(TokenBucketStore):
+    """
+    Token buckets kept in a `SharedStore`, so limits hold across workers and
+    hosts. Buckets are stored as ``"tokens:timestamp"`` on wall-clock time and
+    updated with compare-and-set, retrying on contention.
+    """
+
+    def __init__(self, store: SharedStore, prefix: str = "ratelimit:", max_retries: int = 8):
+        self.store = store
+        self.prefix = prefix
+        self.max_retries = max_retries
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        key = self.prefix + key
+        # A full bucket is equivalent to no entry, so entries can expire once refilled
+        ttl = capacity / rate
+        for _ in range(self.max_retries):
+            now = time.time()
+            current = self.store.get(key)
+            if current is None:
+                tokens = capacity
+            else:
+                stored_tokens, updated = current.split(":")
+                tokens = _refill(float(stored_tokens), float(updated), now, capacity, rate)
+            if tokens < 1:
+                return (1 - tokens) / rate
+            if self.store.compare_and_set(key, current, f"{tokens - 1}:{now}", ttl):
+                return 0.0
+        # Persistent contention on one key is itself a burst; shed it
+        return 1.0 / rate
+
+    def reset(self) -> None:
+        self.store.clear()
+
+
+def build_token_bucket_store() -> TokenBucketStore:
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryTokenBucketStore()
+    raise ValueError(
+        f"Unknown RATE_LIMIT_BACKEND {settings.RATE_LIMIT_BACKEND!r}; "
+        "pass a SharedTokenBucketStore to LoginThrottle to share limits across workers"
+    )
+
+
+class LoginThrottle:
+    """
+    Guards the token endpoint before any database or bcrypt work: token
+    buckets per username and per client IP answer bursts with 429, and a cap
+    on concurrent password verifications in this process answers overload
+    with 503.
+    """
+
+    def __init__(
+        self,
+        store: TokenBucketStore,
+        username_burst: int = 10,
+        username_per_minute: float = 10.0,
+        ip_burst: int = 50,
+        ip_per_minute: float = 60.0,
+        max_concurrent: int = 32,
+    ):
+        if username_per_minute <= 0 or ip_per_minute <= 0:
+            raise ValueError("Login refill rates must be positive")
+        self.store = store
+        self.username_limit = (float(username_burst), username_per_minute / 60.0)
+        self.ip_limit = (float(ip_burst), ip_per_minute / 60.0)
+        self.max_concurrent = max_concurrent
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._throttled = 0
+        self._shed = 0
+
+    def check(self, username: str, client_ip: Optional[str]) -> None:
+        """Raise 429 when either bucket is empty."""
+        if not settings.LOGIN_RATE_LIMIT_ENABLED:
+            return
+        buckets = [("login:user:" + username.strip().lower(), self.username_limit)]
+        if client_ip:
+            buckets.insert(0, ("login:ip:" + client_ip, self.ip_limit))
+        for key, (capacity, rate) in buckets:
+            wait = self.store.take(key, capacity, rate)
+            if wait:
+                with self._lock:
+                    self._throttled += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts, please retry later",
+                    headers={"Retry-After": str(max(1, math.ceil(wait)))},
+                )
+
+    @contextmanager
+    def verification_slot(self) -> Iterator[None]:
+        """Hold one of the ``max_concurrent`` verification slots, or raise 503."""
+        with self._lock:
+            if self.max_concurrent and self._in_flight >= self.max_concurrent:
+                self._shed += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"in_flight": self._in_flight, "throttled": self._throttled, "shed": self._shed}
+
+    def reset(self) -> None:
+        self.store.reset()
+
+
+login_throttle = LoginThrottle(
+    build_token_bucket_store(),
+    username_burst=settings.LOGIN_USERNAME_BURST,
+    username_per_minute=settings.LOGIN_USERNAME_PER_MINUTE,
+    ip_burst=settings.LOGIN_IP_BURST,
+    ip_per_minute=settings.LOGIN_IP_PER_MINUTE,
+    max_concurrent=settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS,
+)
@@ -0,0 +1,86 @@
+import contextvars
+import ipaddress
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Union
+
+from starlette.requests import Request
+
+from .config import settings
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# ASGI scope of the request being served; copied into threadpool workers and greenlets
+current_scope: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("current_scope", default=None)
+
+_templates: Dict[Callable, str] = {}
+
+
+def route_template(scope: Optional[dict]) -> str:
+    """
+    Path template of the route that matched ``scope`` (e.g. ``/api/v1/tasks/{task_id}``),
+    or ``unmatched`` so arbitrary paths never leak into logs and metric labels.
+    """
+    endpoint = scope.get("endpoint") if scope else None
+    if endpoint is None:
+        return "unmatched"
+    if endpoint not in _templates:
+        # Routers only record the matched endpoint, so map endpoints back to their templates
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is not None:
+                _templates.setdefault(route.endpoint, route.path)
+    return _templates.get(endpoint, "unmatched")
+
+
+def current_route() -> Optional[str]:
+    """``METHOD /template`` of the current request, or None outside a request."""
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    return f"{scope['method']} {route_template(scope)}"
+
+
+class RequestContextMiddleware:
+    """Makes the current request's scope available to code that has no `Request`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+@lru_cache(maxsize=None)
+def _trusted_networks(spec: str) -> List[IPNetwork]:
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in spec.split(",") if item.strip()]
+
+
+def _is_trusted(address: str, networks: List[IPNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(request: Request, trusted_proxies: Optional[str] = None) -> Optional[str]:
+    """
+    Address of the client behind any trusted proxies. When the peer is in
+    ``TRUSTED_PROXIES``, `X-Forwarded-For` is read right to left and the first
+    untrusted hop wins; entries further left are client-supplied and ignored.
+    """
+    peer = request.client.host if request.client else None
+    networks = _trusted_networks(settings.TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies)
+    if peer is None or not _is_trusted(peer, networks):
+        return peer
+    hops = [hop.strip() for header in request.headers.getlist("x-forwarded-for") for hop in header.split(",")]
+    for hop in reversed([hop for hop in hops if hop]):
+        if not _is_trusted(hop, networks):
+            return hop
+    return hops[0] if hops else peer
@@ -4,15 +4,18 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.users import schemas
 from app.modules.users import models
-from app.db.session import get_db
+from app.db.session import get_async_db
 from .config import settings
+from .hashing import build_crypt_context
+from .principals import MISSING, Principal, principal_cache, token_versions
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Synchronous helpers for scripts; request handlers await password_hasher instead
+pwd_context = build_crypt_context(settings.BCRYPT_ROUNDS)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/token")
 
@@ -36,7 +39,46 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def load_principal(db: AsyncSession, email: str, token: str) -> Optional[Principal]:
+    """
+    Resolve the principal for a decoded token, consulting the principal cache first.
+    """
+    key = (email, token)
+    principal = principal_cache.get(key)
+    if principal is not None:
+        return principal
+    generation = principal_cache.generation()
+    result = await db.execute(
+        select(models.User)
+        .options(*schemas.user_load_options())
+        .where(models.User.email == email)
+    )
+    user = result.scalars().first()
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    principal_cache.put(key, principal, generation)
+    return principal
+
+
+async def token_version_is_current(db: AsyncSession, user_id: int, email: str, version: int) -> bool:
+    """
+    Whether tokens stamped with ``version`` for ``email`` are still valid for
+    ``user_id``. Deleted and inactive users have no valid version; the email
+    must match too, as SQLite can hand a deleted user's id to a new account.
+    """
+    current = token_versions.get(user_id)
+    if current is MISSING:
+        generation = token_versions.generation()
+        row = (await db.execute(
+            select(models.User.token_version, models.User.email, models.User.is_active).where(models.User.id == user_id)
+        )).first()
+        current = (row.token_version, row.email) if row is not None and row.is_active is not False else None
+        token_versions.put(user_id, current, generation)
+    return current is not None and current == (version, email)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -51,17 +93,17 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = schemas.TokenData(email=email, roles=roles)
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
-    if user is None:
+    principal = await load_principal(db, token_data.email, token)
+    if principal is None:
         raise credentials_exception
-    return user
+    return principal
 
 
 class RoleChecker:
     def __init__(self, allowed_roles: list[str]):
         self.allowed_roles = allowed_roles
 
-    def __call__(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    async def __call__(self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Principal:
         credentials_exception = HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to perform this action.",
@@ -83,10 +125,21 @@ class RoleChecker:
         if not any(role in self.allowed_roles for role in user_roles):
             raise credentials_exception
 
-        user = db.query(models.User).filter(models.User.email == email).first()
-        if user is None:
+        user_id, version = payload.get("uid"), payload.get("ver")
+        if settings.STATELESS_AUTH and isinstance(user_id, int) and isinstance(version, int):
+            # Roles come from the token; revocations bump the version, invalidating it
+            if not await token_version_is_current(db, user_id, email, version):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Could not validate credentials",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            return Principal.from_claims(user_id, email, user_roles)
+
+        principal = await load_principal(db, email, token)
+        if principal is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
-        return user
\ No newline at end of file
+        return principal
\ No newline at end of file
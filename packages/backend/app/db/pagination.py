@@ -0,0 +1,112 @@
+import base64
+import binascii
+import enum
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _decode_value(column, raw: Any) -> Any:
+    if raw is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if issubclass(python_type, enum.Enum):
+        return python_type(raw)
+    return raw
+
+
+def encode_cursor(sort_value: Any, id_value: int) -> str:
+    """Encode a (sort value, id) pair into an opaque, URL-safe cursor."""
+    payload = json.dumps([_encode_value(sort_value), id_value], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_sort, raw_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return _decode_value(sort_column, raw_sort), int(raw_id)
+    except (binascii.Error, ValueError, TypeError, KeyError, LookupError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _after(sort_column, id_column, sort_value: Any, id_value: int, descending: bool, nullable: bool):
+    """
+    Keyset predicate for rows strictly after ``(sort_value, id_value)``.
+
+    NULL sort values are treated as larger than any other value (the database
+    default for ascending b-tree indexes), so they come last ascending and
+    first descending.
+    """
+    key = tuple_(sort_column, id_column)
+    if not nullable:
+        return key < (sort_value, id_value) if descending else key > (sort_value, id_value)
+    if sort_value is None:
+        in_null_run = and_(sort_column.is_(None), id_column < id_value if descending else id_column > id_value)
+        return or_(in_null_run, sort_column.isnot(None)) if descending else in_null_run
+    if descending:
+        return key < (sort_value, id_value)
+    return or_(key > (sort_value, id_value), sort_column.is_(None))
+
+
+def paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    nullable: bool = False,
+) -> Query:
+    """
+    Order ``query`` by ``(sort_column, id_column)`` and apply either keyset or offset paging.
+
+    With a cursor the page starts strictly after the encoded row, so the cost of
+    a page does not depend on how deep it is. ``skip`` is kept for older clients.
+    Pass ``nullable=True`` when ``sort_column`` may hold NULLs.
+    """
+    if descending:
+        order = sort_column.desc().nulls_first() if nullable else sort_column.desc()
+        query = query.order_by(order, id_column.desc())
+    else:
+        order = sort_column.asc().nulls_last() if nullable else sort_column.asc()
+        query = query.order_by(order, id_column.asc())
+    if cursor:
+        sort_value, id_value = decode_cursor(cursor, sort_column)
+        query = query.filter(_after(sort_column, id_column, sort_value, id_value, descending, nullable))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def next_cursor(items: Sequence[Any], limit: int, sort_column) -> Optional[str]:
+    """Cursor for the page after ``items``, or None when this was the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, sort_column.key), last.id)
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int, sort_column) -> None:
+    cursor = next_cursor(items, limit, sort_column)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
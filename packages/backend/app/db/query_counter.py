@@ -0,0 +1,38 @@
+import threading
+from typing import List
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """
+    Counts SQL statements executed on one or more engines while active.
+
+    Used as a context manager by the test-time query budget guard::
+
+        with QueryCounter(engine) as counter:
+            client.get("/api/v1/users/")
+        assert counter.count <= 3
+    """
+
+    def __init__(self, *engines):
+        self.engines = engines
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
@@ -1,14 +1,58 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
+def enable_sqlite_foreign_keys(engine) -> None:
+    """SQLite ignores ON DELETE rules unless foreign keys are switched on per connection."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+enable_sqlite_foreign_keys(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers matching the sync drivers used in DATABASE_URL
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Derive an async driver URL (asyncpg/aiosqlite) from a sync database URL."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL), pool_pre_ping=True)
+enable_sqlite_foreign_keys(async_engine.sync_engine)
+# Objects stay usable after commit; async code cannot lazily refresh expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """
+    Async session dependency for ``async def`` routes. Sync routes keep using
+    ``get_db`` and run in the threadpool.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
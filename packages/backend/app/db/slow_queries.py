@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.request_context import current_route
+
+logger = logging.getLogger(__name__)
+
+# Statements EXPLAIN accepts; anything else (DDL, SET, COMMIT) is logged without a plan
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "VALUES")
+
+ParameterShape = Union[Dict[str, str], List[str], str]
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    duration_ms: float
+    # Types of the bound values, never the values themselves
+    parameters: ParameterShape
+    route: Optional[str]
+    engine: str
+    executemany: bool = False
+    plan: Optional[List[str]] = None
+    recorded_at: datetime = field(default_factory=datetime.utcnow)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> ParameterShape:
+    if executemany:
+        rows = list(parameters or ())
+        return [f"{len(rows)} rows"] + ([parameter_shape(rows[0])] if rows else [])
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """
+    Bounded in-memory log of statements slower than ``threshold_ms``.
+
+    On Postgres each entry carries the planner's estimate from
+    ``EXPLAIN (ANALYZE off)``, run on the same connection right after the
+    statement so it sees the same transaction and bind values without
+    executing the statement again.
+    """
+
+    def __init__(self, threshold_ms: float = 200.0, size: int = 100, explain: bool = True):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._entries: Deque[SlowQuery] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._installed: Dict[str, Engine] = {}
+
+    def install(self, engine: Engine, name: str) -> None:
+        """Start logging ``engine`` (pass ``async_engine.sync_engine`` for async engines)."""
+        if self._installed.get(name) is engine:
+            return
+        self._installed[name] = engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info["slow_query_started"] = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.pop("slow_query_started", None)
+            if started is None:
+                return
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            if duration_ms < self.threshold_ms:
+                return
+            plan = None
+            if self.explain and not executemany and conn.dialect.name == "postgresql":
+                plan = self._explain(conn, statement, parameters)
+            self.record(SlowQuery(
+                statement=statement,
+                duration_ms=round(duration_ms, 3),
+                parameters=parameter_shape(parameters, executemany),
+                route=current_route(),
+                engine=name,
+                executemany=executemany,
+                plan=plan,
+            ))
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[List[str]]:
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        # A raw cursor on the same DBAPI connection, so this does not re-enter the
+        # engine events; the savepoint keeps a failed EXPLAIN from aborting the
+        # caller's transaction.
+        explain_cursor = conn.connection.cursor()
+        try:
+            explain_cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                explain_cursor.execute("EXPLAIN (ANALYZE off) " + statement, parameters)
+                plan = [row[0] for row in explain_cursor.fetchall()]
+            except Exception:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                raise
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception:
+            logger.warning("Could not explain slow query", exc_info=True)
+            return None
+        finally:
+            explain_cursor.close()
+
+    def record(self, entry: SlowQuery) -> None:
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning("Slow query (%.1f ms) from %s: %s", entry.duration_ms, entry.route or "background", entry.statement)
+
+    def entries(self) -> List[SlowQuery]:
+        """Logged statements, slowest first."""
+        with self._lock:
+            entries = list(self._entries)
+        return sorted(entries, key=lambda entry: entry.duration_ms, reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import enum
@@ -23,8 +23,14 @@ class Asset(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    # When the current assignee received the asset
+    assigned_at = Column(DateTime, nullable=True)
     assignee = relationship("User", back_populates="assets")
 
+    __table_args__ = (
+        Index("ix_assets_created_at_id", "created_at", "id"),
+    )
+
 # To be added to the User model in users/models.py:
 # assets = relationship("Asset", back_populates="assignee")
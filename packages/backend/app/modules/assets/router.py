@@ -1,10 +1,14 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.db.session import get_db
+from app.db.pagination import set_next_cursor
 from app.core.security import RoleChecker
+from app.utils.conditional import conditional_response, make_etag, page_etag
+from app.utils.export import ExportFormat, export_response
+from app.utils.fast_json import JSONListResponder
 from . import schemas, services
 
 router = APIRouter()
@@ -12,6 +16,8 @@ router = APIRouter()
 # All routes in this module will require administrator privileges
 admin_dependency = Depends(RoleChecker(['administrator']))
 
+asset_list_json = JSONListResponder(schemas.Asset)
+
 @router.post("/", response_model=schemas.Asset, status_code=status.HTTP_201_CREATED, dependencies=[admin_dependency])
 def create_asset(
     asset: schemas.AssetCreate,
@@ -24,27 +30,52 @@ def create_asset(
 
 @router.get("/", response_model=List[schemas.Asset], dependencies=[admin_dependency])
 def read_assets(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve all assets (admin only). Supports `If-None-Match`.
+    """
+    assets = services.get_all_assets(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, assets, limit, services.ASSET_SORT_COLUMN)
+    body = asset_list_json.dump(assets)
+    not_modified = conditional_response(request, response, page_etag(body, response))
+    if not_modified:
+        return not_modified
+    return asset_list_json(assets, response, body)
+
+@router.get("/export", dependencies=[admin_dependency])
+def export_assets(
+    format: ExportFormat = ExportFormat.NDJSON,
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve all assets (admin only).
+    Stream all assets as NDJSON or CSV (admin only).
     """
-    assets = services.get_all_assets(db, skip=skip, limit=limit)
-    return assets
+    return export_response(db.get_bind(), services.export_assets_query(), format, "assets")
 
 @router.get("/{asset_id}", response_model=schemas.Asset, dependencies=[admin_dependency])
 def read_asset(
     asset_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve a specific asset by ID (admin only).
+    Retrieve a specific asset by ID (admin only). Supports `If-None-Match` and `If-Modified-Since`.
     """
     db_asset = services.get_asset(db, asset_id=asset_id)
     if db_asset is None:
         raise HTTPException(status_code=404, detail="Asset not found")
+    # The assignee can be cleared by the database (ON DELETE SET NULL) without touching updated_at
+    etag = make_etag("asset", db_asset.id, db_asset.updated_at, db_asset.assignee_id)
+    not_modified = conditional_response(request, response, etag, db_asset.updated_at)
+    if not_modified:
+        return not_modified
     return db_asset
 
 @router.put("/{asset_id}", response_model=schemas.Asset, dependencies=[admin_dependency])
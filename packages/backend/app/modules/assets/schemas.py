@@ -1,5 +1,6 @@
 
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import raiseload
 from typing import Optional
 from datetime import datetime
 from .models import AssetStatus
@@ -29,3 +30,7 @@ class Asset(AssetBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+def asset_load_options():
+    """`Asset` reads only columns; raise instead of silently lazy-loading a relationship."""
+    return (raiseload("*"),)
@@ -1,8 +1,19 @@
 
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 from . import models, schemas
+from app.db.pagination import paginate
+from app.modules.reports.rollups import asset_facts, record_asset_change
+from app.utils.export import export_columns
+from datetime import datetime
 from typing import List, Optional
 
+ASSET_SORT_COLUMN = models.Asset.created_at
+
+def export_assets_query() -> Select:
+    """Core select over all assets, for streaming exports."""
+    return select(*export_columns(models.Asset, schemas.Asset)).order_by(models.Asset.id)
+
 def create_asset(db: Session, asset: schemas.AssetCreate) -> models.Asset:
     """Create a new asset."""
     db_asset = models.Asset(**asset.model_dump())
@@ -15,17 +26,22 @@ def get_asset(db: Session, asset_id: int) -> Optional[models.Asset]:
     """Get a single asset by its ID."""
     return db.query(models.Asset).filter(models.Asset.id == asset_id).first()
 
-def get_all_assets(db: Session, skip: int = 0, limit: int = 100) -> List[models.Asset]:
+def get_all_assets(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.Asset]:
     """Get all assets."""
-    return db.query(models.Asset).offset(skip).limit(limit).all()
+    query = db.query(models.Asset).options(*schemas.asset_load_options())
+    return paginate(query, ASSET_SORT_COLUMN, models.Asset.id, skip=skip, limit=limit, cursor=cursor).all()
 
 def update_asset(db: Session, asset_id: int, asset_update: schemas.AssetUpdate) -> Optional[models.Asset]:
     """Update an asset."""
     db_asset = get_asset(db, asset_id)
     if db_asset:
+        before = asset_facts(db_asset)
         update_data = asset_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_asset, key, value)
+        if db_asset.assignee_id != before.assignee_id:
+            db_asset.assigned_at = datetime.utcnow() if db_asset.assignee_id is not None else None
+        record_asset_change(db, before, asset_facts(db_asset))
         db.commit()
         db.refresh(db_asset)
     return db_asset
@@ -35,6 +51,7 @@ def delete_asset(db: Session, asset_id: int) -> Optional[models.Asset]:
     db_asset = get_asset(db, asset_id)
     if db_asset:
         db.delete(db_asset)
+        record_asset_change(db, asset_facts(db_asset), None)
         db.commit()
     return db_asset
 
@@ -42,8 +59,12 @@ def assign_asset_to_user(db: Session, asset_id: int, user_id: int) -> Optional[m
     """Assign an asset to a user."""
     db_asset = get_asset(db, asset_id)
     if db_asset:
-        db_asset.assignee_id = user_id
+        before = asset_facts(db_asset)
+        if db_asset.assignee_id != user_id:
+            db_asset.assignee_id = user_id
+            db_asset.assigned_at = datetime.utcnow()
         db_asset.status = models.AssetStatus.ASSIGNED
+        record_asset_change(db, before, asset_facts(db_asset))
         db.commit()
         db.refresh(db_asset)
     return db_asset
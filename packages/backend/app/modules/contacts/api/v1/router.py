@@ -1,43 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.db.session import get_db
-from app.modules.contacts import crud, schemas
-from app.modules.users.models import User
+from app.db.pagination import set_next_cursor
+from app.modules.contacts import crud, importer, schemas
+from app.core.principals import Principal
 from app.core.security import get_current_user
+from app.utils.export import ExportFormat, export_response
+from app.utils.fast_json import JSONListResponder
 
 router = APIRouter()
 
+contact_list_json = JSONListResponder(schemas.Contact)
+
 @router.post("/", response_model=schemas.Contact)
 def create_contact(
     contact: schemas.ContactCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return crud.create_contact(db=db, contact=contact, user_id=current_user.id)
 
 @router.get("/", response_model=list[schemas.Contact])
 def read_contacts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    # Administrator role required
+    if "administrator" not in current_user.role_names:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    contacts = crud.get_contacts(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, contacts, limit, crud.CONTACT_SORT_COLUMN)
+    return contact_list_json(contacts, response)
+
+@router.post("/import", response_model=schemas.ContactImportResult)
+def import_contacts(
+    response: Response,
+    file: UploadFile = File(...),
+    format: Optional[ExportFormat] = None,
+    report: Optional[ExportFormat] = Query(None, description="Pass 'csv' to receive the error report as a CSV download"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Import contacts from an uploaded CSV or NDJSON file (admin only).
+
+    The format is taken from `format`, else from the file extension. Rows are
+    validated and written in chunks; invalid and duplicate rows are skipped and
+    listed in `errors`.
+    """
+    # Administrator role required
+    if "administrator" not in current_user.role_names:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    if format is None:
+        format = ExportFormat.CSV if (file.filename or "").lower().endswith(".csv") else ExportFormat.NDJSON
+    result = importer.import_contacts(db, importer.read_rows(file.file, format))
+    if report is ExportFormat.CSV:
+        return Response(
+            importer.error_report_csv(result),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": 'attachment; filename="contact-import-errors.csv"',
+                "X-Imported-Count": str(result.imported),
+                "X-Failed-Count": str(result.failed),
+            },
+        )
+    return result
+
+@router.get("/export")
+def export_contacts(
+    format: ExportFormat = ExportFormat.NDJSON,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Stream every contact as NDJSON or CSV (admin only).
+    """
+    # Administrator role required
+    if "administrator" not in current_user.role_names:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return export_response(db.get_bind(), crud.export_contacts_query(), format, "contacts")
+
+@router.get("/search", response_model=list[schemas.Contact])
+def search_contacts(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = Query(20, le=100),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
+    """
+    Search contacts by name, email, phone, membership ID or organizational unit.
+    Each word is matched as a prefix; results are ranked by relevance.
+    """
     # Administrator role required
-    if not any(r.name == "administrator" for r in current_user.roles):
+    if "administrator" not in current_user.role_names:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    contacts = crud.get_contacts(db, skip=skip, limit=limit)
-    return contacts
+    return crud.search_contacts(db, q, skip=skip, limit=limit)
 
 @router.get("/{contact_id}", response_model=schemas.Contact)
 def read_contact(
     contact_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     db_contact = crud.get_contact(db, contact_id=contact_id)
     if db_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    if db_contact.user_id != current_user.id and not any(r.name == "administrator" for r in current_user.roles):
+    if db_contact.user_id != current_user.id and "administrator" not in current_user.role_names:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return db_contact
 
@@ -46,12 +120,12 @@ def update_contact(
     contact_id: int,
     contact: schemas.ContactUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     db_contact = crud.get_contact(db, contact_id=contact_id)
     if db_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    if db_contact.user_id != current_user.id and not any(r.name == "administrator" for r in current_user.roles):
+    if db_contact.user_id != current_user.id and "administrator" not in current_user.role_names:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return crud.update_contact(db=db, contact_id=contact_id, contact=contact)
 
@@ -59,11 +133,11 @@ def update_contact(
 def delete_contact(
     contact_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     db_contact = crud.get_contact(db, contact_id=contact_id)
     if db_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    if db_contact.user_id != current_user.id and not any(r.name == "administrator" for r in current_user.roles):
+    if db_contact.user_id != current_user.id and "administrator" not in current_user.role_names:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return crud.delete_contact(db=db, contact_id=contact_id)
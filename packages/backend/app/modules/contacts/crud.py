@@ -1,16 +1,70 @@
-from app.modules.contacts.models import Contact
-from app.modules.contacts.schemas import ContactCreate, ContactUpdate
+import re
+
+from app.modules.contacts.models import Contact, SEARCH_COLUMNS
+from app.modules.contacts.schemas import Contact as ContactSchema, ContactCreate, ContactUpdate, contact_load_options
+from sqlalchemy import Select, column, func, literal_column, select, table, text
 from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.pagination import paginate
+from app.modules.reports.rollups import UNPLACED, placements, reattribute_user
+from app.utils.export import export_columns
+
+CONTACT_SORT_COLUMN = Contact.last_name
+
+# bm25 weight per FTS5 column, mirroring the A/B/C weights of the Postgres tsvector
+_FTS_WEIGHTS = {"first_name": 10.0, "middle_name": 10.0, "preferred_name": 10.0, "last_name": 10.0,
+                "email": 5.0, "personal_email": 5.0}
+_contacts_fts = table("contacts_fts", column("rowid"))
+_FTS_RANK = "bm25(contacts_fts, {})".format(", ".join(str(_FTS_WEIGHTS.get(c, 2.0)) for c in SEARCH_COLUMNS))
 
 def get_contact(db: Session, contact_id: int):
     return db.query(Contact).filter(Contact.id == contact_id).first()
 
-def get_contacts(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Contact).offset(skip).limit(limit).all()
+def get_contacts(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    return paginate(db.query(Contact).options(*contact_load_options()), CONTACT_SORT_COLUMN, Contact.id, skip=skip, limit=limit, cursor=cursor).all()
+
+def export_contacts_query() -> Select:
+    return select(*export_columns(Contact, ContactSchema)).order_by(Contact.id)
+
+def search_terms(query: str) -> List[str]:
+    # Letters and digits only, so terms can never be read as search operators
+    return [term.lower() for term in re.findall(r"[^\W_]+", query)]
+
+def search_contacts(db: Session, query: str, skip: int = 0, limit: int = 20) -> List[Contact]:
+    """
+    Contacts matching every term of `query` as a prefix of a name, email, phone
+    number, membership id or organizational unit, best matches first.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    base = db.query(Contact).options(*contact_load_options())
+    if db.get_bind().dialect.name == "postgresql":
+        ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        search_vector = literal_column("contacts.search_vector")
+        base = base.filter(search_vector.op("@@")(ts_query)).order_by(
+            func.ts_rank(search_vector, ts_query).desc(), Contact.id
+        )
+    else:
+        match = " ".join(f'"{term}"*' for term in terms)
+        base = (
+            base.join(_contacts_fts, _contacts_fts.c.rowid == Contact.id)
+            .filter(text("contacts_fts MATCH :match").bindparams(match=match))
+            .order_by(text(_FTS_RANK), Contact.id)
+        )
+    return base.offset(skip).limit(limit).all()
+
+def _reattribute(db: Session, user_id: Optional[int], before) -> None:
+    # Report rollups group users by the region / unit of their first contact
+    if user_id is not None:
+        reattribute_user(db, user_id, before, placements(db, [user_id]).get(user_id, UNPLACED))
 
 def create_contact(db: Session, contact: ContactCreate, user_id: int):
+    before = placements(db, [user_id]).get(user_id, UNPLACED)
     db_contact = Contact(**contact.model_dump(), user_id=user_id)
     db.add(db_contact)
+    db.flush()
+    _reattribute(db, user_id, before)
     db.commit()
     db.refresh(db_contact)
     return db_contact
@@ -18,8 +72,15 @@ def create_contact(db: Session, contact: ContactCreate, user_id: int):
 def update_contact(db: Session, contact_id: int, contact: ContactUpdate):
     db_contact = db.query(Contact).filter(Contact.id == contact_id).first()
     if db_contact:
-        for key, value in contact.model_dump(exclude_unset=True).items():
+        updates = contact.model_dump(exclude_unset=True)
+        placed = db_contact.user_id is not None and ("region" in updates or "organizational_unit" in updates)
+        if placed:
+            before = placements(db, [db_contact.user_id]).get(db_contact.user_id, UNPLACED)
+        for key, value in updates.items():
             setattr(db_contact, key, value)
+        if placed:
+            db.flush()
+            _reattribute(db, db_contact.user_id, before)
         db.commit()
         db.refresh(db_contact)
     return db_contact
@@ -27,6 +88,10 @@ def update_contact(db: Session, contact_id: int, contact: ContactUpdate):
 def delete_contact(db: Session, contact_id: int):
     db_contact = db.query(Contact).filter(Contact.id == contact_id).first()
     if db_contact:
+        user_id = db_contact.user_id
+        before = placements(db, [user_id]).get(user_id, UNPLACED) if user_id is not None else UNPLACED
         db.delete(db_contact)
+        db.flush()
+        _reattribute(db, user_id, before)
         db.commit()
     return db_contact
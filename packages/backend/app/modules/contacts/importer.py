@@ -0,0 +1,136 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.utils.export import ExportFormat
+from .models import Contact
+from .schemas import ContactCreate, ContactImportError, ContactImportResult
+
+# Rows validated, checked for duplicates and inserted per round trip
+IMPORT_CHUNK_SIZE = 1000
+
+# A data row with its 1-based line (CSV, excluding the header) or record number
+NumberedRow = Tuple[int, Dict[str, Any]]
+
+
+def read_rows(stream: IO[bytes], fmt: ExportFormat) -> Iterator[NumberedRow]:
+    """
+    Lazily parse an uploaded CSV or NDJSON file into raw field dicts.
+    Blank CSV cells are read as missing values.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt is ExportFormat.CSV:
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, {k: v for k, v in row.items() if k and v not in ("", None)}
+        return
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        # Not an object: let validation report it against this row
+        yield number, record if isinstance(record, dict) else {"__invalid__": line.strip()}
+
+
+def _chunks(rows: Iterable[NumberedRow], size: int) -> Iterator[List[NumberedRow]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _insert(db: Session):
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(Contact)
+
+
+def _existing(db: Session, emails: Set[str], personal_emails: Set[str]) -> Tuple[Set[str], Set[str]]:
+    """Which of the given addresses are already taken, in one query."""
+    if not emails and not personal_emails:
+        return set(), set()
+    rows = db.execute(
+        select(Contact.email, Contact.personal_email).where(
+            or_(Contact.email.in_(emails), Contact.personal_email.in_(personal_emails))
+        )
+    ).all()
+    return {r.email for r in rows} & emails, {r.personal_email for r in rows} & personal_emails
+
+
+def import_contacts(db: Session, rows: Iterable[NumberedRow], chunk_size: int = IMPORT_CHUNK_SIZE) -> ContactImportResult:
+    """
+    Validate and insert contacts in chunks, committing each chunk.
+
+    Invalid rows and rows whose `email` or `personal_email` is already in use,
+    either in the database or earlier in the file, are skipped and reported.
+    """
+    imported = 0
+    errors: List[ContactImportError] = []
+    seen_emails: Set[str] = set()
+    seen_personal: Set[str] = set()
+
+    for chunk in _chunks(rows, chunk_size):
+        valid: List[Tuple[int, ContactCreate]] = []
+        for number, raw in chunk:
+            if "__invalid__" in raw:
+                errors.append(ContactImportError(row=number, detail="Not a JSON object"))
+                continue
+            try:
+                valid.append((number, ContactCreate.model_validate(raw)))
+            except ValidationError as e:
+                detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors(include_url=False))
+                email = raw.get("email")
+                errors.append(ContactImportError(row=number, email=None if email is None else str(email), detail=detail))
+
+        taken_emails, taken_personal = _existing(
+            db,
+            {contact.email for _, contact in valid},
+            {contact.personal_email for _, contact in valid if contact.personal_email},
+        )
+        pending = []
+        for number, contact in valid:
+            if contact.email in taken_emails or contact.email in seen_emails:
+                errors.append(ContactImportError(row=number, email=contact.email, detail="Duplicate email"))
+                continue
+            if contact.personal_email and (contact.personal_email in taken_personal or contact.personal_email in seen_personal):
+                errors.append(ContactImportError(row=number, email=contact.email, detail="Duplicate personal_email"))
+                continue
+            seen_emails.add(contact.email)
+            if contact.personal_email:
+                seen_personal.add(contact.personal_email)
+            pending.append((number, contact))
+
+        if pending:
+            # ON CONFLICT DO NOTHING covers rows inserted concurrently since the check above
+            stmt = _insert(db).on_conflict_do_nothing().returning(Contact.email)
+            inserted = set(db.scalars(stmt, [contact.model_dump() for _, contact in pending]))
+            db.commit()
+            imported += len(inserted)
+            errors.extend(
+                ContactImportError(row=number, email=contact.email, detail="Duplicate email or personal_email")
+                for number, contact in pending
+                if contact.email not in inserted
+            )
+
+    errors.sort(key=lambda error: error.row)
+    return ContactImportResult(imported=imported, failed=len(errors), errors=errors)
+
+
+def error_report_csv(result: ContactImportResult) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["row", "email", "detail"])
+    writer.writerows([error.row, error.email or "", error.detail] for error in result.errors)
+    return buffer.getvalue()
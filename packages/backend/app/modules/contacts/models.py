@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text, Index, DDL, event
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -32,6 +32,58 @@ class Contact(Base):
     blue_card_number = Column(String, nullable=True)
     license_number = Column(String, nullable=True)
     notes = Column(Text, nullable=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
 
     user = relationship("User", back_populates="contact")
+
+    __table_args__ = (
+        Index("ix_contacts_last_name_id", "last_name", "id"),
+    )
+
+
+# Full-text search. Postgres keeps a weighted, generated tsvector column under a
+# GIN index; SQLite keeps an FTS5 table in sync with triggers. Both are created
+# alongside the contacts table and by migration e9f3c5a1b7d2.
+SEARCH_NAME_COLUMNS = ("first_name", "middle_name", "preferred_name", "last_name")
+SEARCH_EMAIL_COLUMNS = ("email", "personal_email")
+SEARCH_OTHER_COLUMNS = ("phone_number", "membership_id", "organizational_unit")
+SEARCH_COLUMNS = SEARCH_NAME_COLUMNS + SEARCH_EMAIL_COLUMNS + SEARCH_OTHER_COLUMNS
+
+
+def _pg_document(columns, weight):
+    # Split emails and ids on punctuation so their parts are searchable, as FTS5 does
+    text = " || ' ' || ".join(f"translate(coalesce({c}, ''), '@.-_', '    ')" for c in columns)
+    return f"setweight(to_tsvector('simple', {text}), '{weight}')"
+
+
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE contacts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    + " || ".join([
+        _pg_document(SEARCH_NAME_COLUMNS, "A"),
+        _pg_document(SEARCH_EMAIL_COLUMNS, "B"),
+        _pg_document(SEARCH_OTHER_COLUMNS, "C"),
+    ])
+    + ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_contacts_search_vector ON contacts USING gin (search_vector)",
+]
+
+_fts_columns = ", ".join(SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+_fts_delete = f"INSERT INTO contacts_fts(contacts_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_old_values});"
+_fts_insert = f"INSERT INTO contacts_fts(rowid, {_fts_columns}) VALUES (new.id, {_new_values});"
+
+SQLITE_SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5({_fts_columns}, "
+    "content='contacts', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN {_fts_insert} END",
+    f"CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN {_fts_delete} END",
+    f"CREATE TRIGGER IF NOT EXISTS contacts_fts_au AFTER UPDATE ON contacts BEGIN {_fts_delete} {_fts_insert} END",
+    "INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')",
+]
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Contact.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Contact.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Contact.__table__, "before_drop", DDL("DROP TABLE IF EXISTS contacts_fts").execute_if(dialect="sqlite"))
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
+from sqlalchemy.orm import raiseload
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 class ContactBase(BaseModel):
     email: EmailStr # The primary email for the contact
@@ -35,3 +36,18 @@ class Contact(ContactBase):
     user_id: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+# Bulk import
+class ContactImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    detail: str
+
+class ContactImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ContactImportError]
+
+def contact_load_options():
+    """`Contact` reads only columns; raise instead of silently lazy-loading a relationship."""
+    return (raiseload("*"),)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.config import settings
+from app.core.security import RoleChecker
+from app.db.slow_queries import slow_query_log
+from . import schemas
+
+router = APIRouter()
+
+admin_dependency = Depends(RoleChecker(['administrator']))
+
+
+@router.get("/slow-queries", response_model=schemas.SlowQueryReport, dependencies=[admin_dependency])
+def read_slow_queries():
+    """
+    Recent statements over the slow-query threshold, slowest first (admin only).
+    """
+    return schemas.SlowQueryReport(
+        enabled=settings.SLOW_QUERY_LOG_ENABLED,
+        threshold_ms=slow_query_log.threshold_ms,
+        entries=[schemas.SlowQuery.model_validate(entry) for entry in slow_query_log.entries()],
+    )
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT, dependencies=[admin_dependency])
+def clear_slow_queries():
+    """
+    Empty the slow-query log (admin only).
+    """
+    slow_query_log.clear()
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, List, Optional, Union
+from datetime import datetime
+
+class SlowQuery(BaseModel):
+    statement: str
+    duration_ms: float
+    parameters: Union[Dict[str, str], List[Union[str, Dict[str, str], List[str]]], str]
+    route: Optional[str] = None
+    engine: str
+    executemany: bool = False
+    plan: Optional[List[str]] = None
+    recorded_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SlowQueryReport(BaseModel):
+    enabled: bool
+    threshold_ms: float
+    entries: List[SlowQuery]
@@ -0,0 +1,241 @@
+import logging
+import queue
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from . import models
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(db: Union[Session, AsyncSession], email_to: str, subject: str, html_content: str) -> models.EmailOutbox:
+    """
+    Queue an email for background delivery.
+
+    The row is added to the caller's session and is persisted by the caller's
+    commit, so the message is only sent if the surrounding transaction succeeds.
+    """
+    db_email = models.EmailOutbox(email_to=email_to, subject=subject, html_content=html_content)
+    db.add(db_email)
+    # Wake the delivery worker as soon as the row is visible to other sessions
+    sync_session = db.sync_session if isinstance(db, AsyncSession) else db
+    event.listen(sync_session, "after_commit", lambda session: email_worker.notify(), once=True)
+    return db_email
+
+
+def build_message(email: models.EmailOutbox) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = email.subject
+    msg["From"] = settings.EMAILS_FROM_EMAIL
+    msg["To"] = email.email_to
+    msg.attach(MIMEText(email.html_content, "html"))
+    return msg
+
+
+class SMTPConnectionPool:
+    """
+    A small pool of authenticated SMTP connections that are reused across sends.
+
+    Connections are opened lazily up to ``size``; a connection that raises while
+    in use is closed and replaced on the next checkout.
+    """
+
+    def __init__(
+        self,
+        size: int = settings.EMAIL_SMTP_POOL_SIZE,
+        host: str = settings.SMTP_HOST,
+        port: int = settings.SMTP_PORT,
+        use_tls: bool = settings.SMTP_USE_TLS,
+        user: Optional[str] = settings.SMTP_USER,
+        password: Optional[str] = settings.SMTP_PASSWORD,
+        timeout: float = 30.0,
+    ):
+        self.size = size
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        # Local debug servers usually run without authentication
+        if self.user and self.password:
+            server.login(self.user, self.password)
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                server = self._connect()
+            try:
+                yield server
+            except Exception:
+                self._close(server)
+                raise
+            self._idle.put(server)
+        finally:
+            self._slots.release()
+
+    def send(self, email: models.EmailOutbox) -> None:
+        msg = build_message(email).as_string()
+        try:
+            with self.connection() as server:
+                server.sendmail(settings.EMAILS_FROM_EMAIL, email.email_to, msg)
+        except smtplib.SMTPServerDisconnected:
+            # An idle connection may have been dropped by the server; retry once on a fresh one
+            with self.connection() as server:
+                server.sendmail(settings.EMAILS_FROM_EMAIL, email.email_to, msg)
+
+    def close(self) -> None:
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+
+class EmailOutboxWorker:
+    """
+    Background thread that drains the email outbox over a pooled set of SMTP connections.
+
+    Failed deliveries are retried with exponential backoff until ``max_attempts``
+    is reached, after which the row is marked as failed.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        pool: Optional[SMTPConnectionPool] = None,
+        poll_seconds: float = settings.EMAIL_WORKER_POLL_SECONDS,
+        batch_size: int = settings.EMAIL_WORKER_BATCH_SIZE,
+        max_attempts: int = settings.EMAIL_MAX_ATTEMPTS,
+        backoff_seconds: float = settings.EMAIL_RETRY_BACKOFF_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.pool = pool or SMTPConnectionPool()
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.pool.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                sent = self.drain_once()
+            except Exception:
+                logger.exception("Email outbox drain failed")
+                sent = 0
+            # Keep draining while there is a full backlog, otherwise sleep until woken
+            if sent < self.batch_size:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def _claim(self, db: Session) -> List[models.EmailOutbox]:
+        return (
+            db.query(models.EmailOutbox)
+            .filter(
+                models.EmailOutbox.status == models.EmailStatus.PENDING,
+                models.EmailOutbox.next_attempt_at <= datetime.utcnow(),
+            )
+            .order_by(models.EmailOutbox.next_attempt_at, models.EmailOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def drain_once(self) -> int:
+        """
+        Deliver one batch of due emails. Returns the number of rows processed.
+        """
+        db = self.session_factory()
+        try:
+            emails = self._claim(db)
+            if not emails:
+                db.commit()
+                return 0
+            with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+                results = list(executor.map(self._try_send, emails))
+            now = datetime.utcnow()
+            for email, error in zip(emails, results):
+                email.attempts += 1
+                if error is None:
+                    email.status = models.EmailStatus.SENT
+                    email.sent_at = now
+                    email.last_error = None
+                    continue
+                email.last_error = error
+                if email.attempts >= self.max_attempts:
+                    email.status = models.EmailStatus.FAILED
+                    logger.error("Giving up on email %s to %s: %s", email.id, email.email_to, error)
+                else:
+                    delay = self.backoff_seconds * (2 ** (email.attempts - 1))
+                    email.next_attempt_at = now + timedelta(seconds=delay)
+            db.commit()
+            return len(emails)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _try_send(self, email: models.EmailOutbox) -> Optional[str]:
+        try:
+            self.pool.send(email)
+            return None
+        except Exception as e:
+            logger.warning("Error sending email %s: %s", email.id, e)
+            return str(e)
+
+
+email_worker = EmailOutboxWorker()
@@ -0,0 +1,73 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+from datetime import datetime
+
+class Course(Base):
+    __tablename__ = "courses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String, index=True, nullable=False)
+    description = Column(Text, nullable=True)
+    # Kept in step with `modules` so completion checks never count them
+    module_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    modules = relationship(
+        "CourseModule", back_populates="course", order_by="CourseModule.position",
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
+
+class CourseModule(Base):
+    __tablename__ = "course_modules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    title = Column(String, nullable=False)
+    content = Column(Text, nullable=True)
+    position = Column(Integer, nullable=False, default=0)
+
+    course = relationship("Course", back_populates="modules")
+
+    __table_args__ = (
+        Index("ix_course_modules_course_id_position", "course_id", "position"),
+    )
+
+class ModuleProgress(Base):
+    """
+    A volunteer's progress through one module. Written in batches by the
+    progress buffer; `percent` only ever increases.
+    """
+    __tablename__ = "module_progress"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    module_id = Column(Integer, ForeignKey("course_modules.id", ondelete="CASCADE"), primary_key=True)
+    # Denormalized from the module so per-course progress is one index range
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    percent = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_module_progress_user_id_course_id", "user_id", "course_id"),
+    )
+
+class CourseProgress(Base):
+    """
+    Per-volunteer completion of a course, recomputed from `module_progress`
+    for the (user, course) pairs touched by each flush. Course summaries
+    read these rows, one per learner, instead of every module's progress.
+    """
+    __tablename__ = "course_progress"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    modules_completed = Column(Integer, nullable=False, default=0)
+    # Set once every module of the course is complete
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_course_progress_course_id_completed_at", "course_id", "completed_at"),
+    )
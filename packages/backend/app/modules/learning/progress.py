@@ -0,0 +1,303 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus, invalidation_bus
+from app.db.session import SessionLocal
+from app.modules.users.models import User
+from . import models, schemas
+
+logger = logging.getLogger(__name__)
+
+# (user_id, module_id) -> (highest percent seen, when it was first seen)
+ProgressKey = Tuple[int, int]
+PendingProgress = Dict[ProgressKey, Tuple[int, datetime]]
+
+COMPLETE_PERCENT = 100
+MODULES_CHANNEL = "course_modules"
+# Rows per upsert, well inside SQLite's bound parameter limit
+FLUSH_CHUNK_SIZE = 1000
+
+
+def _dialect(db: Session):
+    return postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+
+
+def _greatest(db: Session, *values):
+    # SQLite's two-argument max() is scalar, like Postgres' greatest()
+    return func.greatest(*values) if db.get_bind().dialect.name == "postgresql" else func.max(*values)
+
+
+def coalesce_events(pending: PendingProgress, user_id: int, events: Iterable[schemas.ProgressEvent], seen_at: datetime) -> None:
+    """Fold heartbeats into ``pending``, keeping the highest percent per (user, module)."""
+    for event in events:
+        key = (user_id, event.module_id)
+        current = pending.get(key)
+        if current is None or event.percent > current[0]:
+            pending[key] = (event.percent, seen_at)
+
+
+def recount_course_progress(db: Session, pairs: Iterable[Tuple[int, int]]) -> None:
+    """
+    Recompute `course_progress` for the given (user_id, course_id) pairs from
+    their module progress, inside the caller's transaction.
+    """
+    pairs = sorted(set(pairs))
+    if not pairs:
+        return
+    progress = models.ModuleProgress
+    rows = db.execute(
+        select(
+            progress.user_id,
+            progress.course_id,
+            func.count(progress.completed_at),
+            func.max(progress.completed_at),
+            func.max(progress.updated_at),
+            models.Course.module_count,
+        )
+        .join(models.Course, models.Course.id == progress.course_id)
+        .where(tuple_(progress.user_id, progress.course_id).in_(pairs))
+        .group_by(progress.user_id, progress.course_id, models.Course.module_count)
+        .order_by(progress.user_id, progress.course_id)
+    ).all()
+    if not rows:
+        return
+    values = [
+        {
+            "user_id": user_id,
+            "course_id": course_id,
+            "modules_completed": completed,
+            "completed_at": last_completed if module_count and completed >= module_count else None,
+            "updated_at": updated_at,
+        }
+        for user_id, course_id, completed, last_completed, updated_at, module_count in rows
+    ]
+    stmt = _dialect(db).insert(models.CourseProgress)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.CourseProgress.user_id, models.CourseProgress.course_id],
+        set_={
+            "modules_completed": stmt.excluded.modules_completed,
+            "completed_at": stmt.excluded.completed_at,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt, values)
+
+
+def refresh_course(db: Session, course_id: int) -> None:
+    """Recompute every learner's progress in a course after its modules changed."""
+    learners = db.scalars(
+        select(models.ModuleProgress.user_id).where(models.ModuleProgress.course_id == course_id).distinct()
+    ).all()
+    db.execute(delete(models.CourseProgress).where(models.CourseProgress.course_id == course_id))
+    for start in range(0, len(learners), FLUSH_CHUNK_SIZE):
+        recount_course_progress(db, [(user_id, course_id) for user_id in learners[start:start + FLUSH_CHUNK_SIZE]])
+
+
+def write_progress(db: Session, pending: PendingProgress) -> int:
+    """
+    Upsert coalesced progress in bulk and recount the affected courses, then
+    commit. Progress for modules or users deleted meanwhile is dropped.
+    Returns the number of module progress rows written.
+    """
+    if not pending:
+        return 0
+    module_ids = {module_id for _, module_id in pending}
+    user_ids = {user_id for user_id, _ in pending}
+    module_courses = dict(db.execute(
+        select(models.CourseModule.id, models.CourseModule.course_id).where(models.CourseModule.id.in_(module_ids))
+    ).all())
+    live_users: Set[int] = set(db.scalars(select(User.id).where(User.id.in_(user_ids))))
+
+    # Fixed row order so concurrent flushes lock progress rows in the same sequence
+    rows: List[dict] = [
+        {
+            "user_id": user_id,
+            "module_id": module_id,
+            "course_id": module_courses[module_id],
+            "percent": percent,
+            "completed_at": seen_at if percent >= COMPLETE_PERCENT else None,
+            "updated_at": seen_at,
+        }
+        for (user_id, module_id), (percent, seen_at) in sorted(pending.items())
+        if module_id in module_courses and user_id in live_users
+    ]
+    progress = models.ModuleProgress
+    for start in range(0, len(rows), FLUSH_CHUNK_SIZE):
+        stmt = _dialect(db).insert(progress)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[progress.user_id, progress.module_id],
+            set_={
+                # Heartbeats can arrive out of order; progress never goes backwards
+                "percent": _greatest(db, progress.percent, stmt.excluded.percent),
+                "completed_at": func.coalesce(progress.completed_at, stmt.excluded.completed_at),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.execute(stmt, rows[start:start + FLUSH_CHUNK_SIZE])
+    pairs = sorted({(row["user_id"], row["course_id"]) for row in rows})
+    for start in range(0, len(pairs), FLUSH_CHUNK_SIZE):
+        recount_course_progress(db, pairs[start:start + FLUSH_CHUNK_SIZE])
+    db.commit()
+    dropped = len(pending) - len(rows)
+    if dropped:
+        logger.info("Dropped progress for %d unknown modules or users", dropped)
+    return len(rows)
+
+
+class ModuleDirectory:
+    """
+    Process-local set of existing module ids, so heartbeats for unknown
+    modules are rejected before they are buffered. Writers call
+    :meth:`invalidate` after committing; the TTL bounds how late a module
+    created elsewhere is recognised if a broadcast is missed.
+    """
+
+    def __init__(self, bus: InvalidationBus, ttl: float = 60.0):
+        self.bus = bus
+        self.ttl = ttl
+        self._ids: Optional[Tuple[float, FrozenSet[int]]] = None
+        # Bumped on every invalidation so a load racing with a write is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+        bus.subscribe(MODULES_CHANNEL, self._drop)
+
+    def known(self, db: Session, module_ids: Iterable[int]) -> Set[int]:
+        """The subset of ``module_ids`` that exist."""
+        with self._lock:
+            entry = self._ids
+            generation = self._generation
+        if entry is None or entry[0] <= time.monotonic():
+            ids = frozenset(db.scalars(select(models.CourseModule.id)))
+            entry = (time.monotonic() + self.ttl, ids)
+            with self._lock:
+                if generation == self._generation:
+                    self._ids = entry
+        return set(module_ids) & entry[1]
+
+    def invalidate(self) -> None:
+        self.bus.publish(MODULES_CHANNEL)
+
+    def _drop(self, key: Optional[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            self._ids = None
+
+
+class ProgressBuffer:
+    """
+    Accepts progress heartbeats in memory, coalesced per (user, module), and
+    writes them with :func:`write_progress` on a background thread every
+    ``interval_seconds``, or as soon as ``max_pending`` keys are waiting.
+    Pending progress is lost if the process dies before a flush.
+
+    At most ``limit`` keys are held: beyond that, heartbeats for new keys are
+    refused with 503 (for example while the database is unreachable and
+    failed flushes keep their batch).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval_seconds: float = settings.LEARNING_PROGRESS_FLUSH_SECONDS,
+        max_pending: int = settings.LEARNING_PROGRESS_MAX_PENDING,
+        limit: int = settings.LEARNING_PROGRESS_BUFFER_LIMIT,
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.max_pending = max_pending
+        self.limit = limit
+        self._pending: PendingProgress = {}
+        self._lock = threading.Lock()
+        # One flush at a time, so an older batch never lands after a newer one
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, user_id: int, events: List[schemas.ProgressEvent]) -> int:
+        with self._lock:
+            new_keys = {(user_id, event.module_id) for event in events} - self._pending.keys()
+            if len(self._pending) + len(new_keys) > self.limit:
+                self._wake.set()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Progress is not being accepted right now, please retry shortly",
+                    headers={"Retry-After": str(max(1, round(self.interval_seconds)))},
+                )
+            coalesce_events(self._pending, user_id, events, datetime.utcnow())
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+        return len(events)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Write everything pending, on ``db`` or a session of our own."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            session = db if db is not None else self.session_factory()
+            try:
+                return write_progress(session, batch)
+            except Exception:
+                session.rollback()
+                # Put the batch back, under anything newer that arrived meanwhile, up to the limit
+                dropped = 0
+                with self._lock:
+                    for key, (percent, seen_at) in batch.items():
+                        current = self._pending.get(key)
+                        if current is None and len(self._pending) >= self.limit:
+                            dropped += 1
+                        elif current is None or percent > current[0]:
+                            self._pending[key] = (percent, seen_at)
+                if dropped:
+                    logger.warning("Dropped %d buffered progress entries over the buffer limit", dropped)
+                raise
+            finally:
+                if db is None:
+                    session.close()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="learning-progress-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Final learning progress flush failed")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Learning progress flush failed")
+
+
+module_directory = ModuleDirectory(invalidation_bus, ttl=settings.LEARNING_MODULE_CACHE_TTL_SECONDS)
+progress_buffer = ProgressBuffer()
@@ -0,0 +1,135 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.db.session import get_db
+from app.db.pagination import set_next_cursor
+from app.core.principals import Principal
+from app.core.security import get_current_user, RoleChecker
+from . import models, schemas, services
+from .progress import module_directory, progress_buffer
+
+router = APIRouter()
+
+admin_dependency = Depends(RoleChecker(['administrator']))
+
+@router.post("/courses", response_model=schemas.Course, status_code=status.HTTP_201_CREATED, dependencies=[admin_dependency])
+def create_course(course: schemas.CourseCreate, db: Session = Depends(get_db)):
+    """
+    Create a course with its modules (admin only).
+    """
+    return services.create_course(db=db, course=course)
+
+@router.get("/courses", response_model=List[schemas.Course])
+def read_courses(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Retrieve courses with their modules.
+    """
+    courses = services.get_courses(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, courses, limit, services.COURSE_SORT_COLUMN)
+    return courses
+
+@router.get("/courses/{course_id}", response_model=schemas.Course)
+def read_course(course_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    """
+    Retrieve a course with its modules.
+    """
+    db_course = services.get_course(db, course_id=course_id)
+    if db_course is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return db_course
+
+@router.put("/courses/{course_id}", response_model=schemas.Course, dependencies=[admin_dependency])
+def update_course(course_id: int, course: schemas.CourseUpdate, db: Session = Depends(get_db)):
+    """
+    Update a course (admin only).
+    """
+    db_course = services.update_course(db, course_id=course_id, course_update=course)
+    if db_course is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return db_course
+
+@router.delete("/courses/{course_id}", response_model=schemas.Course, dependencies=[admin_dependency])
+def delete_course(course_id: int, db: Session = Depends(get_db)):
+    """
+    Delete a course with its modules and all progress (admin only).
+    """
+    db_course = services.delete_course(db, course_id=course_id)
+    if db_course is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return db_course
+
+@router.post("/courses/{course_id}/modules", response_model=schemas.CourseModule, status_code=status.HTTP_201_CREATED, dependencies=[admin_dependency])
+def add_module(course_id: int, module: schemas.CourseModuleCreate, db: Session = Depends(get_db)):
+    """
+    Add a module to a course (admin only).
+    """
+    db_module = services.add_module(db, course_id=course_id, module=module)
+    if db_module is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return db_module
+
+@router.delete("/modules/{module_id}", response_model=schemas.CourseModule, dependencies=[admin_dependency])
+def delete_module(module_id: int, db: Session = Depends(get_db)):
+    """
+    Delete a module and everyone's progress in it (admin only).
+    """
+    db_module = services.delete_module(db, module_id=module_id)
+    if db_module is None:
+        raise HTTPException(status_code=404, detail="Module not found")
+    return db_module
+
+@router.get("/courses/{course_id}/summary", response_model=schemas.CourseSummary, dependencies=[admin_dependency])
+def read_course_summary(course_id: int, db: Session = Depends(get_db)):
+    """
+    Learners and completions for a course, as of the last progress flush (admin only).
+    """
+    db_course = db.get(models.Course, course_id)
+    if db_course is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return services.get_course_summary(db, db_course)
+
+@router.post("/progress", response_model=schemas.ProgressAccepted, status_code=status.HTTP_202_ACCEPTED)
+def record_progress(
+    batch: schemas.ProgressBatch,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Record a batch of progress heartbeats for the current user.
+
+    Events are coalesced per module and written within a few seconds. Events
+    for unknown modules are rejected and listed in `rejected`.
+    """
+    known = module_directory.known(db, {event.module_id for event in batch.events})
+    events = [event for event in batch.events if event.module_id in known]
+    rejected = sorted({event.module_id for event in batch.events} - known)
+    return schemas.ProgressAccepted(accepted=progress_buffer.add(current_user.id, events), rejected=rejected)
+
+@router.post("/progress/flush", response_model=schemas.ProgressFlushResult, dependencies=[admin_dependency])
+def flush_progress(db: Session = Depends(get_db)):
+    """
+    Write this worker's pending progress now (admin only).
+    """
+    return schemas.ProgressFlushResult(written=progress_buffer.flush(db))
+
+@router.get("/me/progress", response_model=List[schemas.CourseProgress])
+def read_my_progress(db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    """
+    The current user's progress in each course they have started.
+    """
+    return services.get_user_course_progress(db, current_user.id)
+
+@router.get("/me/courses/{course_id}/progress", response_model=List[schemas.ModuleProgress])
+def read_my_module_progress(course_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
+    """
+    The current user's progress in each module of a course.
+    """
+    return services.get_user_module_progress(db, current_user.id, course_id)
@@ -0,0 +1,79 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List
+from datetime import datetime
+
+class CourseModuleBase(BaseModel):
+    title: str
+    content: Optional[str] = None
+    position: int = 0
+
+class CourseModuleCreate(CourseModuleBase):
+    pass
+
+class CourseModule(CourseModuleBase):
+    id: int
+    course_id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CourseBase(BaseModel):
+    title: str
+    description: Optional[str] = None
+
+class CourseCreate(CourseBase):
+    modules: List[CourseModuleCreate] = []
+
+class CourseUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+class Course(CourseBase):
+    id: int
+    module_count: int
+    created_at: datetime
+    updated_at: datetime
+    modules: List[CourseModule] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Progress heartbeats
+PROGRESS_BATCH_MAX_EVENTS = 500
+
+class ProgressEvent(BaseModel):
+    module_id: int
+    percent: int = Field(..., ge=0, le=100)
+
+class ProgressBatch(BaseModel):
+    events: List[ProgressEvent] = Field(..., min_length=1, max_length=PROGRESS_BATCH_MAX_EVENTS)
+
+class ProgressAccepted(BaseModel):
+    accepted: int
+    # Module ids that do not exist; their events were discarded
+    rejected: List[int] = []
+
+class ModuleProgress(BaseModel):
+    module_id: int
+    percent: int
+    completed_at: Optional[datetime] = None
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CourseProgress(BaseModel):
+    course_id: int
+    modules_completed: int
+    completed_at: Optional[datetime] = None
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CourseSummary(BaseModel):
+    course_id: int
+    module_count: int
+    # Volunteers with any recorded progress
+    learners: int
+    completed: int
+    average_modules_completed: Optional[float] = None
+
+class ProgressFlushResult(BaseModel):
+    written: int
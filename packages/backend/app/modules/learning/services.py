@@ -0,0 +1,122 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, selectinload
+from . import models, schemas
+from .progress import module_directory, refresh_course
+from app.db.pagination import paginate
+from typing import List, Optional
+
+# Courses are listed by (title, id); cursors encode that pair
+COURSE_SORT_COLUMN = models.Course.title
+
+def _course_query(db: Session):
+    return db.query(models.Course).options(selectinload(models.Course.modules))
+
+def create_course(db: Session, course: schemas.CourseCreate) -> models.Course:
+    """Create a course together with its initial modules."""
+    db_course = models.Course(**course.model_dump(exclude={"modules"}), module_count=len(course.modules))
+    db_course.modules = [models.CourseModule(**module.model_dump()) for module in course.modules]
+    db.add(db_course)
+    db.commit()
+    module_directory.invalidate()
+    return get_course(db, db_course.id)
+
+def get_course(db: Session, course_id: int) -> Optional[models.Course]:
+    """Get a single course with its modules in order."""
+    return _course_query(db).filter(models.Course.id == course_id).first()
+
+def get_courses(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[models.Course]:
+    """Get a page of courses, ordered by (title, id)."""
+    return paginate(_course_query(db), COURSE_SORT_COLUMN, models.Course.id, skip=skip, limit=limit, cursor=cursor).all()
+
+def update_course(db: Session, course_id: int, course_update: schemas.CourseUpdate) -> Optional[models.Course]:
+    """Update a course's title or description."""
+    db_course = get_course(db, course_id)
+    if db_course:
+        for key, value in course_update.model_dump(exclude_unset=True).items():
+            setattr(db_course, key, value)
+        db.commit()
+        db_course = get_course(db, course_id)
+    return db_course
+
+def delete_course(db: Session, course_id: int) -> Optional[models.Course]:
+    """Delete a course; its modules and all progress go with it."""
+    db_course = get_course(db, course_id)
+    if db_course:
+        db.delete(db_course)
+        db.commit()
+        module_directory.invalidate()
+    return db_course
+
+def add_module(db: Session, course_id: int, module: schemas.CourseModuleCreate) -> Optional[models.CourseModule]:
+    """
+    Add a module to a course. Volunteers who had completed the course no longer have.
+    """
+    # Locks the course row so concurrent module changes keep module_count exact
+    updated = db.execute(
+        update(models.Course)
+        .where(models.Course.id == course_id)
+        .values(module_count=models.Course.module_count + 1)
+    )
+    if not updated.rowcount:
+        return None
+    db_module = models.CourseModule(**module.model_dump(), course_id=course_id)
+    db.add(db_module)
+    db.flush()
+    refresh_course(db, course_id)
+    db.commit()
+    module_directory.invalidate()
+    db.refresh(db_module)
+    return db_module
+
+def get_module(db: Session, module_id: int) -> Optional[models.CourseModule]:
+    return db.query(models.CourseModule).filter(models.CourseModule.id == module_id).first()
+
+def delete_module(db: Session, module_id: int) -> Optional[models.CourseModule]:
+    """Delete a module and its progress, then recount the course for every learner."""
+    db_module = get_module(db, module_id)
+    if db_module:
+        course_id = db_module.course_id
+        db.execute(
+            update(models.Course)
+            .where(models.Course.id == course_id)
+            .values(module_count=models.Course.module_count - 1)
+        )
+        db.delete(db_module)
+        db.flush()
+        refresh_course(db, course_id)
+        db.commit()
+        module_directory.invalidate()
+    return db_module
+
+def get_user_course_progress(db: Session, user_id: int) -> List[models.CourseProgress]:
+    """A volunteer's progress in every course they have started, as of the last flush."""
+    return db.scalars(
+        select(models.CourseProgress)
+        .where(models.CourseProgress.user_id == user_id)
+        .order_by(models.CourseProgress.course_id)
+    ).all()
+
+def get_user_module_progress(db: Session, user_id: int, course_id: int) -> List[models.ModuleProgress]:
+    """A volunteer's per-module progress in one course, as of the last flush."""
+    return db.scalars(
+        select(models.ModuleProgress)
+        .where(models.ModuleProgress.user_id == user_id, models.ModuleProgress.course_id == course_id)
+        .order_by(models.ModuleProgress.module_id)
+    ).all()
+
+def get_course_summary(db: Session, course: models.Course) -> schemas.CourseSummary:
+    """
+    Completion figures for a course, from one `course_progress` row per learner.
+    """
+    progress = models.CourseProgress
+    learners, completed, average = db.execute(
+        select(func.count(), func.count(progress.completed_at), func.avg(progress.modules_completed))
+        .where(progress.course_id == course.id)
+    ).one()
+    return schemas.CourseSummary(
+        course_id=course.id,
+        module_count=course.module_count,
+        learners=learners,
+        completed=completed,
+        average_modules_completed=round(float(average), 3) if average is not None else None,
+    )
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Date, Enum, Float, Index, Integer, String
+from app.db.base import Base
+import enum
+
+class RollupDimension(str, enum.Enum):
+    ORG = "org"
+    USER = "user"
+    REGION = "region"
+    ORGANIZATIONAL_UNIT = "organizational_unit"
+
+# Key of the single org-wide row per day, and of users with no region or unit on their contact
+UNASSIGNED_KEY = ""
+
+class DailyRollup(Base):
+    """
+    Per-day task and asset statistics for one (dimension, key), e.g. one user
+    id, region or organizational unit. Maintained alongside task and asset
+    writes so reports never scan `tasks` or `assets`.
+
+    Tasks count towards the day they were created and the day they were
+    completed; assets towards the day they were assigned. Regions and units
+    are taken from the owner's contact.
+    """
+    __tablename__ = "report_daily_rollups"
+
+    dimension = Column(Enum(RollupDimension, native_enum=False), primary_key=True)
+    day = Column(Date, primary_key=True)
+    key = Column(String, primary_key=True)
+    tasks_created = Column(Integer, nullable=False, default=0)
+    tasks_completed = Column(Integer, nullable=False, default=0)
+    # Sum of created -> completed time over tasks_completed, for average latency
+    completion_seconds = Column(Float, nullable=False, default=0.0)
+    assets_assigned = Column(Integer, nullable=False, default=0)
+
+    # The primary key serves date-range reports per dimension; this one a single key's history
+    __table_args__ = (
+        Index("ix_report_daily_rollups_dimension_key_day", "dimension", "key", "day"),
+    )
@@ -0,0 +1,262 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.modules.assets.models import Asset
+from app.modules.contacts.models import Contact
+from app.modules.tasks.models import Task
+from .models import DailyRollup, RollupDimension, UNASSIGNED_KEY
+
+logger = logging.getLogger(__name__)
+
+# (region, organizational_unit) of a user, from their contact
+Placement = Tuple[str, str]
+UNPLACED: Placement = (UNASSIGNED_KEY, UNASSIGNED_KEY)
+
+RollupKey = Tuple[RollupDimension, date, str]
+METRICS = ("tasks_created", "tasks_completed", "completion_seconds", "assets_assigned")
+CREATED, COMPLETED, COMPLETION_SECONDS, ASSIGNED = range(len(METRICS))
+
+
+class TaskFacts(NamedTuple):
+    owner_id: Optional[int]
+    created_at: datetime
+    completed_at: Optional[datetime]
+
+
+class AssetFacts(NamedTuple):
+    assignee_id: Optional[int]
+    assigned_at: Optional[datetime]
+
+
+def task_facts(task) -> TaskFacts:
+    return TaskFacts(task.owner_id, task.created_at, task.completed_at)
+
+
+def asset_facts(asset) -> AssetFacts:
+    return AssetFacts(asset.assignee_id, asset.assigned_at)
+
+
+class RollupDeltas:
+    """Accumulates metric changes per (dimension, day, key) before they are written."""
+
+    def __init__(self, placements: Dict[int, Placement]):
+        self.placements = placements
+        self.rows: Dict[RollupKey, List[float]] = defaultdict(lambda: [0, 0, 0.0, 0])
+
+    def _targets(self, user_id: Optional[int]) -> List[Tuple[RollupDimension, str]]:
+        targets = [(RollupDimension.ORG, UNASSIGNED_KEY)]
+        if user_id is not None:
+            region, unit = self.placements.get(user_id, UNPLACED)
+            targets += [
+                (RollupDimension.USER, str(user_id)),
+                (RollupDimension.REGION, region),
+                (RollupDimension.ORGANIZATIONAL_UNIT, unit),
+            ]
+        return targets
+
+    def add(self, user_id: Optional[int], day: date, metric: int, amount: float) -> None:
+        for dimension, key in self._targets(user_id):
+            self.rows[(dimension, day, key)][metric] += amount
+
+    def task(self, facts: Optional[TaskFacts], sign: int) -> None:
+        if facts is None:
+            return
+        self.add(facts.owner_id, facts.created_at.date(), CREATED, sign)
+        if facts.completed_at is not None:
+            latency = max(0.0, (facts.completed_at - facts.created_at).total_seconds())
+            self.add(facts.owner_id, facts.completed_at.date(), COMPLETED, sign)
+            self.add(facts.owner_id, facts.completed_at.date(), COMPLETION_SECONDS, sign * latency)
+
+    def asset(self, facts: Optional[AssetFacts], sign: int) -> None:
+        if facts is None or facts.assignee_id is None or facts.assigned_at is None:
+            return
+        self.add(facts.assignee_id, facts.assigned_at.date(), ASSIGNED, sign)
+
+
+def placements(db: Session, user_ids: Iterable[Optional[int]]) -> Dict[int, Placement]:
+    """Region and organizational unit of each user, from their (first) contact."""
+    ids = {user_id for user_id in user_ids if user_id is not None}
+    if not ids:
+        return {}
+    rows = db.execute(
+        select(Contact.user_id, Contact.region, Contact.organizational_unit)
+        .where(Contact.user_id.in_(ids))
+        .order_by(Contact.user_id, Contact.id.desc())
+    ).all()
+    # Descending ids, so the first contact of each user is written last
+    return {user_id: (region or UNASSIGNED_KEY, unit or UNASSIGNED_KEY) for user_id, region, unit in rows}
+
+
+def _insert(db: Session):
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(DailyRollup)
+
+
+def apply_rollup_deltas(db: Session, deltas: RollupDeltas) -> None:
+    """
+    Add ``deltas`` to the rollups with one upsert, inside the caller's transaction.
+    """
+    # Fixed row order so concurrent writers lock rollup rows in the same sequence
+    rows = [
+        {"dimension": dimension, "day": day, "key": key, **dict(zip(METRICS, values))}
+        for (dimension, day, key), values in sorted(deltas.rows.items(), key=lambda item: (item[0][0].value, item[0][1], item[0][2]))
+        if any(values)
+    ]
+    if not rows:
+        return
+    stmt = _insert(db)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyRollup.dimension, DailyRollup.day, DailyRollup.key],
+        set_={metric: getattr(DailyRollup, metric) + getattr(stmt.excluded, metric) for metric in METRICS},
+    )
+    db.execute(stmt, rows)
+
+
+def record_task_changes(db: Session, changes: Iterable[Tuple[Optional[TaskFacts], Optional[TaskFacts]]]) -> None:
+    """
+    Move rollups from each task's ``before`` facts to its ``after`` facts; None
+    on either side means the task is being created or deleted.
+    """
+    changes = [(before, after) for before, after in changes if before != after]
+    if not changes:
+        return
+    owners = [facts.owner_id for pair in changes for facts in pair if facts is not None]
+    deltas = RollupDeltas(placements(db, owners))
+    for before, after in changes:
+        deltas.task(before, -1)
+        deltas.task(after, 1)
+    apply_rollup_deltas(db, deltas)
+
+
+def record_task_change(db: Session, before: Optional[TaskFacts], after: Optional[TaskFacts]) -> None:
+    record_task_changes(db, [(before, after)])
+
+
+def record_asset_change(db: Session, before: Optional[AssetFacts], after: Optional[AssetFacts]) -> None:
+    """Move rollups from an asset's ``before`` assignment to its ``after`` one."""
+    if before == after:
+        return
+    assignees = [facts.assignee_id for facts in (before, after) if facts is not None]
+    deltas = RollupDeltas(placements(db, assignees))
+    deltas.asset(before, -1)
+    deltas.asset(after, 1)
+    apply_rollup_deltas(db, deltas)
+
+
+def reattribute_user(db: Session, user_id: int, before: Placement, after: Placement) -> None:
+    """
+    Move a user's rollups between regions / units after their contact changed,
+    using the user's own rows rather than rescanning their tasks.
+    """
+    if before == after:
+        return
+    user_rows = db.execute(
+        select(DailyRollup.day, *(getattr(DailyRollup, metric) for metric in METRICS)).where(
+            DailyRollup.dimension == RollupDimension.USER,
+            DailyRollup.key == str(user_id),
+        )
+    ).all()
+    deltas = RollupDeltas({})
+    moves = [
+        (RollupDimension.REGION, before[0], after[0]),
+        (RollupDimension.ORGANIZATIONAL_UNIT, before[1], after[1]),
+    ]
+    for day, *values in user_rows:
+        for dimension, old_key, new_key in moves:
+            if old_key == new_key:
+                continue
+            for index, value in enumerate(values):
+                deltas.rows[(dimension, day, old_key)][index] -= value
+                deltas.rows[(dimension, day, new_key)][index] += value
+    apply_rollup_deltas(db, deltas)
+
+
+def detach_users(db: Session, user_ids: Iterable[int]) -> None:
+    """
+    Remove users' contributions from the user, region and unit rollups ahead
+    of their deletion, matching the ON DELETE rules: their tasks are kept
+    org-wide as ownerless tasks, their assets become unassigned.
+    """
+    ids = sorted(set(user_ids))
+    if not ids:
+        return
+    placed = placements(db, ids)
+    user_keys = [str(user_id) for user_id in ids]
+    user_rows = db.execute(
+        select(DailyRollup.key, DailyRollup.day, *(getattr(DailyRollup, metric) for metric in METRICS)).where(
+            DailyRollup.dimension == RollupDimension.USER,
+            DailyRollup.key.in_(user_keys),
+        )
+    ).all()
+    deltas = RollupDeltas({})
+    for key, day, *values in user_rows:
+        region, unit = placed.get(int(key), UNPLACED)
+        for dimension, target in ((RollupDimension.REGION, region), (RollupDimension.ORGANIZATIONAL_UNIT, unit)):
+            for index, value in enumerate(values):
+                deltas.rows[(dimension, day, target)][index] -= value
+        deltas.rows[(RollupDimension.ORG, day, UNASSIGNED_KEY)][ASSIGNED] -= values[ASSIGNED]
+    apply_rollup_deltas(db, deltas)
+    db.execute(
+        delete(DailyRollup).where(DailyRollup.dimension == RollupDimension.USER, DailyRollup.key.in_(user_keys))
+    )
+
+
+def _seconds_between(db: Session, start, end):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * 86400.0
+
+
+def _as_date(value) -> date:
+    # SQLite returns date() results as ISO strings
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def rebuild_rollups(db: Session) -> int:
+    """
+    Recompute every rollup from `tasks` and `assets`, repairing any drift (for
+    example from contacts edited outside the API). Scans the OLTP tables, so
+    run it off-peak. Returns the number of rollup rows written.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Hold incremental updates until the rebuilt rows are committed
+        db.execute(text("LOCK TABLE report_daily_rollups IN EXCLUSIVE MODE"))
+    created_day = func.date(Task.created_at)
+    completed_day = func.date(Task.completed_at)
+    assigned_day = func.date(Asset.assigned_at)
+    created = db.execute(
+        select(Task.owner_id, created_day, func.count()).group_by(Task.owner_id, created_day)
+    ).all()
+    completed = db.execute(
+        select(Task.owner_id, completed_day, func.count(), func.sum(_seconds_between(db, Task.created_at, Task.completed_at)))
+        .where(Task.completed_at.is_not(None))
+        .group_by(Task.owner_id, completed_day)
+    ).all()
+    assigned = db.execute(
+        select(Asset.assignee_id, assigned_day, func.count())
+        .where(Asset.assignee_id.is_not(None), Asset.assigned_at.is_not(None))
+        .group_by(Asset.assignee_id, assigned_day)
+    ).all()
+
+    users = {row[0] for rows in (created, completed, assigned) for row in rows}
+    deltas = RollupDeltas(placements(db, users))
+    for owner_id, day, count in created:
+        deltas.add(owner_id, _as_date(day), CREATED, count)
+    for owner_id, day, count, seconds in completed:
+        deltas.add(owner_id, _as_date(day), COMPLETED, count)
+        deltas.add(owner_id, _as_date(day), COMPLETION_SECONDS, max(0.0, float(seconds or 0)))
+    for assignee_id, day, count in assigned:
+        deltas.add(assignee_id, _as_date(day), ASSIGNED, count)
+
+    db.execute(delete(DailyRollup))
+    apply_rollup_deltas(db, deltas)
+    db.commit()
+    written = sum(1 for values in deltas.rows.values() if any(values))
+    logger.info("Rebuilt %d report rollup rows", written)
+    return written
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+
+from app.db.session import get_db
+from app.core.security import RoleChecker
+from . import models, rollups, schemas, services
+
+router = APIRouter()
+
+admin_dependency = Depends(RoleChecker(['administrator']))
+
+
+@router.get("/daily", response_model=List[schemas.DailyReportRow], dependencies=[admin_dependency])
+def read_daily_report(
+    start: date,
+    end: date,
+    dimension: models.RollupDimension = models.RollupDimension.ORG,
+    key: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Day-by-day task and asset statistics per user, region, organizational unit
+    or organisation-wide (admin only). `key` selects one user id, region or unit.
+    """
+    return services.get_daily_report(db, dimension, start, end, key)
+
+
+@router.get("/summary", response_model=List[schemas.ReportSummaryRow], dependencies=[admin_dependency])
+def read_summary_report(
+    start: date,
+    end: date,
+    dimension: models.RollupDimension = models.RollupDimension.REGION,
+    db: Session = Depends(get_db),
+):
+    """
+    Statistics per key of `dimension` totalled over a date range (admin only).
+    """
+    return services.get_summary_report(db, dimension, start, end)
+
+
+@router.post("/rollups/rebuild", response_model=schemas.RollupRebuildResult, dependencies=[admin_dependency])
+def rebuild_rollups(db: Session = Depends(get_db)):
+    """
+    Recompute all rollups from tasks and assets, repairing any drift (admin only).
+    Scans the full tables; run off-peak.
+    """
+    return schemas.RollupRebuildResult(rows=rollups.rebuild_rollups(db))
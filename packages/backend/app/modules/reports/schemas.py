@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import date
+from .models import RollupDimension
+
+class RollupMetrics(BaseModel):
+    tasks_created: int
+    tasks_completed: int
+    # Mean created -> completed time of the tasks completed in the period
+    average_completion_seconds: Optional[float] = None
+    assets_assigned: int
+
+class DailyReportRow(RollupMetrics):
+    day: date
+    dimension: RollupDimension
+    key: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReportSummaryRow(RollupMetrics):
+    dimension: RollupDimension
+    key: str
+
+class RollupRebuildResult(BaseModel):
+    rows: int
@@ -0,0 +1,87 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from . import models, schemas
+from datetime import date
+from typing import List, Optional
+
+# Longest period a single report may cover
+MAX_REPORT_DAYS = 366
+
+def _average(total_seconds: float, completed: int) -> Optional[float]:
+    return round(total_seconds / completed, 3) if completed else None
+
+def _check_range(start: date, end: date) -> None:
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days >= MAX_REPORT_DAYS:
+        raise HTTPException(status_code=400, detail=f"Reports cover at most {MAX_REPORT_DAYS} days")
+
+def get_daily_report(
+    db: Session,
+    dimension: models.RollupDimension,
+    start: date,
+    end: date,
+    key: Optional[str] = None,
+) -> List[schemas.DailyReportRow]:
+    """
+    Per-day rollups for `dimension` between `start` and `end` (inclusive),
+    optionally for a single key. Reads only the rollup table.
+    """
+    _check_range(start, end)
+    query = select(models.DailyRollup).where(
+        models.DailyRollup.dimension == dimension,
+        models.DailyRollup.day.between(start, end),
+    )
+    if key is not None:
+        query = query.where(models.DailyRollup.key == key)
+    rows = db.scalars(query.order_by(models.DailyRollup.day, models.DailyRollup.key)).all()
+    return [
+        schemas.DailyReportRow(
+            day=row.day,
+            dimension=row.dimension,
+            key=row.key,
+            tasks_created=row.tasks_created,
+            tasks_completed=row.tasks_completed,
+            average_completion_seconds=_average(row.completion_seconds, row.tasks_completed),
+            assets_assigned=row.assets_assigned,
+        )
+        for row in rows
+        if row.tasks_created or row.tasks_completed or row.assets_assigned
+    ]
+
+def get_summary_report(
+    db: Session,
+    dimension: models.RollupDimension,
+    start: date,
+    end: date,
+) -> List[schemas.ReportSummaryRow]:
+    """
+    Totals per key of `dimension` over `start`..`end` (inclusive), summed from the daily rollups.
+    """
+    _check_range(start, end)
+    rollup = models.DailyRollup
+    rows = db.execute(
+        select(
+            rollup.key,
+            func.sum(rollup.tasks_created),
+            func.sum(rollup.tasks_completed),
+            func.sum(rollup.completion_seconds),
+            func.sum(rollup.assets_assigned),
+        )
+        .where(rollup.dimension == dimension, rollup.day.between(start, end))
+        .group_by(rollup.key)
+        .order_by(rollup.key)
+    ).all()
+    return [
+        schemas.ReportSummaryRow(
+            dimension=dimension,
+            key=key,
+            tasks_created=created,
+            tasks_completed=completed,
+            average_completion_seconds=_average(seconds, completed),
+            assets_assigned=assigned,
+        )
+        for key, created, completed, seconds, assigned in rows
+        if created or completed or assigned
+    ]
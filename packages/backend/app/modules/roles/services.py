@@ -1,9 +1,18 @@
+from typing import Optional
+
 from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.modules.users import models, schemas
 from app.core.config import settings
+from app.core.principals import RoleSnapshot, principal_cache, token_versions
 
 BASELINE_ROLE = settings.BASELINE_ROLE
+BASELINE_ROLE_DESCRIPTION = 'Default application user'
+
+# Resolved once at startup, so registration never looks the role up by name
+_baseline_role: Optional[RoleSnapshot] = None
 
 def get_roles(db: Session):
     return db.query(models.Role).all()
@@ -16,26 +25,31 @@ def create_role(db: Session, role: schemas.RoleCreate):
     return db_role
 
 def assign_role(db: Session, user_id: int, role_id: int):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.query(models.User).options(*schemas.user_load_options()).filter(models.User.id == user_id).first()
     role = db.query(models.Role).filter(models.Role.id == role_id).first()
     if user and role:
         if role not in user.roles:
             user.roles.append(role)
             db.commit()
             db.refresh(user)
+            principal_cache.invalidate_user(user.id)
         return user
     return None
 
 def revoke_role(db: Session, user_id: int, role_id: int):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.query(models.User).options(*schemas.user_load_options()).filter(models.User.id == user_id).first()
     role = db.query(models.Role).filter(models.Role.id == role_id).first()
     if user and role and role in user.roles:
         # Prevent revoking baseline role to ensure every user retains minimal role
         if role.name == BASELINE_ROLE:
             raise HTTPException(status_code=400, detail=f"Cannot revoke the baseline role: '{BASELINE_ROLE}'")
         user.roles.remove(role)
+        # Tokens issued with the revoked role must stop authorizing
+        user.token_version = models.User.token_version + 1
         db.commit()
         db.refresh(user)
+        principal_cache.invalidate_user(user.id)
+        token_versions.invalidate(user.id)
         return user
     return None
 
@@ -43,3 +57,32 @@ def revoke_role(db: Session, user_id: int, role_id: int):
 def get_role_by_name(db: Session, name: str):
     return db.query(models.Role).filter(models.Role.name == name).first()
 
+
+
+def remember_baseline_role(role: models.Role) -> None:
+    global _baseline_role
+    _baseline_role = RoleSnapshot(id=role.id, name=role.name, description=role.description)
+
+
+def forget_baseline_role() -> None:
+    """Resolve the baseline role again on next use, e.g. after its row was replaced."""
+    global _baseline_role
+    _baseline_role = None
+
+
+async def get_baseline_role(db: AsyncSession) -> RoleSnapshot:
+    """
+    The role every new user receives. Normally remembered when roles are
+    seeded at startup; resolved (and created if missing) on first use
+    otherwise, committing on its own so a failed registration cannot roll it back.
+    """
+    if _baseline_role is not None:
+        return _baseline_role
+    result = await db.execute(select(models.Role).where(models.Role.name == BASELINE_ROLE))
+    role = result.scalars().first()
+    if role is None:
+        role = models.Role(name=BASELINE_ROLE, description=BASELINE_ROLE_DESCRIPTION)
+        db.add(role)
+        await db.commit()
+    remember_baseline_role(role)
+    return _baseline_role
@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus, invalidation_bus
+from . import models, schemas
+
+INVALIDATION_CHANNEL = "task_templates"
+
+
+class TemplateCache:
+    """
+    Read-through, process-local cache of task templates by id plus the full
+    list ordered by (name, id).
+
+    Writers call :meth:`invalidate` after committing; the invalidation is
+    broadcast on the bus so other workers drop their copies too. The TTL only
+    bounds staleness if a broadcast is missed.
+    """
+
+    def __init__(self, bus: InvalidationBus, ttl: float = 300.0):
+        self.bus = bus
+        self.ttl = ttl
+        self._by_id: Dict[int, Tuple[float, schemas.CachedTaskTemplate]] = {}
+        self._list: Optional[Tuple[float, List[schemas.CachedTaskTemplate]]] = None
+        # Bumped on every invalidation so a load racing with a write is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+        bus.subscribe(INVALIDATION_CHANNEL, self._drop)
+
+    def _fresh(self, entry) -> bool:
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, db: Session, template_id: int) -> Optional[schemas.CachedTaskTemplate]:
+        with self._lock:
+            entry = self._by_id.get(template_id)
+            generation = self._generation
+        if self._fresh(entry):
+            return entry[1]
+        db_template = db.query(models.TaskTemplate).filter(models.TaskTemplate.id == template_id).first()
+        if db_template is None:
+            return None
+        template = schemas.CachedTaskTemplate.model_validate(db_template)
+        with self._lock:
+            if generation == self._generation:
+                self._by_id[template_id] = (time.monotonic() + self.ttl, template)
+        return template
+
+    def list(self, db: Session) -> List[schemas.CachedTaskTemplate]:
+        with self._lock:
+            entry = self._list
+            generation = self._generation
+        if self._fresh(entry):
+            return entry[1]
+        rows = (
+            db.query(models.TaskTemplate)
+            .options(*schemas.template_load_options())
+            .order_by(models.TaskTemplate.name, models.TaskTemplate.id)
+            .all()
+        )
+        templates = [schemas.CachedTaskTemplate.model_validate(row) for row in rows]
+        with self._lock:
+            if generation == self._generation:
+                expires_at = time.monotonic() + self.ttl
+                self._list = (expires_at, templates)
+                for template in templates:
+                    self._by_id[template.id] = (expires_at, template)
+        return templates
+
+    def invalidate(self, template_id: Optional[int] = None) -> None:
+        """Drop ``template_id`` (or everything) here and in every other worker."""
+        self.bus.publish(INVALIDATION_CHANNEL, None if template_id is None else str(template_id))
+
+    def clear(self) -> None:
+        self._drop(None)
+
+    def _drop(self, key: Optional[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            self._list = None
+            if key is None:
+                self._by_id.clear()
+            else:
+                self._by_id.pop(int(key), None)
+
+
+template_cache = TemplateCache(invalidation_bus, ttl=settings.TEMPLATE_CACHE_TTL_SECONDS)
@@ -10,3 +10,5 @@ class TaskTemplate(Base):
     description = Column(Text, nullable=True)
     # This will store the schema for the custom fields
     fields_schema = Column(JSON, nullable=False, default=[])
+    # Bumped on every update; compiled custom_data validators are stamped with it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
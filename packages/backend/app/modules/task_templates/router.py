@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.db.session import get_db
+from app.db.pagination import set_next_cursor
 from app.core.security import RoleChecker
 from . import schemas, services
 
@@ -23,14 +24,17 @@ def create_template(
 
 @router.get("/", response_model=List[schemas.TaskTemplate], dependencies=[admin_dependency])
 def read_templates(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Retrieve all task templates (admin only).
     """
-    templates = services.get_all_templates(db, skip=skip, limit=limit)
+    templates = services.get_all_templates(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, templates, limit, services.TEMPLATE_SORT_COLUMN)
     return templates
 
 @router.get("/{template_id}", response_model=schemas.TaskTemplate, dependencies=[admin_dependency])
@@ -41,7 +45,7 @@ def read_template(
     """
     Retrieve a specific task template by ID (admin only).
     """
-    db_template = services.get_template(db, template_id=template_id)
+    db_template = services.get_cached_template(db, template_id=template_id)
     if db_template is None:
         raise HTTPException(status_code=404, detail="Task template not found")
     return db_template
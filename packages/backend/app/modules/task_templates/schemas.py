@@ -1,4 +1,5 @@
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import raiseload
 from typing import Optional, List, Any, Dict
 
 class FieldSchema(BaseModel):
@@ -25,3 +26,11 @@ class TaskTemplate(TaskTemplateBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+class CachedTaskTemplate(TaskTemplate):
+    """Detached template snapshot held by the template cache."""
+    version: int = 1
+
+def template_load_options():
+    """`TaskTemplate` reads only columns; raise instead of silently lazy-loading a relationship."""
+    return (raiseload("*"),)
@@ -1,22 +1,55 @@
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from . import models, schemas
+from .cache import template_cache
+from app.db.pagination import decode_cursor
 from typing import List, Optional
 
+# Templates are listed by (name, id); cursors encode that pair
+TEMPLATE_SORT_COLUMN = models.TaskTemplate.name
+
 def create_template(db: Session, template: schemas.TaskTemplateCreate) -> models.TaskTemplate:
     """Create a new task template."""
     db_template = models.TaskTemplate(**template.model_dump())
     db.add(db_template)
     db.commit()
     db.refresh(db_template)
+    template_cache.invalidate(db_template.id)
     return db_template
 
 def get_template(db: Session, template_id: int) -> Optional[models.TaskTemplate]:
-    """Get a single task template by its ID."""
+    """Get a single task template by its ID, for writes. Reads go through `get_cached_template`."""
     return db.query(models.TaskTemplate).filter(models.TaskTemplate.id == template_id).first()
 
-def get_all_templates(db: Session, skip: int = 0, limit: int = 100) -> List[models.TaskTemplate]:
-    """Get all task templates."""
-    return db.query(models.TaskTemplate).offset(skip).limit(limit).all()
+def get_cached_template(db: Session, template_id: int) -> Optional[schemas.CachedTaskTemplate]:
+    """Get a task template snapshot from the template cache."""
+    return template_cache.get(db, template_id)
+
+def _cursor_position(templates: List[schemas.CachedTaskTemplate], cursor: str) -> int:
+    """
+    Index of the first template after ``cursor`` in the cached list. The list is
+    in database collation order, so the cursor row is located by id; only if it
+    has since been deleted is its name compared in Python.
+    """
+    name, template_id = decode_cursor(cursor, TEMPLATE_SORT_COLUMN)
+    if not isinstance(name, str):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    for index, template in enumerate(templates):
+        if template.id == template_id:
+            return index + 1
+    for index, template in enumerate(templates):
+        if (template.name, template.id) > (name, template_id):
+            return index
+    return len(templates)
+
+def get_all_templates(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[schemas.CachedTaskTemplate]:
+    """Get a page of task templates from the cached list, ordered by (name, id)."""
+    templates = template_cache.list(db)
+    if cursor:
+        templates = templates[_cursor_position(templates, cursor):]
+    elif skip:
+        templates = templates[skip:]
+    return templates[:limit]
 
 def update_template(db: Session, template_id: int, template_update: schemas.TaskTemplateUpdate) -> Optional[models.TaskTemplate]:
     """Update a task template."""
@@ -25,8 +58,10 @@ def update_template(db: Session, template_id: int, template_update: schemas.Task
         update_data = template_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_template, key, value)
+        db_template.version = (db_template.version or 0) + 1
         db.commit()
         db.refresh(db_template)
+        template_cache.invalidate(template_id)
     return db_template
 
 def delete_template(db: Session, template_id: int) -> Optional[models.TaskTemplate]:
@@ -35,4 +70,5 @@ def delete_template(db: Session, template_id: int) -> Optional[models.TaskTempla
     if db_template:
         db.delete(db_template)
         db.commit()
+        template_cache.invalidate(template_id)
     return db_template
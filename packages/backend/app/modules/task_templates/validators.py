@@ -0,0 +1,129 @@
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
+from sqlalchemy.orm import Session
+
+from app.core.invalidation import InvalidationBus, invalidation_bus
+from .cache import INVALIDATION_CHANNEL, template_cache
+
+# Field types offered by the template editor, mapped to the Python type the value must parse as
+FIELD_TYPES: Dict[str, Any] = {
+    "text": str,
+    "textarea": str,
+    "number": float,
+    "date": date,
+    "datetime": datetime,
+    "checkbox": bool,
+}
+TEXT_TYPES = {"text", "textarea"}
+
+
+class CustomDataValidator:
+    """
+    Validator compiled once from a template's ``fields_schema``, given as dicts
+    or ``FieldSchema`` models.
+
+    Checks required fields, value types, ``select`` options and date parsing.
+    Unknown keys are allowed, as before.
+    """
+
+    def __init__(self, fields_schema: List[dict]):
+        fields = [f.model_dump() if isinstance(f, BaseModel) else f for f in fields_schema or []]
+        self.fields = [f for f in fields if f.get("name")]
+        self.required = [f["name"] for f in self.fields if f.get("required", False)]
+        # Empty strings from optional non-text inputs mean "not provided"
+        self._blank_as_missing = {
+            f["name"] for f in self.fields
+            if not f.get("required", False) and f.get("type") not in TEXT_TYPES
+        }
+        self._model = self._compile(self.fields)
+
+    @staticmethod
+    def _field_type(field: dict) -> Any:
+        if field.get("type") == "select":
+            options = field.get("options") or []
+            return Literal[tuple(options)] if options else str
+        return FIELD_TYPES.get(field.get("type"), Any)
+
+    def _compile(self, fields: List[dict]) -> type:
+        definitions = {}
+        for index, field in enumerate(fields):
+            field_type = self._field_type(field)
+            # Template field names are arbitrary strings, so address them by alias
+            if field.get("required", False):
+                definitions[f"field_{index}"] = (field_type, Field(..., alias=field["name"]))
+            else:
+                definitions[f"field_{index}"] = (Optional[field_type], Field(None, alias=field["name"]))
+        return create_model("CustomData", __config__=ConfigDict(extra="allow"), **definitions)
+
+    def validate(self, custom_data: Dict[str, Any]) -> None:
+        missing = [name for name in self.required if name not in custom_data]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Missing required custom fields: {missing}",
+            )
+        data = {k: v for k, v in custom_data.items() if not (k in self._blank_as_missing and v == "")}
+        try:
+            self._model.model_validate(data)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=[
+                    {"loc": ["custom_data", *err["loc"]], "msg": err["msg"], "type": err["type"]}
+                    for err in e.errors(include_url=False)
+                ],
+            )
+
+
+class ValidatorCache:
+    """
+    Compiled validators keyed by template id, stamped with the template version
+    they were built from. Entries are dropped with the template cache's.
+    """
+
+    def __init__(self, bus: InvalidationBus):
+        self._entries: Dict[int, Tuple[int, CustomDataValidator]] = {}
+        self._lock = threading.Lock()
+        bus.subscribe(INVALIDATION_CHANNEL, self._drop)
+
+    def for_template(self, template) -> CustomDataValidator:
+        with self._lock:
+            entry = self._entries.get(template.id)
+        if entry is not None and entry[0] == template.version:
+            return entry[1]
+        validator = CustomDataValidator(template.fields_schema)
+        with self._lock:
+            self._entries[template.id] = (template.version, validator)
+        return validator
+
+    def get(self, db: Session, template_id: int) -> Optional[CustomDataValidator]:
+        """
+        Validator for ``template_id``, checked against the template cache's
+        version so the cache TTL also bounds staleness after a missed broadcast.
+        Returns None when the template does not exist.
+        """
+        template = template_cache.get(db, template_id)
+        if template is None:
+            return None
+        return self.for_template(template)
+
+    def invalidate(self, template_id: int) -> None:
+        with self._lock:
+            self._entries.pop(template_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _drop(self, key: Optional[str]) -> None:
+        if key is None:
+            self.clear()
+        else:
+            self.invalidate(int(key))
+
+
+validator_cache = ValidatorCache(invalidation_bus)
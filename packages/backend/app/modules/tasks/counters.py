@@ -0,0 +1,237 @@
+import logging
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, select, text, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from . import models, schemas
+
+logger = logging.getLogger(__name__)
+
+StatusKey = Tuple[int, models.TaskStatus]
+
+# Postgres advisory lock held by the one worker whose reconciler runs
+RECONCILER_LOCK_KEY = 0x7461736B73
+
+
+def tally(changes: Iterable[Tuple[Optional[int], models.TaskStatus, int]]) -> Counter:
+    """
+    Fold ``(owner_id, status, delta)`` changes into per-owner and org-wide deltas.
+    Ownerless tasks only count towards the org-wide totals.
+    """
+    deltas: Counter = Counter()
+    for owner_id, task_status, delta in changes:
+        deltas[(models.ORG_WIDE_OWNER_ID, task_status)] += delta
+        if owner_id is not None:
+            deltas[(owner_id, task_status)] += delta
+    return deltas
+
+
+def _insert(db: Session):
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(models.TaskStatusCount)
+
+
+def apply_status_deltas(db: Session, deltas: Counter) -> None:
+    """
+    Add ``deltas`` to the counters with one upsert, inside the caller's transaction.
+    """
+    # Fixed row order so concurrent writers lock counter rows in the same sequence
+    rows = [
+        {"owner_id": owner_id, "status": task_status, "count": delta}
+        for (owner_id, task_status), delta in sorted(deltas.items(), key=lambda item: (item[0][0], item[0][1].value))
+        if delta
+    ]
+    if not rows:
+        return
+    stmt = _insert(db)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.TaskStatusCount.owner_id, models.TaskStatusCount.status],
+        set_={"count": models.TaskStatusCount.count + stmt.excluded.count},
+    )
+    db.execute(stmt, rows)
+
+
+def record_status_change(
+    db: Session,
+    owner_id: Optional[int],
+    old_status: Optional[models.TaskStatus],
+    new_status: Optional[models.TaskStatus],
+) -> None:
+    """
+    Count a task moving from ``old_status`` to ``new_status``; None on either
+    side means the task is being created or deleted.
+    """
+    if old_status == new_status:
+        return
+    changes = []
+    if old_status is not None:
+        changes.append((owner_id, old_status, -1))
+    if new_status is not None:
+        changes.append((owner_id, new_status, 1))
+    apply_status_deltas(db, tally(changes))
+
+
+def get_status_board(db: Session, owner_id: Optional[int] = None) -> schemas.TaskStatusBoard:
+    """
+    Task counts per status for one owner, or across the organisation when ``owner_id`` is None.
+    """
+    scope = models.ORG_WIDE_OWNER_ID if owner_id is None else owner_id
+    rows = db.execute(
+        select(models.TaskStatusCount.status, models.TaskStatusCount.count)
+        .where(models.TaskStatusCount.owner_id == scope)
+    ).all()
+    counts = {task_status: 0 for task_status in models.TaskStatus}
+    counts.update({task_status: count for task_status, count in rows})
+    return schemas.TaskStatusBoard(owner_id=owner_id, counts=counts, total=sum(counts.values()))
+
+
+def _actual_counts(db: Session) -> Dict[StatusKey, int]:
+    rows = db.execute(
+        select(models.Task.owner_id, models.Task.status, func.count())
+        .group_by(models.Task.owner_id, models.Task.status)
+    ).all()
+    return {key: count for key, count in tally(rows).items() if count}
+
+
+def reconcile_status_counts(db: Session) -> int:
+    """
+    Recount `tasks` and correct any counter that has drifted. Returns the number
+    of counters that were corrected.
+
+    Tasks and counters are read in one snapshot without locking either table;
+    the drift is then added to the counters like any other delta, so task
+    writes committed meanwhile are neither lost nor counted twice.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Task writes update their counters in the same transaction, so one snapshot sees both consistently
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    actual = _actual_counts(db)
+    stored = {
+        (owner_id, task_status): count
+        for owner_id, task_status, count in db.execute(
+            select(models.TaskStatusCount.owner_id, models.TaskStatusCount.status, models.TaskStatusCount.count)
+        )
+    }
+    db.rollback()
+    drift = Counter({
+        key: actual.get(key, 0) - stored.get(key, 0)
+        for key in set(actual) | set(stored)
+        if actual.get(key, 0) != stored.get(key, 0)
+    })
+    if not drift:
+        return 0
+    apply_status_deltas(db, drift)
+    # Counters that are now zero are dropped, as if they had never been written
+    db.execute(
+        delete(models.TaskStatusCount).where(
+            tuple_(models.TaskStatusCount.owner_id, models.TaskStatusCount.status).in_(list(drift)),
+            models.TaskStatusCount.count == 0,
+        )
+    )
+    db.commit()
+    logger.warning("Corrected %d drifted task status counters", len(drift))
+    return len(drift)
+
+
+class StatusCountReconciler:
+    """
+    Background thread that runs :func:`reconcile_status_counts` at startup and
+    then every ``interval_seconds``.
+
+    Every worker starts one, but on Postgres only the worker holding a
+    session-level advisory lock reconciles; the others try to take the lock
+    each interval, so the job moves on if the leader exits. Set
+    ``TASK_COUNTER_RECONCILER_ENABLED=false`` to run it only on demand via
+    ``POST /tasks/board/reconcile``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        interval_seconds: float = settings.TASK_COUNTER_RECONCILE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Dedicated autocommit connection holding the advisory lock while this worker leads
+        self._leader: Optional[Connection] = None
+
+    def is_leader(self) -> bool:
+        """Whether this worker should reconcile now; always true off Postgres."""
+        if self._leader is not None:
+            try:
+                self._leader.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                # Connection lost, and the lock with it; compete again below
+                self._release()
+        db = self.session_factory()
+        try:
+            engine = db.get_bind()
+        finally:
+            db.close()
+        if engine.dialect.name != "postgresql":
+            return True
+        conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": RECONCILER_LOCK_KEY}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._leader = conn
+        return True
+
+    def _release(self) -> None:
+        if self._leader is not None:
+            try:
+                self._leader.close()
+            except Exception:
+                logger.debug("Closing the reconciler lock connection failed", exc_info=True)
+            self._leader = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="task-counter-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self._release()
+
+    def run_once(self) -> int:
+        db = self.session_factory()
+        try:
+            return reconcile_status_counts(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.is_leader():
+                    self.run_once()
+            except Exception:
+                logger.exception("Task status counter reconciliation failed")
+            self._stop.wait(self.interval_seconds)
+
+
+status_count_reconciler = StatusCountReconciler()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import enum
@@ -23,11 +23,40 @@ class Task(Base):
     due_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set when the task moves to COMPLETED and cleared if it is reopened
+    completed_at = Column(DateTime, nullable=True)
     
-    owner_id = Column(Integer, ForeignKey("users.id"))
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     owner = relationship("User", back_populates="tasks")
 
     # New fields for Task Templating
     template_id = Column(Integer, ForeignKey("task_templates.id"), nullable=True)
     template = relationship("TaskTemplate")
     custom_data = Column(JSON, nullable=True)
+
+    # Keyset pagination indexes for the per-user and admin task lists,
+    # plus the filtered views (status boards, due dates, recently changed)
+    __table_args__ = (
+        Index("ix_tasks_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_owner_id_status_due_date", "owner_id", "status", "due_date"),
+        Index("ix_tasks_status_updated_at", "status", "updated_at"),
+        Index("ix_tasks_due_date_id", "due_date", "id"),
+        Index("ix_tasks_template_id", "template_id"),
+    )
+
+# Owner id under which organisation-wide totals are kept
+ORG_WIDE_OWNER_ID = 0
+
+class TaskStatusCount(Base):
+    """
+    Number of tasks per (owner, status), maintained alongside task writes so the
+    status board never has to count `tasks`. Rows with ``owner_id = 0`` hold the
+    totals across all owners, including tasks whose owner was deleted.
+    """
+    __tablename__ = "task_status_counts"
+
+    # Not a foreign key: owner 0 is the org-wide bucket
+    owner_id = Column(Integer, primary_key=True, autoincrement=False)
+    status = Column(Enum(TaskStatus, native_enum=False), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
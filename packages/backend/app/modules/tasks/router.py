@@ -1,19 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
 from app.db.session import get_db
-from app.modules.users.models import User
+from app.db.pagination import set_next_cursor
+from app.core.principals import Principal
 from app.core.security import get_current_user, RoleChecker
-from . import schemas, services
+from app.utils.conditional import conditional_response, make_etag, page_etag
+from app.utils.export import ExportFormat, export_response
+from app.utils.fast_json import JSONListResponder
+from . import counters, schemas, services
+from .models import TaskStatus
 
 router = APIRouter()
 
+task_list_json = JSONListResponder(schemas.Task)
+
+def task_filters(
+    status: Optional[List[TaskStatus]] = Query(None, description="Repeat to match any of several statuses"),
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    template_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    updated_since: Optional[datetime] = None,
+) -> schemas.TaskFilter:
+    return schemas.TaskFilter(
+        status=status,
+        due_after=due_after,
+        due_before=due_before,
+        template_id=template_id,
+        owner_id=owner_id,
+        updated_since=updated_since,
+    )
+
 @router.post("/", response_model=schemas.Task, status_code=status.HTTP_201_CREATED)
 def create_task(
     task: schemas.TaskBase, # Changed from TaskCreate to TaskBase
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new task for the current user.
@@ -22,45 +47,127 @@ def create_task(
     task_create = schemas.TaskCreate(**task.model_dump(), owner_id=current_user.id)
     return services.create_task(db=db, task=task_create)
 
+@router.post("/bulk", response_model=schemas.TaskBulkResult, status_code=status.HTTP_201_CREATED, dependencies=[Depends(RoleChecker(['administrator']))])
+def create_tasks_bulk(
+    payload: schemas.TaskBulkCreate,
+    db: Session = Depends(get_db),
+):
+    """
+    Create many tasks, possibly for different owners and templates, in one transaction (admin only).
+
+    Items that fail validation are listed in `errors` by their index; all others are created.
+    """
+    return services.create_tasks_bulk(db=db, tasks=payload.tasks)
+
 @router.get("/", response_model=List[schemas.Task])
 def read_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = Query(None, description="One of created_at, updated_at, due_date, title, status; prefix with '-' for descending"),
+    filters: schemas.TaskFilter = Depends(task_filters),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Retrieve tasks for the current user.
+    Retrieve tasks for the current user, optionally filtered and sorted.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` to fetch the next page;
+    keep the same filters and `sort` when doing so. Supports `If-None-Match`.
     """
-    tasks = services.get_tasks_by_user(db, user_id=current_user.id, skip=skip, limit=limit)
-    return tasks
+    tasks = services.get_tasks_by_user(
+        db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor, filters=filters, sort=sort
+    )
+    set_next_cursor(response, tasks, limit, services.resolve_sort(sort)[0])
+    body = task_list_json.dump(tasks)
+    not_modified = conditional_response(request, response, page_etag(body, response))
+    if not_modified:
+        return not_modified
+    return task_list_json(tasks, response, body)
 
 @router.get("/all", response_model=List[schemas.Task], dependencies=[Depends(RoleChecker(['administrator']))])
 def read_all_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = Query(None, description="One of created_at, updated_at, due_date, title, status; prefix with '-' for descending"),
+    filters: schemas.TaskFilter = Depends(task_filters),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve all tasks (admin only), optionally filtered by owner, status, dates and template.
+    """
+    tasks = services.get_all_tasks(db, skip=skip, limit=limit, cursor=cursor, filters=filters, sort=sort)
+    set_next_cursor(response, tasks, limit, services.resolve_sort(sort)[0])
+    body = task_list_json.dump(tasks)
+    not_modified = conditional_response(request, response, page_etag(body, response))
+    if not_modified:
+        return not_modified
+    return task_list_json(tasks, response, body)
+
+@router.get("/export", dependencies=[Depends(RoleChecker(['administrator']))])
+def export_tasks(
+    format: ExportFormat = ExportFormat.NDJSON,
+    filters: schemas.TaskFilter = Depends(task_filters),
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve all tasks (admin only).
+    Stream all tasks matching the filters as NDJSON or CSV (admin only).
+    """
+    return export_response(db.get_bind(), services.export_tasks_query(filters), format, "tasks")
+
+@router.get("/board", response_model=schemas.TaskStatusBoard)
+def read_status_board(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Task counts per status for the current user.
+    """
+    return counters.get_status_board(db, owner_id=current_user.id)
+
+@router.get("/board/all", response_model=schemas.TaskStatusBoard, dependencies=[Depends(RoleChecker(['administrator']))])
+def read_all_status_board(
+    owner_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Task counts per status across the organisation, or for one owner (admin only).
+    """
+    return counters.get_status_board(db, owner_id=owner_id)
+
+@router.post("/board/reconcile", response_model=schemas.TaskBoardReconcileResult, dependencies=[Depends(RoleChecker(['administrator']))])
+def reconcile_status_board(db: Session = Depends(get_db)):
+    """
+    Recount tasks and repair any drifted status board counters (admin only).
     """
-    tasks = services.get_all_tasks(db, skip=skip, limit=limit)
-    return tasks
+    return schemas.TaskBoardReconcileResult(corrected=counters.reconcile_status_counts(db))
 
 @router.get("/{task_id}", response_model=schemas.Task)
 def read_task(
     task_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Retrieve a specific task by ID.
+    Retrieve a specific task by ID. Supports `If-None-Match` and `If-Modified-Since`.
     """
     db_task = services.get_task(db, task_id=task_id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    if db_task.owner_id != current_user.id and "administrator" not in [role.name for role in current_user.roles]:
+    if db_task.owner_id != current_user.id and "administrator" not in current_user.role_names:
         raise HTTPException(status_code=403, detail="Not enough permissions")
+    # Foreign keys can be cleared by the database (ON DELETE SET NULL) without touching updated_at
+    etag = make_etag("task", db_task.id, db_task.updated_at, db_task.owner_id, db_task.template_id)
+    not_modified = conditional_response(request, response, etag, db_task.updated_at)
+    if not_modified:
+        return not_modified
     return db_task
 
 @router.put("/{task_id}", response_model=schemas.Task)
@@ -68,7 +175,7 @@ def update_task(
     task_id: int,
     task: schemas.TaskUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Update a task.
@@ -76,7 +183,7 @@ def update_task(
     db_task = services.get_task(db, task_id=task_id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    if db_task.owner_id != current_user.id and "administrator" not in [role.name for role in current_user.roles]:
+    if db_task.owner_id != current_user.id and "administrator" not in current_user.role_names:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return services.update_task(db=db, task_id=task_id, task_update=task)
 
@@ -84,7 +191,7 @@ def update_task(
 def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Delete a task.
@@ -92,6 +199,6 @@ def delete_task(
     db_task = services.get_task(db, task_id=task_id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    if db_task.owner_id != current_user.id and "administrator" not in [role.name for role in current_user.roles]:
+    if db_task.owner_id != current_user.id and "administrator" not in current_user.role_names:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return services.delete_task(db=db, task_id=task_id)
\ No newline at end of file
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.orm import raiseload
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from .models import TaskStatus
 
@@ -23,10 +24,48 @@ class TaskUpdate(BaseModel):
 
 class Task(TaskBase):
     id: int
-    owner_id: int
+    # NULL once the owning user has been deleted
+    owner_id: Optional[int] = None
     template_id: Optional[int] = None
     custom_data: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+# Bulk creation
+BULK_MAX_TASKS = 10000
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=BULK_MAX_TASKS)
+
+class TaskBulkError(BaseModel):
+    index: int
+    detail: Any
+
+class TaskBulkResult(BaseModel):
+    created: List[Task]
+    errors: List[TaskBulkError]
+
+# List filters
+class TaskFilter(BaseModel):
+    status: Optional[List[TaskStatus]] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    template_id: Optional[int] = None
+    owner_id: Optional[int] = None
+    updated_since: Optional[datetime] = None
+
+# Status board
+class TaskStatusBoard(BaseModel):
+    # None for the organisation-wide board
+    owner_id: Optional[int] = None
+    counts: Dict[TaskStatus, int]
+    total: int
+
+class TaskBoardReconcileResult(BaseModel):
+    corrected: int
+
+def task_load_options():
+    """`Task` reads only columns; raise instead of silently lazy-loading a relationship."""
+    return (raiseload("*"),)
@@ -1,20 +1,71 @@
+from sqlalchemy import Select, insert, select
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status
+from fastapi import HTTPException
 from . import models, schemas
-from app.modules.task_templates.services import get_template
-from typing import List, Optional
+from .counters import apply_status_deltas, record_status_change, tally
+from app.modules.users.models import User
+from app.modules.reports.rollups import record_task_change, record_task_changes, task_facts
+from app.modules.task_templates.validators import CustomDataValidator, validator_cache
+from app.db.pagination import paginate
+from app.utils.export import export_columns
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-def validate_custom_data(custom_data: dict, fields_schema: list):
-    # Basic validation: ensure all required fields are present
-    required_fields = {field['name'] for field in fields_schema if field.get('required', False)}
-    provided_fields = set(custom_data.keys())
-    if not required_fields.issubset(provided_fields):
-        missing_fields = required_fields - provided_fields
+# List endpoints page on (created_at, id), backed by matching composite indexes
+TASK_SORT_COLUMN = models.Task.created_at
+
+# Sort keys accepted by the list endpoints; prefix with "-" for descending order
+TASK_SORT_KEYS = {
+    "created_at": models.Task.created_at,
+    "updated_at": models.Task.updated_at,
+    "due_date": models.Task.due_date,
+    "title": models.Task.title,
+    "status": models.Task.status,
+}
+NULLABLE_SORT_KEYS = {"due_date"}
+
+def resolve_sort(sort: Optional[str]) -> Tuple[object, bool]:
+    """
+    Map a `sort` query value such as ``-due_date`` to ``(column, descending)``.
+    """
+    if not sort:
+        return TASK_SORT_COLUMN, False
+    descending = sort.startswith("-")
+    key = sort[1:] if descending else sort
+    if key not in TASK_SORT_KEYS:
         raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"Missing required custom fields: {list(missing_fields)}"
+            status_code=400,
+            detail=f"Invalid sort key '{key}'. Allowed: {sorted(TASK_SORT_KEYS)}",
         )
-    # TODO: Add more specific type validation based on schema (e.g., datetime, int)
+    return TASK_SORT_KEYS[key], descending
+
+def apply_task_filters(query, filters: Optional[schemas.TaskFilter]):
+    if filters is None:
+        return query
+    if filters.status:
+        query = query.filter(models.Task.status.in_(filters.status))
+    if filters.due_after is not None:
+        query = query.filter(models.Task.due_date >= filters.due_after)
+    if filters.due_before is not None:
+        query = query.filter(models.Task.due_date < filters.due_before)
+    if filters.template_id is not None:
+        query = query.filter(models.Task.template_id == filters.template_id)
+    if filters.owner_id is not None:
+        query = query.filter(models.Task.owner_id == filters.owner_id)
+    if filters.updated_since is not None:
+        query = query.filter(models.Task.updated_at >= filters.updated_since)
+    return query
+
+def _paginate_tasks(query, skip: int, limit: int, cursor: Optional[str], sort: Optional[str]):
+    sort_column, descending = resolve_sort(sort)
+    return paginate(
+        query, sort_column, models.Task.id, skip=skip, limit=limit, cursor=cursor,
+        descending=descending, nullable=sort_column.key in NULLABLE_SORT_KEYS,
+    )
+
+def validate_custom_data(custom_data: dict, fields_schema: list):
+    # Uncached; task create/update go through the per-template validator cache
+    CustomDataValidator(fields_schema).validate(custom_data)
     return True
 
 def create_task(db: Session, task: schemas.TaskCreate) -> models.Task:
@@ -22,50 +73,152 @@ def create_task(db: Session, task: schemas.TaskCreate) -> models.Task:
     Create a new task.
     """
     if task.template_id:
-        template = get_template(db, task.template_id)
-        if not template:
+        validator = validator_cache.get(db, task.template_id)
+        if not validator:
             raise HTTPException(status_code=404, detail="Task template not found")
         if task.custom_data:
-            validate_custom_data(task.custom_data, template.fields_schema)
+            validator.validate(task.custom_data)
 
     db_task = models.Task(**task.model_dump())
+    if db_task.status == models.TaskStatus.COMPLETED:
+        db_task.completed_at = datetime.utcnow()
     db.add(db_task)
+    record_status_change(db, db_task.owner_id, None, db_task.status)
+    # Flushed first so created_at is populated for the report rollups
+    db.flush()
+    record_task_change(db, None, task_facts(db_task))
     db.commit()
     db.refresh(db_task)
     return db_task
 
-def get_task(db: Session, task_id: int) -> Optional[models.Task]:
+def create_tasks_bulk(db: Session, tasks: List[schemas.TaskCreate]) -> schemas.TaskBulkResult:
+    """
+    Validate and insert many tasks in a single transaction.
+
+    Invalid items are reported by index and skipped; the rest are written with
+    one batched multi-row INSERT ... RETURNING.
     """
-    Get a single task by its ID.
+    owner_ids = {task.owner_id for task in tasks}
+    existing_owners = set(db.scalars(select(User.id).where(User.id.in_(owner_ids))))
+
+    valid = []
+    errors = []
+    for index, task in enumerate(tasks):
+        if task.owner_id not in existing_owners:
+            errors.append(schemas.TaskBulkError(index=index, detail="Owner not found"))
+            continue
+        if task.template_id:
+            validator = validator_cache.get(db, task.template_id)
+            if not validator:
+                errors.append(schemas.TaskBulkError(index=index, detail="Task template not found"))
+                continue
+            if task.custom_data:
+                try:
+                    validator.validate(task.custom_data)
+                except HTTPException as e:
+                    errors.append(schemas.TaskBulkError(index=index, detail=e.detail))
+                    continue
+        completed_at = datetime.utcnow() if task.status == models.TaskStatus.COMPLETED else None
+        valid.append({**task.model_dump(), "completed_at": completed_at})
+
+    created = []
+    if valid:
+        # render_nulls keeps rows with different None fields in the same batch
+        stmt = insert(models.Task).execution_options(render_nulls=True)
+        if db.get_bind().dialect.name == "postgresql":
+            # Batched RETURNING order is not guaranteed there; have SQLAlchemy match rows to inputs
+            rows = db.scalars(stmt.returning(models.Task, sort_by_parameter_order=True), valid).all()
+        else:
+            # SQLite hands out ascending rowids in VALUES order, but may return rows in another order
+            rows = sorted(db.scalars(stmt.returning(models.Task), valid), key=lambda row: row.id)
+        # Serialize before commit so expired rows are not re-fetched one by one
+        created = [schemas.Task.model_validate(row) for row in rows]
+        apply_status_deltas(db, tally((task.owner_id, task.status, 1) for task in created))
+        record_task_changes(db, [(None, task_facts(row)) for row in rows])
+        db.commit()
+    return schemas.TaskBulkResult(created=created, errors=errors)
+
+def get_task(db: Session, task_id: int, for_update: bool = False) -> Optional[models.Task]:
+    """
+    Get a single task by its ID. With `for_update` the row stays locked until commit
+    and is re-read under the lock, even if this session already loaded it.
     """
-    return db.query(models.Task).filter(models.Task.id == task_id).first()
+    query = db.query(models.Task).filter(models.Task.id == task_id)
+    if for_update:
+        # Without populate_existing the identity map hands back the values read before the lock
+        query = query.with_for_update().populate_existing()
+    return query.first()
 
-def get_tasks_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Task]:
+def tasks_query(db: Session, filters: Optional[schemas.TaskFilter] = None, user_id: Optional[int] = None):
     """
-    Get all tasks for a specific user.
+    Unpaginated query over the tasks matching `filters`, restricted to `user_id`'s
+    tasks when given (any `owner_id` filter is then ignored).
     """
-    return db.query(models.Task).filter(models.Task.owner_id == user_id).offset(skip).limit(limit).all()
+    query = db.query(models.Task).options(*schemas.task_load_options())
+    if user_id is not None:
+        if filters is not None and filters.owner_id is not None:
+            filters = filters.model_copy(update={"owner_id": None})
+        query = query.filter(models.Task.owner_id == user_id)
+    return apply_task_filters(query, filters)
 
-def get_all_tasks(db: Session, skip: int = 0, limit: int = 100) -> List[models.Task]:
+def get_tasks_by_user(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    filters: Optional[schemas.TaskFilter] = None,
+    sort: Optional[str] = None,
+) -> List[models.Task]:
+    """
+    Get all tasks for a specific user. Any `owner_id` in `filters` is ignored.
+    """
+    return _paginate_tasks(tasks_query(db, filters, user_id), skip, limit, cursor, sort).all()
+
+def get_all_tasks(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    filters: Optional[schemas.TaskFilter] = None,
+    sort: Optional[str] = None,
+) -> List[models.Task]:
     """
     Get all tasks (for admins).
     """
-    return db.query(models.Task).offset(skip).limit(limit).all()
+    return _paginate_tasks(tasks_query(db, filters), skip, limit, cursor, sort).all()
+
+def export_tasks_query(filters: Optional[schemas.TaskFilter] = None) -> Select:
+    """
+    Core select over all tasks matching `filters`, for streaming exports.
+    """
+    query = select(*export_columns(models.Task, schemas.Task)).order_by(models.Task.id)
+    return apply_task_filters(query, filters)
 
 def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate) -> Optional[models.Task]:
     """
     Update a task.
     """
-    db_task = get_task(db, task_id)
+    # Locked so concurrent status changes are counted against the right old status
+    db_task = get_task(db, task_id, for_update=True)
     if db_task:
         if task_update.custom_data and db_task.template_id:
-            template = get_template(db, db_task.template_id)
-            if template:
-                validate_custom_data(task_update.custom_data, template.fields_schema)
+            validator = validator_cache.get(db, db_task.template_id)
+            if validator:
+                validator.validate(task_update.custom_data)
 
+        old_status = db_task.status
+        before = task_facts(db_task)
         update_data = task_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_task, key, value)
+        if db_task.status != old_status:
+            if db_task.status == models.TaskStatus.COMPLETED:
+                db_task.completed_at = datetime.utcnow()
+            elif old_status == models.TaskStatus.COMPLETED:
+                db_task.completed_at = None
+        record_status_change(db, db_task.owner_id, old_status, db_task.status)
+        record_task_change(db, before, task_facts(db_task))
         db.commit()
         db.refresh(db_task)
     return db_task
@@ -74,8 +227,10 @@ def delete_task(db: Session, task_id: int) -> Optional[models.Task]:
     """
     Delete a task.
     """
-    db_task = get_task(db, task_id)
+    db_task = get_task(db, task_id, for_update=True)
     if db_task:
         db.delete(db_task)
+        record_status_change(db, db_task.owner_id, db_task.status, None)
+        record_task_change(db, task_facts(db_task), None)
         db.commit()
     return db_task
\ No newline at end of file
@@ -6,8 +6,8 @@ from app.db.base import Base
 user_roles = Table(
     "user_roles",
     Base.metadata,
-    Column("user_id", ForeignKey("users.id"), primary_key=True),
-    Column("role_id", ForeignKey("roles.id"), primary_key=True),
+    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("role_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
 )
 
 class Role(Base):
@@ -25,8 +25,11 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     # Active flag retained for account enable/disable; admin flag removed in favor of role-based access
     is_active = Column(Boolean, default=True)
+    # Bumped whenever issued tokens must stop authorizing (e.g. a role is revoked)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
-    contact = relationship("Contact", back_populates="user", uselist=False)
-    tasks = relationship("Task", back_populates="owner")
-    roles = relationship("Role", secondary=user_roles, back_populates="users")
-    assets = relationship("Asset", back_populates="assignee")
\ No newline at end of file
+    # Dependent rows are detached by the database (ON DELETE SET NULL), not loaded by the ORM
+    contact = relationship("Contact", back_populates="user", uselist=False, passive_deletes=True)
+    tasks = relationship("Task", back_populates="owner", passive_deletes=True)
+    roles = relationship("Role", secondary=user_roles, back_populates="users", passive_deletes=True)
+    assets = relationship("Asset", back_populates="assignee", passive_deletes=True)
\ No newline at end of file
@@ -1,44 +1,66 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.users import schemas
 from app.modules.users import models
+from app.modules.users import services
 from app.modules.contacts import schemas as contacts_schemas
-from app.db.session import get_db
+from app.modules.contacts.models import Contact
+from app.db.session import get_async_db
 from app.core import security
+from app.core.principals import Principal
+from app.utils.conditional import conditional_response, make_etag
+from app.utils.fast_json import JSONListResponder
 
 router = APIRouter()
 
-async def get_current_admin_user(current_user: models.User = Depends(security.RoleChecker(["administrator"]))):
+user_list_json = JSONListResponder(schemas.User)
+
+async def get_current_admin_user(current_user: Principal = Depends(security.RoleChecker(["administrator"]))):
     return current_user
 
 @router.get("/me", response_model=schemas.User)
-async def read_users_me(current_user: models.User = Depends(security.get_current_user)):
+async def read_users_me(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(security.get_current_user),
+):
     """
-    Get current user.
+    Get current user. Supports `If-None-Match`.
     """
+    # Users carry no modification time; the snapshot itself is the validator
+    etag = make_etag("me", current_user.id, current_user.email, current_user.is_active, current_user.roles)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
     return current_user
 
 
 @router.get("/me/contact", response_model=contacts_schemas.Contact)
 async def read_user_me_contact(
-    current_user: models.User = Depends(security.get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(security.get_current_user),
 ):
     """
     Get current user's contact info.
     """
-    if not current_user.contact:
+    result = await db.execute(select(Contact).where(Contact.user_id == current_user.id))
+    contact = result.scalars().first()
+    if not contact:
         raise HTTPException(status_code=404, detail="Contact not found for current user")
-    return current_user.contact
+    return contact
 
 @router.get("/", response_model=List[schemas.User])
 async def read_users(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.RoleChecker(["administrator"])),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(security.RoleChecker(["administrator"])),
 ):
-    users = db.query(models.User).all()
+    # Roles must be loaded up front: async sessions cannot lazy-load during serialization
+    result = await db.execute(select(models.User).options(*schemas.user_load_options()))
+    users = result.scalars().all()
     # Safety: backfill None is_active values at runtime (should be handled by migrations, but prevents 500s)
     dirty = False
     for u in users:
@@ -47,50 +69,35 @@ async def read_users(
             db.add(u)
             dirty = True
     if dirty:
-        db.commit()
-    return users
+        await db.commit()
+    return user_list_json(users)
 
 @router.delete("/users/")
 async def delete_users(
     user_ids: List[int],
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user),
 ):
-    deleted_count = 0
-    for user_id in user_ids:
-        user = db.query(models.User).filter(models.User.id == user_id).first()
-        if user:
-            db.delete(user)
-            db.commit()
-            deleted_count += 1
-    
-    if deleted_count == 0:
+    deleted_ids = await services.delete_users(db, user_ids)
+    if not deleted_ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No users found with the provided IDs")
 
-    return {"message": f"Successfully deleted {deleted_count} user(s)"}
+    return {"message": f"Successfully deleted {len(deleted_ids)} user(s)", "deleted_ids": deleted_ids}
 
 @router.post("/users/assign_admin/", summary="Assign the 'administrator' role to given users")
 async def assign_admin(
     user_ids: List[int],
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user),
 ):
     from app.modules.users.models import Role
-    admin_role = db.query(Role).filter(Role.name == "administrator").first()
+    result = await db.execute(select(Role).where(Role.name == "administrator"))
+    admin_role = result.scalars().first()
     if not admin_role:
         admin_role = Role(name="administrator", description="System administrator")
         db.add(admin_role)
-        db.commit()
-        db.refresh(admin_role)
-    updated_count = 0
-    for user_id in user_ids:
-        user = db.query(models.User).filter(models.User.id == user_id).first()
-        if user and admin_role not in user.roles:
-            user.roles.append(admin_role)
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            updated_count += 1
-    if updated_count == 0:
+        await db.flush()
+    updated_ids = await services.assign_role_to_users(db, admin_role.id, user_ids)
+    if not updated_ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No users updated (they may already be admins)")
-    return {"message": f"Successfully assigned administrator role to {updated_count} user(s)"}
+    return {"message": f"Successfully assigned administrator role to {len(updated_ids)} user(s)", "updated_ids": updated_ids}
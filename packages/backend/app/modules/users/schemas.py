@@ -1,5 +1,7 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
+from sqlalchemy.orm import selectinload
 from typing import List, Optional, Union
+from app.modules.users import models
 from app.modules.tasks.schemas import Task
 from app.modules.contacts.schemas import Contact, ContactCreate
 from app.modules.contacts.schemas import ContactCreate as ContactSchema
@@ -39,6 +41,10 @@ class UserInDBBase(UserBase):
 class User(UserInDBBase):
     pass
 
+def user_load_options():
+    """Loader options that fully populate `User`, so serialization never lazy-loads roles."""
+    return (selectinload(models.User.roles),)
+
 class UserInDB(UserInDBBase):
     hashed_password: str
 
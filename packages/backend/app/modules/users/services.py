@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import delete, exists, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principals import principal_cache, token_versions
+from app.modules.reports.rollups import detach_users
+from app.modules.assets.models import Asset
+from app.modules.tasks.models import Task, TaskStatusCount
+from . import models
+
+
+async def delete_users(db: AsyncSession, user_ids: List[int]) -> List[int]:
+    """
+    Delete users in one set-based statement and return the ids actually deleted.
+
+    Role links are removed and tasks/assets/contacts are detached by the
+    database's ON DELETE rules, so no dependent rows are loaded; the detached
+    tasks and assets get a new `updated_at` so cached copies revalidate.
+    Detached tasks stay in the org-wide status counts; the users' own counters
+    are dropped.
+    Report rollups are detached first, while the users' contacts still place them.
+    """
+    if not user_ids:
+        return []
+    await db.run_sync(detach_users, user_ids)
+    # ON DELETE SET NULL leaves updated_at alone; bump it so Last-Modified reflects the detach
+    now = datetime.utcnow()
+    await db.execute(update(Task).where(Task.owner_id.in_(user_ids)).values(updated_at=now))
+    await db.execute(update(Asset).where(Asset.assignee_id.in_(user_ids)).values(updated_at=now))
+    result = await db.execute(
+        delete(models.User).where(models.User.id.in_(user_ids)).returning(models.User.id)
+    )
+    deleted_ids = sorted(result.scalars().all())
+    if deleted_ids:
+        await db.execute(delete(TaskStatusCount).where(TaskStatusCount.owner_id.in_(deleted_ids)))
+    await db.commit()
+    for user_id in deleted_ids:
+        principal_cache.invalidate_user(user_id)
+        token_versions.invalidate(user_id)
+    return deleted_ids
+
+
+async def assign_role_to_users(db: AsyncSession, role_id: int, user_ids: List[int]) -> List[int]:
+    """
+    Link ``role_id`` to every existing user in ``user_ids`` that lacks it, using a
+    single INSERT ... SELECT. Returns the ids of users that gained the role.
+    """
+    if not user_ids:
+        return []
+    already_linked = exists().where(
+        models.user_roles.c.user_id == models.User.id,
+        models.user_roles.c.role_id == role_id,
+    )
+    candidates = select(models.User.id, literal(role_id)).where(
+        models.User.id.in_(user_ids),
+        ~already_linked,
+    )
+    result = await db.execute(
+        insert(models.user_roles)
+        .from_select(["user_id", "role_id"], candidates)
+        .returning(models.user_roles.c.user_id)
+    )
+    updated_ids = sorted(result.scalars().all())
+    await db.commit()
+    for user_id in updated_ids:
+        principal_cache.invalidate_user(user_id)
+    return updated_ids
@@ -0,0 +1,84 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+from app.db.pagination import NEXT_CURSOR_HEADER
+
+# Clients may keep a copy but must revalidate it before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over ``parts``; they must identify the representation exactly."""
+    payload = json.dumps(parts, default=str, separators=(",", ":"))
+    return f'W/"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+
+def page_etag(body: bytes, response: Response) -> str:
+    """
+    Weak ETag over a rendered list page and its next-page cursor. Unlike a
+    summary of the whole list it changes with any visible difference, deletes
+    and ON DELETE SET NULL included, and costs nothing beyond the page query.
+    """
+    digest = hashlib.sha1(body)
+    digest.update(response.headers.get(NEXT_CURSOR_HEADER, "").encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _http_date(value: datetime) -> str:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value, usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since is None or since.tzinfo is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Set validators on ``response`` and return a bodiless 304 when the client's
+    copy is current, otherwise None. `If-None-Match` takes precedence over
+    `If-Modified-Since`, as in RFC 9110.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+    if fresh:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
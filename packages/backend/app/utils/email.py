@@ -1,26 +1,30 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from typing import Optional, Union
 
-from app.core.config import settings
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.modules.emails.services import enqueue_email
 
 def send_email(
     email_to: str,
     subject: str,
     html_content: str,
+    db: Optional[Union[Session, AsyncSession]] = None,
 ) -> None:
-    msg = MIMEMultipart("alternative")
-    msg["Subject"] = subject
-    msg["From"] = settings.EMAILS_FROM_EMAIL
-    msg["To"] = email_to
+    """
+    Queue an email in the outbox; delivery happens on the background worker.
 
-    part = MIMEText(html_content, "html")
-    msg.attach(part)
+    When ``db`` is given the message joins the caller's transaction and is
+    committed with it. Otherwise it is committed on its own session.
+    """
+    if db is not None:
+        enqueue_email(db, email_to=email_to, subject=subject, html_content=html_content)
+        return
 
+    db = SessionLocal()
     try:
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(settings.EMAILS_FROM_EMAIL, email_to, msg.as_string())
-    except Exception as e:
-        print(f"Error sending email: {e}")
+        enqueue_email(db, email_to=email_to, subject=subject, html_content=html_content)
+        db.commit()
+    finally:
+        db.close()
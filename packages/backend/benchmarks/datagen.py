@@ -0,0 +1,123 @@
+"""
+Synthetic data for the benchmark suite.
+
+Rows are written with batched Core inserts, so even the 1M scale loads in
+minutes on SQLite. Every generated user shares the password ``BENCH_PASSWORD``.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.modules.contacts.models import Contact
+from app.modules.tasks.counters import reconcile_status_counts
+from app.modules.tasks.models import Task, TaskStatus
+from app.modules.users.models import Role, User, user_roles
+
+BENCH_PASSWORD = "benchmark-password"
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+BATCH_SIZE = 10000
+
+SCALES: Dict[str, int] = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+FIRST_NAMES = ["Ava", "Noah", "Mia", "Liam", "Zoe", "Ethan", "Isla", "Leo", "Ruby", "Oscar", "Priya", "Hiro", "Amara", "Mateo"]
+LAST_NAMES = ["Smith", "Nguyen", "Patel", "Okafor", "Garcia", "Kim", "Brown", "Wilson", "Taylor", "Singh", "Murphy", "Rossi"]
+UNITS = ["Northside", "Harbour", "Ridge", "Valley", "Coastal", "Metro", "Inland", "Lakes"]
+
+
+@dataclass(frozen=True)
+class DatasetSize:
+    users: int
+    contacts: int
+    tasks: int
+
+    @classmethod
+    def for_scale(cls, rows: int) -> "DatasetSize":
+        # Roughly the shape of a real roster: one account per hundred tasks, more contacts than accounts
+        users = max(10, rows // 100)
+        return cls(users=users, contacts=max(users, rows // 10), tasks=rows)
+
+
+def bench_email(index: int) -> str:
+    return f"user{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def _batched(rows: Iterator[dict], size: int = BATCH_SIZE) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def existing_size(engine: Engine) -> DatasetSize:
+    with engine.connect() as conn:
+        users = conn.scalar(select(func.count()).select_from(User).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}")))
+        contacts = conn.scalar(select(func.count()).select_from(Contact))
+        tasks = conn.scalar(select(func.count()).select_from(Task))
+    return DatasetSize(users=users, contacts=contacts, tasks=tasks)
+
+
+def generate(engine: Engine, size: DatasetSize, hash_password: Callable[[str], str], seed: int = 42) -> None:
+    """Insert ``size`` worth of users, contacts and tasks into an empty schema."""
+    rng = random.Random(seed)
+    hashed = hash_password(BENCH_PASSWORD)
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        user_role_id = conn.scalar(select(Role.id).where(Role.name == "user"))
+        admin_role_id = conn.scalar(select(Role.id).where(Role.name == "administrator"))
+        for batch in _batched({"email": bench_email(i), "hashed_password": hashed, "is_active": True} for i in range(size.users)):
+            conn.execute(insert(User), batch)
+        ids_by_email = dict(conn.execute(select(User.email, User.id).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))).all())
+        user_ids = [ids_by_email[bench_email(i)] for i in range(size.users)]
+
+        links = [{"user_id": user_id, "role_id": user_role_id} for user_id in user_ids]
+        # user0 is the benchmark administrator
+        links.append({"user_id": user_ids[0], "role_id": admin_role_id})
+        for batch in _batched(iter(links)):
+            conn.execute(insert(user_roles), batch)
+
+        def contacts() -> Iterator[dict]:
+            for i in range(size.contacts):
+                yield {
+                    "first_name": rng.choice(FIRST_NAMES),
+                    "last_name": rng.choice(LAST_NAMES),
+                    "email": bench_email(i) if i < size.users else f"contact{i}@{BENCH_EMAIL_DOMAIN}",
+                    "phone_number": f"04{rng.randrange(10**8):08d}",
+                    "membership_id": f"M-{i:07d}",
+                    "organizational_unit": f"{rng.choice(UNITS)} Unit",
+                    "user_id": user_ids[i] if i < size.users else None,
+                }
+
+        for batch in _batched(contacts()):
+            conn.execute(insert(Contact), batch)
+
+        statuses = list(TaskStatus)
+
+        def tasks() -> Iterator[dict]:
+            for i in range(size.tasks):
+                created = now - timedelta(minutes=size.tasks - i)
+                yield {
+                    "title": f"Task {i}",
+                    "description": "Generated for benchmarking",
+                    "status": rng.choice(statuses),
+                    "due_date": created + timedelta(days=rng.randrange(1, 60)) if rng.random() < 0.7 else None,
+                    "created_at": created,
+                    "updated_at": created,
+                    "owner_id": user_ids[i % size.users],
+                }
+
+        for batch in _batched(tasks()):
+            conn.execute(insert(Task), batch)
+
+    # Status board counters are maintained by the services, which bulk loading bypasses
+    with Session(engine) as db:
+        reconcile_status_counts(db)
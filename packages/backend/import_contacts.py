@@ -0,0 +1,40 @@
+import os
+import sys
+from sqlalchemy.orm import sessionmaker
+from app.db.session import engine
+from app.modules.users.models import User, Role
+from app.modules.assets.models import Asset
+from app.modules.contacts import importer
+from app.modules.tasks.models import Task
+from app.modules.task_templates.models import TaskTemplate
+from app.utils.export import ExportFormat
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def import_contacts_from_file(path: str, report_path: str = None):
+    """
+    Bulk-import contacts from a CSV or NDJSON file, optionally writing the rejected rows to a CSV report.
+    """
+    fmt = ExportFormat.CSV if path.lower().endswith(".csv") else ExportFormat.NDJSON
+    db = SessionLocal()
+    try:
+        with open(path, "rb") as stream:
+            result = importer.import_contacts(db, importer.read_rows(stream, fmt))
+    finally:
+        db.close()
+
+    print(f"Imported {result.imported} contacts, {result.failed} rows rejected.")
+    if report_path and result.errors:
+        with open(report_path, "w", newline="") as report:
+            report.write(importer.error_report_csv(result))
+        print(f"Error report written to '{report_path}'.")
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python import_contacts.py <file.csv|file.ndjson> [error_report.csv]")
+        sys.exit(1)
+
+    import_contacts_from_file(*sys.argv[1:])
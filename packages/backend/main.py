@@ -1,8 +1,13 @@
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import timedelta
+import hmac
 
 from app.modules.users import schemas as user_schemas
 from app.core import security
@@ -11,9 +16,20 @@ from app.api.v1.router import api_router
 from app.modules.users import models
 from app.modules.contacts.models import Contact
 from app.db.base import Base
-from app.db.session import engine, get_db
+from app.db.session import async_engine, engine, get_async_db, get_db
+from app.db.pagination import NEXT_CURSOR_HEADER
 from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.rate_limit import login_throttle
 from app.utils.email import send_email
+from app.modules.emails.services import email_worker
+from app.modules.tasks.counters import status_count_reconciler
+from app.modules.learning.progress import progress_buffer
+from app.core.invalidation import invalidation_bus
+from app.modules.roles import services as role_services
+from app.core import metrics
+from app.core.request_context import RequestContextMiddleware, client_ip
+from app.db.slow_queries import slow_query_log
 from app.core.config import settings as app_settings
 from contextlib import asynccontextmanager
 
@@ -21,16 +37,43 @@ from contextlib import asynccontextmanager
 Base.metadata.create_all(bind=engine)
 
 def _seed_roles_session(db: Session):
-    existing = {r.name for r in db.query(models.Role).all()}
-    created = []
-    if 'administrator' not in existing:
-        db.add(models.Role(name='administrator', description='System administrator'))
-        created.append('administrator')
-    if 'user' not in existing:
-        db.add(models.Role(name='user', description='Default application user'))
-        created.append('user')
+    defaults = {'administrator': 'System administrator', 'user': role_services.BASELINE_ROLE_DESCRIPTION}
+    defaults.setdefault(app_settings.BASELINE_ROLE, role_services.BASELINE_ROLE_DESCRIPTION)
+    roles = {r.name: r for r in db.query(models.Role).filter(models.Role.name.in_(defaults)).all()}
+    created = False
+    for name, description in defaults.items():
+        if name not in roles:
+            roles[name] = models.Role(name=name, description=description)
+            db.add(roles[name])
+            created = True
     if created:
         db.commit()
+    role_services.remember_baseline_role(roles[app_settings.BASELINE_ROLE])
+
+# Substrings of the driver's error message (SQLite column, Postgres index name)
+# mapped to the registration error they mean; checked in order
+_REGISTRATION_CONFLICTS = (
+    (("contacts.personal_email", "ix_contacts_personal_email"), "Personal email already used by another contact"),
+    (("contacts.email", "ix_contacts_email"), "Contact email already used by another contact"),
+    (("users.email", "ix_users_email"), "Email already registered"),
+)
+
+
+def _registration_conflict(error: IntegrityError) -> HTTPException:
+    message = str(error.orig).lower()
+    for markers, detail in _REGISTRATION_CONFLICTS:
+        if any(marker in message for marker in markers):
+            return HTTPException(status_code=400, detail=detail)
+    if "foreign key" in message:
+        # The remembered baseline role no longer exists; look it up again next time
+        role_services.forget_baseline_role()
+        return HTTPException(
+            status_code=503,
+            detail="Registration is temporarily unavailable, please retry",
+            headers={"Retry-After": "1"},
+        )
+    return HTTPException(status_code=400, detail="Registration conflicts with existing data")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -40,7 +83,20 @@ async def lifespan(app: FastAPI):
         _seed_roles_session(db)
     finally:
         db.close()
+    invalidation_bus.start()
+    if app_settings.EMAIL_WORKER_ENABLED:
+        email_worker.start()
+    if app_settings.TASK_COUNTER_RECONCILER_ENABLED:
+        status_count_reconciler.start()
+    if app_settings.LEARNING_PROGRESS_FLUSH_ENABLED:
+        progress_buffer.start()
     yield
+    # Writes whatever heartbeats are still pending
+    progress_buffer.stop()
+    status_count_reconciler.stop()
+    email_worker.stop()
+    invalidation_bus.stop()
+    password_hasher.shutdown()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -55,48 +111,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# Lets engine hooks attribute statements to the route that issued them
+app.add_middleware(RequestContextMiddleware)
+
+if app_settings.SLOW_QUERY_LOG_ENABLED:
+    slow_query_log.install(engine, "sync")
+    slow_query_log.install(async_engine.sync_engine, "async")
+
+if app_settings.METRICS_ENABLED:
+    metrics.instrument_engine(engine, "sync")
+    metrics.instrument_engine(async_engine.sync_engine, "async")
+    # Outermost, so latency includes CORS handling and error responses are counted
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics(request: Request):
+        if app_settings.METRICS_TOKEN:
+            supplied = request.headers.get("authorization", "")
+            if not hmac.compare_digest(supplied, f"Bearer {app_settings.METRICS_TOKEN}"):
+                raise HTTPException(status_code=401, detail="Not authenticated")
+        elif not app_settings.METRICS_PUBLIC:
+            # Not served until a scrape token is configured or public scraping is chosen
+            raise HTTPException(status_code=404, detail="Not Found")
+        return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 app.include_router(api_router, prefix="/api/v1")
 
 
 
 @app.post("/api/v1/users/", response_model=user_schemas.User)
-def create_user(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    hashed_password = security.get_password_hash(user.password)
-    db_user = models.User(email=user.email, hashed_password=hashed_password)
-    
-    # pydantic v2: use model_dump
-    contact_data = user.contact.model_dump()
-    db_contact = Contact(**contact_data)
-    db_user.contact = db_contact
-
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-
-    # Ensure baseline 'user' role exists and assign to new user if not already present
-    baseline_role_name = app_settings.BASELINE_ROLE
-    user_role = db.query(models.Role).filter(models.Role.name == baseline_role_name).first()
-    if not user_role:
-        user_role = models.Role(name=baseline_role_name, description='Default application user')
-        db.add(user_role)
-        db.commit()
-        db.refresh(user_role)
-    if user_role not in db_user.roles:
-        db_user.roles.append(user_role)
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+async def create_user(user: user_schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    # bcrypt runs on the hashing process pool, off the event loop and threadpool
+    hashed_password = await password_hasher.hash(user.password)
+    baseline_role = await role_services.get_baseline_role(db)
 
     # Send a welcome email
     subject = "Welcome to Voli - Your Registration is Complete!"
     html_content = f"""
-    <p>Dear {db_user.email},</p>
+    <p>Dear {user.email},</p>
     <p>Thank you for registering with Voli! Your account has been successfully created.</p>
     <p>You can now log in to your account using the following link:</p>
     <p><a href="{settings.LOGIN_URL}">{settings.LOGIN_URL}</a></p>
@@ -104,27 +159,70 @@ def create_user(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
     <p>Best regards,</p>
     <p>The Voli Team</p>
     """
-    send_email(
-        email_to=db_user.email,
-        subject=subject,
-        html_content=html_content,
+
+    # pydantic v2: use model_dump
+    db_user = models.User(
+        email=user.email,
+        hashed_password=hashed_password,
+        contact=Contact(**user.contact.model_dump()),
+    )
+    db.add(db_user)
+    try:
+        # User, contact, role link and the queued welcome email commit together;
+        # the unique index on users.email rejects duplicates without a racy pre-check
+        await db.flush()
+        await db.execute(insert(models.user_roles).values(user_id=db_user.id, role_id=baseline_role.id))
+        send_email(
+            email_to=db_user.email,
+            subject=subject,
+            html_content=html_content,
+            db=db,
+        )
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise _registration_conflict(e)
+    return user_schemas.User(
+        id=db_user.id,
+        email=db_user.email,
+        is_active=db_user.is_active,
+        roles=[user_schemas.Role(id=baseline_role.id, name=baseline_role.name, description=baseline_role.description)],
     )
-    return db_user
 
 
 @app.post("/api/v1/token", response_model=user_schemas.Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Over-limit attempts are rejected before touching the database or bcrypt
+    login_throttle.check(form_data.username, client_ip(request))
+    with login_throttle.verification_slot():
+        result = await db.execute(
+            select(models.User)
+            .options(*user_schemas.user_load_options())
+            .where(models.User.email == form_data.username)
+        )
+        user = result.scalars().first()
+        verified, new_hash = (False, None)
+        if user:
+            verified, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=401,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored hash used a different bcrypt cost; upgrade it transparently
+        user.hashed_password = new_hash
+        await db.commit()
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     # Legacy is_admin flag removed; role-based elevation handled via migration.
     roles = [role.name for role in user.roles]
     access_token = security.create_access_token(
-        data={"sub": user.email, "roles": roles}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": user.id, "roles": roles, "ver": user.token_version},
+        expires_delta=access_token_expires,
     )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1,15 +1,26 @@
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.core.rate_limit import login_throttle
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.query_counter import QueryCounter
+from app.db.session import enable_sqlite_foreign_keys, get_async_db, get_db
 from main import app
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+enable_sqlite_foreign_keys(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# TestClient may run each request on a fresh event loop, so don't pool async connections
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+enable_sqlite_foreign_keys(async_engine.sync_engine)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_db():
@@ -17,6 +28,12 @@ def setup_db():
     yield
     Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture(autouse=True)
+def reset_login_throttle():
+    # Every test logs in from the same client address
+    login_throttle.reset()
+    yield
+
 def override_get_db():
     session = TestingSessionLocal()
     try:
@@ -24,8 +41,35 @@ def override_get_db():
     finally:
         session.close()
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as session:
+        yield session
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 @pytest.fixture()
 def client():
     return TestClient(app)
+
+@pytest.fixture()
+def session_factory():
+    return TestingSessionLocal
+
+@pytest.fixture()
+def async_session_factory():
+    return TestingAsyncSessionLocal
+
+@pytest.fixture()
+def query_budget():
+    """
+    Fails the test when the wrapped requests run more SQL statements than allowed.
+    """
+    @contextmanager
+    def guard(max_queries: int):
+        with QueryCounter(engine, async_engine.sync_engine) as counter:
+            yield counter
+        assert counter.count <= max_queries, (
+            f"{counter.count} queries exceeded the budget of {max_queries}:\n" + "\n".join(counter.statements)
+        )
+    return guard
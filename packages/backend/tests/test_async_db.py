@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import event, text
+
+from app.db.session import get_db
+from main import app
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+SLOW_QUERY_SECONDS = 1.0
+
+
+def test_requests_are_not_serialized_behind_a_slow_query(client, async_session_factory):
+    admin = register_user(client, "async_admin@example.com")
+    db = next(app.dependency_overrides[get_db]())
+    promote_to_admin(db, admin["id"])
+    token = login(client, "async_admin@example.com")
+
+    engine = async_session_factory.kw["bind"].sync_engine
+
+    # sqlite function that blocks inside the driver, standing in for a slow query
+    def register_pause(dbapi_connection, connection_record):
+        dbapi_connection.create_function("pause", 1, lambda seconds: time.sleep(seconds) or 1)
+
+    event.listen(engine, "connect", register_pause)
+    try:
+        async def scenario():
+            async with async_session_factory() as slow_db:
+                slow = asyncio.create_task(slow_db.execute(text(f"SELECT pause({SLOW_QUERY_SECONDS})")))
+                await asyncio.sleep(0.1)
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+                    started = time.perf_counter()
+                    responses = await asyncio.gather(
+                        *[ac.get("/api/v1/users/", headers=auth_headers(token)) for _ in range(5)]
+                    )
+                    elapsed = time.perf_counter() - started
+                # The admin list requests all completed while the slow query was still running
+                assert not slow.done()
+                await slow
+                return responses, elapsed
+
+        responses, elapsed = asyncio.run(scenario())
+    finally:
+        event.remove(engine, "connect", register_pause)
+
+    assert all(r.status_code == 200 for r in responses)
+    assert elapsed < SLOW_QUERY_SECONDS
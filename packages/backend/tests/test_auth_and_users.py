@@ -24,3 +24,103 @@ def test_register_and_login(client):
     register_user(client, "user1@example.com")
     token = login(client, "user1@example.com")
     assert token
+
+def test_login_rehashes_password_when_cost_changes(client):
+    from app.core.config import settings
+    from app.core.hashing import build_crypt_context, password_hasher
+    from app.db.session import get_db
+    from app.modules.users.models import User
+    from main import app
+
+    register_user(client, "rehash@example.com")
+    db = next(app.dependency_overrides[get_db]())
+    user = db.query(User).filter(User.email == "rehash@example.com").one()
+    # Simulate a hash created under an older, cheaper cost setting
+    user.hashed_password = build_crypt_context(4).hash("password123")
+    db.commit()
+
+    completed_before = password_hasher.stats()["completed"]
+    assert login(client, "rehash@example.com")
+    assert password_hasher.stats()["completed"] > completed_before
+
+    db.refresh(user)
+    assert user.hashed_password.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert login(client, "rehash@example.com")
+    db.close()
+
+
+def test_bulk_delete_and_assign_admin_are_set_based(client):
+    from app.db.session import get_db
+    from app.modules.tasks.models import Task
+    from app.modules.users.models import user_roles
+    from main import app
+    from test_roles import promote_to_admin
+
+    admin = register_user(client, "bulk_ops_admin@example.com")
+    db = next(app.dependency_overrides[get_db]())
+    promote_to_admin(db, admin["id"])
+    token = login(client, "bulk_ops_admin@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    stale = [register_user(client, f"stale{i}@example.com")["id"] for i in range(3)]
+    stale_token = login(client, "stale0@example.com")
+    task = client.post("/api/v1/tasks/", json={"title": "Orphan"}, headers={"Authorization": f"Bearer {stale_token}"}).json()
+
+    r = client.post("/api/v1/users/users/assign_admin/", json=stale[:2] + [999999], headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["updated_ids"] == stale[:2]
+    # Already an admin: nothing to do
+    r = client.post("/api/v1/users/users/assign_admin/", json=stale[:1], headers=headers)
+    assert r.status_code == 404
+
+    r = client.request("DELETE", "/api/v1/users/users/", json=stale + [999999], headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["deleted_ids"] == stale
+
+    assert db.execute(user_roles.select().where(user_roles.c.user_id.in_(stale))).first() is None
+    assert db.get(Task, task["id"]).owner_id is None
+    db.close()
+
+
+def test_registration_reports_which_email_is_taken(client):
+    register_user(client, "taken_account@example.com")
+
+    def attempt(email, contact_email, personal_email=None):
+        contact = {"email": contact_email, "first_name": "T", "last_name": "U"}
+        if personal_email:
+            contact["personal_email"] = personal_email
+        return client.post("/api/v1/users/", json={"email": email, "password": "x", "contact": contact})
+
+    r = attempt("taken_account@example.com", "fresh_contact@example.com")
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Email already registered"
+
+    r = attempt("fresh_account@example.com", "taken_account@example.com")
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Contact email already used by another contact"
+
+    assert attempt("personal_first@example.com", "personal_first@example.com", "shared@example.com").status_code == 200
+    r = attempt("personal_second@example.com", "personal_second@example.com", "shared@example.com")
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Personal email already used by another contact"
+
+
+def test_registration_recovers_when_baseline_role_is_replaced(client):
+    from app.modules.roles import services as role_services
+    from app.modules.users.models import Role
+
+    register_user(client, "baseline_before@example.com")
+    # The remembered role id points at a row that no longer exists
+    role_services.remember_baseline_role(Role(id=987654, name="user", description="gone"))
+    try:
+        r = client.post("/api/v1/users/", json={
+            "email": "baseline_after@example.com",
+            "password": "x",
+            "contact": {"email": "baseline_after@example.com", "first_name": "T", "last_name": "U"},
+        })
+        assert r.status_code == 503
+        assert r.headers["Retry-After"]
+        created = register_user(client, "baseline_after@example.com")
+        assert [role["name"] for role in created["roles"]] == ["user"]
+    finally:
+        role_services.forget_baseline_role()
@@ -0,0 +1,96 @@
+from test_roles import auth_headers, login, register_user
+
+
+def test_task_etag_and_last_modified(client):
+    register_user(client, "etag@example.com")
+    token = login(client, "etag@example.com")
+    headers = auth_headers(token)
+    task = client.post("/api/v1/tasks/", json={"title": "Poll me"}, headers=headers).json()
+
+    first = client.get(f"/api/v1/tasks/{task['id']}", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    last_modified = first.headers["last-modified"]
+
+    cached = client.get(f"/api/v1/tasks/{task['id']}", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    since = client.get(f"/api/v1/tasks/{task['id']}", headers={**headers, "If-Modified-Since": last_modified})
+    assert since.status_code == 304
+
+    client.put(f"/api/v1/tasks/{task['id']}", json={"status": "completed"}, headers=headers)
+    changed = client.get(f"/api/v1/tasks/{task['id']}", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "completed"
+    assert changed.headers["etag"] != etag
+
+
+def test_task_list_and_me_etags(client):
+    register_user(client, "etag_list@example.com")
+    token = login(client, "etag_list@example.com")
+    headers = auth_headers(token)
+    client.post("/api/v1/tasks/", json={"title": "One"}, headers=headers)
+
+    listing = client.get("/api/v1/tasks/", headers=headers)
+    etag = listing.headers["etag"]
+    assert client.get("/api/v1/tasks/", headers={**headers, "If-None-Match": etag}).status_code == 304
+    # Different query parameters are a different representation
+    assert client.get("/api/v1/tasks/", params={"limit": 1}, headers={**headers, "If-None-Match": etag}).status_code == 200
+
+    created = client.post("/api/v1/tasks/", json={"title": "Two"}, headers=headers).json()
+    assert client.get("/api/v1/tasks/", headers={**headers, "If-None-Match": etag}).status_code == 200
+    etag = client.get("/api/v1/tasks/", headers=headers).headers["etag"]
+    client.delete(f"/api/v1/tasks/{created['id']}", headers=headers)
+    assert client.get("/api/v1/tasks/", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+    me = client.get("/api/v1/users/me", headers=headers)
+    assert client.get("/api/v1/users/me", headers={**headers, "If-None-Match": me.headers["etag"]}).status_code == 304
+    assert client.get("/api/v1/users/me", headers={**headers, "If-None-Match": 'W/"stale"'}).status_code == 200
+
+
+def test_task_list_etag_tracks_deletes_and_ignores_if_modified_since(client):
+    register_user(client, "etag_shrink@example.com")
+    headers = auth_headers(login(client, "etag_shrink@example.com"))
+    older = client.post("/api/v1/tasks/", json={"title": "Older"}, headers=headers).json()
+    client.post("/api/v1/tasks/", json={"title": "Newer"}, headers=headers)
+
+    listing = client.get("/api/v1/tasks/", headers=headers)
+    assert "last-modified" not in listing.headers
+    client.delete(f"/api/v1/tasks/{older['id']}", headers=headers)
+
+    since = client.get("/api/v1/tasks/", headers={**headers, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert since.status_code == 200
+    assert len(since.json()) == 1
+    assert client.get("/api/v1/tasks/", headers={**headers, "If-None-Match": listing.headers["etag"]}).status_code == 200
+
+
+def test_task_and_asset_validators_change_when_owner_is_deleted(client, session_factory):
+    from test_roles import promote_to_admin
+
+    admin = register_user(client, "etag_detach_admin@example.com")
+    db = session_factory()
+    try:
+        promote_to_admin(db, admin["id"])
+    finally:
+        db.close()
+    admin_headers = auth_headers(login(client, "etag_detach_admin@example.com"))
+    owner = register_user(client, "etag_detach_owner@example.com")
+    owner_headers = auth_headers(login(client, "etag_detach_owner@example.com"))
+    task = client.post("/api/v1/tasks/", json={"title": "Orphaned"}, headers=owner_headers).json()
+    asset = client.post("/api/v1/assets/", json={"name": "Laptop"}, headers=admin_headers).json()
+    r = client.put(f"/api/v1/assets/{asset['id']}", json={"assignee_id": owner["id"]}, headers=admin_headers)
+    assert r.status_code == 200, r.text
+
+    paths = [f"/api/v1/tasks/{task['id']}", f"/api/v1/assets/{asset['id']}"]
+    before = {path: client.get(path, headers=admin_headers) for path in paths}
+    r = client.request("DELETE", "/api/v1/users/users/", json=[owner["id"]], headers=admin_headers)
+    assert r.status_code == 200, r.text
+
+    for path, cached in before.items():
+        fresh = client.get(path, headers={**admin_headers, "If-None-Match": cached.headers["etag"]})
+        assert fresh.status_code == 200
+        # Last-Modified moves too, though HTTP dates only resolve whole seconds
+        assert fresh.json()["updated_at"] > cached.json()["updated_at"]
+    assert client.get(paths[0], headers=admin_headers).json()["owner_id"] is None
+    assert client.get(paths[1], headers=admin_headers).json()["assignee_id"] is None
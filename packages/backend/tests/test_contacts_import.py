@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+
+from app.modules.contacts import importer
+from app.modules.contacts.models import Contact
+from app.utils.export import ExportFormat
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+CSV_BODY = """email,first_name,last_name,personal_email,phone_number
+ada@import.example.com,Ada,Lovelace,,0400 000 001
+grace@import.example.com,Grace,Hopper,grace@home.example.com,
+not-an-email,Bad,Row,,
+ada@import.example.com,Ada,Again,,
+alan@import.example.com,,Turing,,
+import_admin@example.com,Taken,Already,,
+katherine@import.example.com,Katherine,Johnson,grace@home.example.com,
+"""
+
+
+def test_contact_import_csv_with_error_report(client, session_factory):
+    admin = register_user(client, "import_admin@example.com")
+    db = session_factory()
+    try:
+        promote_to_admin(db, admin["id"])
+    finally:
+        db.close()
+    token = login(client, "import_admin@example.com")
+
+    r = client.post(
+        "/api/v1/contacts/import",
+        files={"file": ("volunteers.csv", CSV_BODY.encode(), "text/csv")},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["imported"] == 2
+    assert [(e["row"], e["email"]) for e in body["errors"]] == [
+        (3, "not-an-email"),
+        (4, "ada@import.example.com"),
+        (5, "alan@import.example.com"),
+        (6, "import_admin@example.com"),
+        (7, "katherine@import.example.com"),
+    ]
+    assert "first_name" in body["errors"][2]["detail"]
+
+    db = session_factory()
+    try:
+        grace = db.query(Contact).filter(Contact.email == "grace@import.example.com").one()
+        assert grace.personal_email == "grace@home.example.com"
+        assert grace.phone_number is None
+    finally:
+        db.close()
+
+    # Re-importing the same file rejects every row, and the report can be downloaded as CSV
+    r = client.post(
+        "/api/v1/contacts/import",
+        params={"report": "csv"},
+        files={"file": ("volunteers.csv", CSV_BODY.encode(), "text/csv")},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200
+    assert r.headers["x-imported-count"] == "0"
+    report = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(report) == 7
+    assert report[0] == {"row": "1", "email": "ada@import.example.com", "detail": "Duplicate email"}
+
+    register_user(client, "import_member@example.com")
+    member = login(client, "import_member@example.com")
+    r = client.post(
+        "/api/v1/contacts/import",
+        files={"file": ("volunteers.csv", CSV_BODY.encode(), "text/csv")},
+        headers=auth_headers(member),
+    )
+    assert r.status_code == 403
+
+
+def test_contact_import_ndjson_in_chunks(session_factory):
+    lines = [json.dumps({"email": f"chunk{i}@import.example.com", "first_name": "Chunk", "last_name": str(i)}) for i in range(5)]
+    lines.insert(2, "[1, 2]")
+    lines.append(lines[0])
+    stream = io.BytesIO(("\n".join(lines) + "\n").encode())
+
+    db = session_factory()
+    try:
+        result = importer.import_contacts(db, importer.read_rows(stream, ExportFormat.NDJSON), chunk_size=2)
+        assert result.imported == 5
+        assert [(e.row, e.detail) for e in result.errors] == [(3, "Not a JSON object"), (7, "Duplicate email")]
+        assert db.query(Contact).filter(Contact.email.like("chunk%@import.example.com")).count() == 5
+    finally:
+        db.close()
@@ -0,0 +1,50 @@
+from app.modules.contacts.models import Contact
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+
+def test_contact_search_prefix_ranked_and_in_sync(client, session_factory):
+    admin = register_user(client, "search_admin@example.com")
+    db = session_factory()
+    try:
+        promote_to_admin(db, admin["id"])
+        db.add_all([
+            Contact(first_name="Marguerite", last_name="Okafor", email="m.okafor@example.com",
+                    membership_id="SES-4471", organizational_unit="Northside Unit"),
+            Contact(first_name="Oliver", last_name="Marsh", email="oliver@example.com",
+                    organizational_unit="Margate Unit"),
+            Contact(first_name="Priya", last_name="Nair", email="pnair@example.com", phone_number="0412 555 019"),
+        ])
+        db.commit()
+    finally:
+        db.close()
+    token = login(client, "search_admin@example.com")
+
+    def search(q):
+        r = client.get("/api/v1/contacts/search", params={"q": q}, headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        return [c["email"] for c in r.json()]
+
+    # A name match outranks a match on organizational unit
+    assert search("marg") == ["m.okafor@example.com", "oliver@example.com"]
+    assert search("okafor north") == ["m.okafor@example.com"]
+    assert search("ses-4471") == ["m.okafor@example.com"]
+    assert search("0412") == ["pnair@example.com"]
+    assert search("pnair@example") == ["pnair@example.com"]
+    assert search("?!") == []
+
+    # Updates and deletes are reflected in the index
+    db = session_factory()
+    try:
+        priya = db.query(Contact).filter(Contact.email == "pnair@example.com").one()
+        priya.last_name = "Margolis"
+        db.delete(db.query(Contact).filter(Contact.email == "oliver@example.com").one())
+        db.commit()
+    finally:
+        db.close()
+    assert sorted(search("marg")) == ["m.okafor@example.com", "pnair@example.com"]
+    assert search("nair") == []
+
+    register_user(client, "search_member@example.com")
+    member_token = login(client, "search_member@example.com")
+    r = client.get("/api/v1/contacts/search", params={"q": "marg"}, headers=auth_headers(member_token))
+    assert r.status_code == 403
@@ -0,0 +1,85 @@
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.modules.emails.models import EmailOutbox, EmailStatus
+from app.modules.emails.services import EmailOutboxWorker, SMTPConnectionPool
+
+
+class SinkHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture()
+def smtp_server():
+    handler = SinkHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def register_user(client, email):
+    payload = {
+        "email": email,
+        "password": "password123",
+        "contact": {"email": email, "first_name": "Mail", "last_name": "User"},
+    }
+    r = client.post("/api/v1/users/", json=payload)
+    assert r.status_code == 200, r.text
+
+
+def test_registration_queues_welcome_email_and_worker_delivers(client, session_factory, smtp_server):
+    controller, handler = smtp_server
+    register_user(client, "outbox@example.com")
+
+    db = session_factory()
+    queued = db.query(EmailOutbox).filter(EmailOutbox.email_to == "outbox@example.com").one()
+    assert queued.status == EmailStatus.PENDING
+    db.close()
+
+    pool = SMTPConnectionPool(size=2, host=controller.hostname, port=controller.port, use_tls=False, user=None, password=None)
+    worker = EmailOutboxWorker(session_factory=session_factory, pool=pool)
+    assert worker.drain_once() >= 1
+    pool.close()
+
+    assert any("outbox@example.com" in m.rcpt_tos for m in handler.messages)
+    db = session_factory()
+    sent = db.query(EmailOutbox).filter(EmailOutbox.email_to == "outbox@example.com").one()
+    assert sent.status == EmailStatus.SENT
+    assert sent.attempts == 1
+    db.close()
+
+
+def test_failed_delivery_is_retried_with_backoff(session_factory):
+    db = session_factory()
+    email = EmailOutbox(email_to="nobody@example.com", subject="Hi", html_content="<p>Hi</p>")
+    db.add(email)
+    db.commit()
+    email_id = email.id
+    db.close()
+
+    # Nothing listens on this port, so every connection attempt fails
+    pool = SMTPConnectionPool(size=1, host="127.0.0.1", port=free_port(), use_tls=False, user=None, password=None, timeout=1)
+    worker = EmailOutboxWorker(session_factory=session_factory, pool=pool, max_attempts=2, backoff_seconds=60)
+    worker.drain_once()
+
+    db = session_factory()
+    email = db.get(EmailOutbox, email_id)
+    assert email.status == EmailStatus.PENDING
+    assert email.attempts == 1
+    assert email.last_error
+    assert email.next_attempt_at > email.created_at
+    db.close()
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+
+from app.utils import export
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+
+def test_streaming_exports(client, session_factory, monkeypatch):
+    admin = register_user(client, "export_admin@example.com")
+    db = session_factory()
+    try:
+        promote_to_admin(db, admin["id"])
+    finally:
+        db.close()
+    token = login(client, "export_admin@example.com")
+    for i in range(5):
+        r = client.post(
+            "/api/v1/tasks/",
+            json={"title": f"Export {i}", "status": "completed" if i % 2 else "pending", "due_date": "2026-03-01T09:30:00"},
+            headers=auth_headers(token),
+        )
+        assert r.status_code == 201, r.text
+
+    # Small batches so the body arrives in several chunks
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    r = client.get("/api/v1/tasks/export", params={"owner_id": admin["id"]}, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["title"] for row in rows] == [f"Export {i}" for i in range(5)]
+    assert rows[0]["status"] == "pending"
+    assert rows[0]["due_date"] == "2026-03-01T09:30:00"
+    assert rows[0]["owner_id"] == admin["id"]
+
+    r = client.get(
+        "/api/v1/tasks/export",
+        params={"format": "csv", "owner_id": admin["id"], "status": "completed"},
+        headers=auth_headers(token),
+    )
+    assert r.status_code == 200
+    assert 'filename="tasks.csv"' in r.headers["content-disposition"]
+    table = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["title"] for row in table] == ["Export 1", "Export 3"]
+    assert table[0]["description"] == ""
+
+    r = client.get("/api/v1/contacts/export", params={"format": "csv"}, headers=auth_headers(token))
+    assert r.status_code == 200
+    contacts = list(csv.DictReader(io.StringIO(r.text)))
+    assert "export_admin@example.com" in {c["email"] for c in contacts}
+    assert list(contacts[0])[:2] == ["id", "email"]
+
+    r = client.get("/api/v1/assets/export", headers=auth_headers(token))
+    assert r.status_code == 200
+
+    register_user(client, "export_member@example.com")
+    member = login(client, "export_member@example.com")
+    assert client.get("/api/v1/contacts/export", headers=auth_headers(member)).status_code == 403
+    assert client.get("/api/v1/tasks/export", headers=auth_headers(member)).status_code == 403
+
+
+def test_iter_export_yields_one_chunk_per_batch(session_factory, monkeypatch):
+    from sqlalchemy import literal, select, union_all
+
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    stmt = union_all(*[select(literal(i).label("n")) for i in range(5)])
+    chunks = list(export.iter_export(session_factory.kw["bind"], stmt, export.ExportFormat.CSV))
+    assert chunks[0] == "n\r\n"
+    assert len(chunks) == 4
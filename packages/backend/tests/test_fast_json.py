@@ -0,0 +1,65 @@
+from app.core.config import settings
+from app.modules.contacts.models import Contact
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+
+def test_fast_list_serialization_matches_default(client, session_factory, monkeypatch):
+    admin = register_user(client, "fastjson_admin@example.com")
+    db = session_factory()
+    try:
+        promote_to_admin(db, admin["id"])
+        db.add(Contact(first_name="Zoë", last_name="Ngā", email="zoe@fastjson.example.com", notes="ünïcode ✓"))
+        db.commit()
+    finally:
+        db.close()
+    token = login(client, "fastjson_admin@example.com")
+    headers = auth_headers(token)
+    for i in range(3):
+        client.post(
+            "/api/v1/tasks/",
+            json={"title": f"Fast “{i}”", "due_date": "2026-05-01T08:00:00.250000", "status": "in_progress"},
+            headers=headers,
+        )
+    client.post("/api/v1/assets/", json={"name": "Generator", "serial_number": "FJ-1"}, headers=headers)
+
+    urls = [
+        ("/api/v1/tasks/", {"limit": 2}),
+        ("/api/v1/tasks/all", {}),
+        ("/api/v1/assets/", {}),
+        ("/api/v1/contacts/", {}),
+        ("/api/v1/users/", {}),
+    ]
+    for url, params in urls:
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        fast = client.get(url, params=params, headers=headers)
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+        default = client.get(url, params=params, headers=headers)
+        assert fast.status_code == default.status_code == 200, url
+        assert fast.content == default.content, url
+        assert fast.headers["content-type"] == default.headers["content-type"]
+        assert fast.headers.get("x-next-cursor") == default.headers.get("x-next-cursor")
+        assert fast.headers.get("etag") == default.headers.get("etag")
+    assert fast.json()
+
+
+def test_list_bodies_dumped_for_etags_are_not_serialized_again(client, monkeypatch):
+    import fastapi.routing
+
+    register_user(client, "fastjson_once@example.com")
+    headers = auth_headers(login(client, "fastjson_once@example.com"))
+    client.post("/api/v1/tasks/", json={"title": "Once"}, headers=headers)
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+    serialized = []
+    serialize_response = fastapi.routing.serialize_response
+
+    async def counting_serialize_response(*args, **kwargs):
+        serialized.append(kwargs.get("field"))
+        return await serialize_response(*args, **kwargs)
+
+    monkeypatch.setattr(fastapi.routing, "serialize_response", counting_serialize_response)
+    r = client.get("/api/v1/tasks/", headers=headers)
+    assert r.status_code == 200
+    assert [t["title"] for t in r.json()] == ["Once"]
+    # The page dumped for the ETag is sent as is
+    assert serialized == []
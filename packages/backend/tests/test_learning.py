@@ -0,0 +1,102 @@
+from app.modules.learning.models import ModuleProgress
+from app.modules.learning.progress import progress_buffer
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+
+def make_course(client, headers, title: str, modules: int) -> dict:
+    r = client.post(
+        "/api/v1/learning/courses",
+        json={"title": title, "modules": [{"title": f"Part {i}", "position": i} for i in range(modules)]},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_progress_heartbeats_are_coalesced_and_flushed_in_bulk(client, session_factory, query_budget):
+    admin = register_user(client, "learning-admin@example.com")
+    with session_factory() as db:
+        promote_to_admin(db, admin["id"])
+    headers = auth_headers(login(client, "learning-admin@example.com"))
+    register_user(client, "learner@example.com")
+    learner_headers = auth_headers(login(client, "learner@example.com"))
+
+    course = make_course(client, headers, "First aid", 2)
+    first, second = [module["id"] for module in course["modules"]]
+    assert course["module_count"] == 2
+
+    progress_buffer.flush()
+    heartbeats = [
+        [{"module_id": first, "percent": 30}, {"module_id": first, "percent": 60}],
+        # Late, out-of-order heartbeat
+        [{"module_id": first, "percent": 40}, {"module_id": second, "percent": 100}],
+        [{"module_id": 999999, "percent": 50}],
+    ]
+    responses = [
+        client.post("/api/v1/learning/progress", json={"events": events}, headers=learner_headers)
+        for events in heartbeats
+    ]
+    assert [r.status_code for r in responses] == [202, 202, 202]
+    # Unknown modules are turned away before they take buffer space
+    assert responses[2].json() == {"accepted": 0, "rejected": [999999]}
+    assert progress_buffer.pending() == 2
+
+    # users + modules + one upsert + recount + course upsert + commit, however many heartbeats
+    with session_factory() as db, query_budget(8):
+        assert progress_buffer.flush(db) == 2
+    assert progress_buffer.pending() == 0
+
+    r = client.get(f"/api/v1/learning/me/courses/{course['id']}/progress", headers=learner_headers)
+    assert [(row["module_id"], row["percent"]) for row in r.json()] == [(first, 60), (second, 100)]
+    r = client.get("/api/v1/learning/me/progress", headers=learner_headers)
+    assert [(row["modules_completed"], row["completed_at"]) for row in r.json()] == [(1, None)]
+
+    client.post("/api/v1/learning/progress", json={"events": [{"module_id": first, "percent": 100}]}, headers=learner_headers)
+    r = client.post("/api/v1/learning/progress/flush", headers=headers)
+    assert r.json() == {"written": 1}
+    r = client.get(f"/api/v1/learning/courses/{course['id']}/summary", headers=headers)
+    assert r.json() == {
+        "course_id": course["id"], "module_count": 2, "learners": 1, "completed": 1, "average_modules_completed": 2.0,
+    }
+
+    # A new module reopens the course for everyone who had finished it
+    r = client.post(f"/api/v1/learning/courses/{course['id']}/modules", json={"title": "Part 2", "position": 2}, headers=headers)
+    assert r.status_code == 201, r.text
+    summary = client.get(f"/api/v1/learning/courses/{course['id']}/summary", headers=headers).json()
+    assert (summary["module_count"], summary["completed"]) == (3, 0)
+    assert client.delete(f"/api/v1/learning/modules/{r.json()['id']}", headers=headers).status_code == 200
+    summary = client.get(f"/api/v1/learning/courses/{course['id']}/summary", headers=headers).json()
+    assert (summary["module_count"], summary["completed"]) == (2, 1)
+
+    assert client.delete(f"/api/v1/learning/courses/{course['id']}", headers=headers).status_code == 200
+    with session_factory() as db:
+        assert db.query(ModuleProgress).filter(ModuleProgress.course_id == course["id"]).count() == 0
+
+
+def test_course_admin_routes_require_admin(client):
+    register_user(client, "learning-reader@example.com")
+    headers = auth_headers(login(client, "learning-reader@example.com"))
+    assert client.post("/api/v1/learning/courses", json={"title": "Nope"}, headers=headers).status_code == 403
+    assert client.get("/api/v1/learning/courses", headers=headers).status_code == 200
+    r = client.post("/api/v1/learning/progress", json={"events": [{"module_id": 1, "percent": 101}]}, headers=headers)
+    assert r.status_code == 422
+
+
+def test_progress_buffer_refuses_new_keys_beyond_its_limit(client, session_factory, monkeypatch):
+    admin = register_user(client, "learning-cap-admin@example.com")
+    with session_factory() as db:
+        promote_to_admin(db, admin["id"])
+    headers = auth_headers(login(client, "learning-cap-admin@example.com"))
+    modules = [m["id"] for m in make_course(client, headers, "Radio", 3)["modules"]]
+
+    progress_buffer.flush()
+    monkeypatch.setattr(progress_buffer, "limit", 2)
+    send = lambda events: client.post("/api/v1/learning/progress", json={"events": events}, headers=headers)
+    assert send([{"module_id": modules[0], "percent": 10}, {"module_id": modules[1], "percent": 10}]).status_code == 202
+    refused = send([{"module_id": modules[2], "percent": 10}])
+    assert refused.status_code == 503
+    assert "retry-after" in refused.headers
+    # Keys already buffered still coalesce
+    assert send([{"module_id": modules[0], "percent": 50}]).status_code == 202
+    assert progress_buffer.pending() == 2
+    progress_buffer.flush()
@@ -0,0 +1,107 @@
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.rate_limit import InProcessSharedStore, SharedTokenBucketStore, login_throttle
+from app.core.request_context import client_ip
+from main import app
+from test_roles import register_user
+
+
+def attempt(client, email, password="wrong-password"):
+    return client.post("/api/v1/token", data={"username": email, "password": password})
+
+
+def test_username_bucket_rejects_before_db_work(client, query_budget, monkeypatch):
+    register_user(client, "throttle_user@example.com")
+    monkeypatch.setattr(login_throttle, "username_limit", (2.0, 1 / 600))
+    assert attempt(client, "throttle_user@example.com").status_code == 401
+    assert attempt(client, "Throttle_User@example.com ").status_code == 401
+    with query_budget(0):
+        r = attempt(client, "throttle_user@example.com", "password123")
+    assert r.status_code == 429
+    assert int(r.headers["retry-after"]) > 0
+    # Other accounts are unaffected
+    assert attempt(client, "throttle_other@example.com").status_code == 401
+
+
+def test_ip_bucket_limits_spraying_many_usernames(client, monkeypatch):
+    monkeypatch.setattr(login_throttle, "ip_limit", (3.0, 1 / 600))
+    statuses = [attempt(client, f"spray{i}@example.com").status_code for i in range(5)]
+    assert statuses == [401, 401, 401, 429, 429]
+
+
+def test_concurrent_verifications_are_capped(client, monkeypatch):
+    register_user(client, "throttle_busy@example.com")
+    monkeypatch.setattr(login_throttle, "max_concurrent", 1)
+    with login_throttle.verification_slot():
+        r = attempt(client, "throttle_busy@example.com", "password123")
+    assert r.status_code == 503
+    assert attempt(client, "throttle_busy@example.com", "password123").status_code == 200
+    assert login_throttle.stats()["in_flight"] == 0
+
+
+def test_shared_store_buckets_apply_across_workers():
+    store = InProcessSharedStore()
+    worker_a, worker_b = SharedTokenBucketStore(store), SharedTokenBucketStore(store)
+    assert worker_a.take("k", capacity=2, rate=0.001) == 0
+    assert worker_b.take("k", capacity=2, rate=0.001) == 0
+    assert worker_a.take("k", capacity=2, rate=0.001) > 0
+    assert worker_b.take("other", capacity=2, rate=0.001) == 0
+
+
+def test_ip_bucket_keys_on_the_forwarded_client_behind_a_trusted_proxy(monkeypatch):
+    async def via_balancer(scope, receive, send):
+        scope["client"] = ("10.0.0.5", 41000)
+        await app(scope, receive, send)
+
+    balanced = TestClient(via_balancer)
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", "10.0.0.0/8")
+    monkeypatch.setattr(login_throttle, "ip_limit", (3.0, 1 / 600))
+
+    def attempt_from(forwarded_for, i):
+        return balanced.post(
+            "/api/v1/token",
+            data={"username": f"forwarded{i}@example.com", "password": "wrong-password"},
+            headers={"X-Forwarded-For": forwarded_for},
+        ).status_code
+
+    # The left-most entry is client-supplied; the hop appended by the balancer counts
+    statuses = [attempt_from(f"198.51.100.{i}, 203.0.113.1", i) for i in range(4)]
+    assert statuses == [401, 401, 401, 429]
+    # Other clients behind the same balancer keep their own bucket
+    assert attempt_from("203.0.113.2", 9) == 401
+
+
+def test_forwarded_for_is_ignored_from_untrusted_peers():
+    scope = {
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "client": ("192.0.2.7", 5000),
+        "headers": [(b"x-forwarded-for", b"203.0.113.1, 10.0.0.9")],
+    }
+    request = Request(scope)
+    assert client_ip(request, "") == "192.0.2.7"
+    assert client_ip(request, "192.0.2.0/24") == "10.0.0.9"
+    assert client_ip(request, "192.0.2.0/24, 10.0.0.0/8") == "203.0.113.1"
+
+
+def test_zero_refill_rates_and_incomplete_stores_fail_at_startup():
+    import pytest
+    from pydantic import ValidationError
+
+    from app.core.config import Settings
+    from app.core.rate_limit import LoginThrottle, MemoryTokenBucketStore, SharedStore, TokenBucketStore
+
+    with pytest.raises(ValidationError):
+        Settings(DATABASE_URL="sqlite://", LOGIN_IP_PER_MINUTE=0)
+    with pytest.raises(ValueError):
+        LoginThrottle(MemoryTokenBucketStore(), username_per_minute=0)
+
+    class HalfStore(SharedStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        HalfStore()
+    with pytest.raises(TypeError):
+        TokenBucketStore()
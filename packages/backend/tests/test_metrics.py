@@ -0,0 +1,64 @@
+import re
+
+from app.core import metrics
+from app.core.config import settings
+from test_roles import auth_headers, login, register_user
+
+
+def sample(text: str, name: str, **labels) -> float:
+    for line in text.splitlines():
+        if not line.startswith(name + "{") and not line.startswith(name + " "):
+            continue
+        found = dict(re.findall(r'(\w+)="([^"]*)"', line.split(" ")[0]))
+        if all(found.get(key) == value for key, value in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_record_routes_statements_and_pool(client, session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_PUBLIC", True)
+    metrics.instrument_engine(session_factory.kw["bind"], "test")
+    register_user(client, "metrics_user@example.com")
+    headers = auth_headers(login(client, "metrics_user@example.com"))
+    route = "/api/v1/tasks/{task_id}"
+
+    before = client.get("/metrics").text
+    assert client.get("/api/v1/tasks/424242", headers=headers).status_code == 404
+    client.post("/api/v1/tasks/", json={"title": "Measured"}, headers=headers)
+    client.get("/no/such/path")
+    after = client.get("/metrics")
+
+    assert after.status_code == 200
+    assert after.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = after.text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+
+    def delta(name, **labels):
+        return sample(text, name, **labels) - sample(before, name, **labels)
+
+    # Labelled by route template, not the concrete path
+    assert delta("http_requests_total", method="GET", route=route, status="404") == 1
+    assert "/api/v1/tasks/424242" not in text
+    assert delta("http_requests_total", method="GET", route="unmatched", status="404") == 1
+    assert delta("http_request_duration_seconds_count", method="GET", route=route) == 1
+    assert delta("http_request_duration_seconds_bucket", method="GET", route=route, le="+Inf") == 1
+    assert delta("http_request_db_statements_sum", method="POST", route="/api/v1/tasks/") >= 1
+    assert delta("db_statements_total", engine="test") >= 1
+    assert delta("db_pool_checkout_wait_seconds_count", engine="test") >= 1
+    # The scrape itself is in flight while rendering
+    assert sample(text, "http_requests_in_flight") == 1
+    assert 'password_hasher{stat="workers"}' in text
+
+
+def test_metrics_require_a_token_unless_public(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+    monkeypatch.setattr(settings, "METRICS_PUBLIC", True)
+    assert client.get("/metrics").status_code == 200
+
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
@@ -0,0 +1,110 @@
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus
+from app.core.principals import Principal, PrincipalCache, RoleSnapshot, principal_cache, token_versions
+from app.db.session import get_db
+from main import app
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+
+def test_cache_evicts_lru_and_invalidates_by_user():
+    cache = PrincipalCache(InvalidationBus(), maxsize=2, ttl=60)
+    alice = Principal(id=1, email="a@example.com", is_active=True, roles=(RoleSnapshot(id=1, name="user"),))
+    bob = Principal(id=2, email="b@example.com", is_active=True)
+    cache.put(("a@example.com", "t1"), alice, cache.generation())
+    cache.put(("a@example.com", "t2"), alice, cache.generation())
+    assert cache.get(("a@example.com", "t1")) is alice
+    cache.put(("b@example.com", "t3"), bob, cache.generation())
+    # t2 was least recently used
+    assert cache.get(("a@example.com", "t2")) is None
+    cache.invalidate_user(1)
+    assert cache.get(("a@example.com", "t1")) is None
+    assert cache.get(("b@example.com", "t3")) is bob
+
+
+def test_invalidation_reaches_every_worker_and_beats_inflight_loads():
+    bus = InvalidationBus()
+    worker_a, worker_b = PrincipalCache(bus, ttl=60), PrincipalCache(bus, ttl=60)
+    admin = Principal(id=5, email="x@example.com", is_active=True, roles=(RoleSnapshot(id=2, name="administrator"),))
+    worker_b.put(("x@example.com", "t"), admin, worker_b.generation())
+    # Revoked while handled by another worker
+    worker_a.invalidate_user(5)
+    assert worker_b.get(("x@example.com", "t")) is None
+
+    # A load that read the database before the revocation must not be cached after it
+    generation = worker_b.generation()
+    worker_a.invalidate_user(5)
+    worker_b.put(("x@example.com", "t"), admin, generation)
+    assert worker_b.get(("x@example.com", "t")) is None
+
+
+def test_role_assignment_invalidates_cached_principal(client):
+    admin = register_user(client, "cache_admin@example.com")
+    target = register_user(client, "cache_target@example.com")
+    db = next(app.dependency_overrides[get_db]())
+    promote_to_admin(db, admin["id"])
+    admin_token = login(client, "cache_admin@example.com")
+    target_token = login(client, "cache_target@example.com")
+
+    me = client.get("/api/v1/users/me", headers=auth_headers(target_token))
+    assert me.status_code == 200
+    assert principal_cache.get(("cache_target@example.com", target_token)) is not None
+
+    role = client.post("/api/v1/roles/", json={"name": "dispatcher"}, headers=auth_headers(admin_token)).json()
+    r = client.post(f"/api/v1/roles/users/{target['id']}/assign/{role['id']}", headers=auth_headers(admin_token))
+    assert r.status_code == 200, r.text
+    assert principal_cache.get(("cache_target@example.com", target_token)) is None
+
+    me = client.get("/api/v1/users/me", headers=auth_headers(target_token))
+    assert "dispatcher" in {r["name"] for r in me.json()["roles"]}
+
+
+def test_stateless_admin_checks_use_cached_token_version(client, query_budget, monkeypatch):
+    monkeypatch.setattr(settings, "STATELESS_AUTH", True)
+    token_versions.clear()
+    admin = register_user(client, "stateless_admin@example.com")
+    other = register_user(client, "stateless_other@example.com")
+    db = next(app.dependency_overrides[get_db]())
+    promote_to_admin(db, admin["id"])
+    promote_to_admin(db, other["id"])
+    admin_token = login(client, "stateless_admin@example.com")
+    other_token = login(client, "stateless_other@example.com")
+
+    assert client.get("/api/v1/diagnostics/slow-queries", headers=auth_headers(other_token)).status_code == 200
+    # Once the version is cached, 403 vs 200 is decided without touching the database
+    with query_budget(0):
+        assert client.get("/api/v1/diagnostics/slow-queries", headers=auth_headers(other_token)).status_code == 200
+
+    admin_role = next(r for r in client.get("/api/v1/roles/", headers=auth_headers(admin_token)).json() if r["name"] == "administrator")
+    r = client.delete(f"/api/v1/roles/users/{other['id']}/revoke/{admin_role['id']}", headers=auth_headers(admin_token))
+    assert r.status_code == 200, r.text
+    # The old token still claims the administrator role, but its version is stale
+    assert client.get("/api/v1/diagnostics/slow-queries", headers=auth_headers(other_token)).status_code == 401
+
+    promote_to_admin(db, other["id"])
+    other_token = login(client, "stateless_other@example.com")
+    assert client.get("/api/v1/diagnostics/slow-queries", headers=auth_headers(other_token)).status_code == 200
+    r = client.request("DELETE", "/api/v1/users/users/", json=[other["id"]], headers=auth_headers(admin_token))
+    assert r.status_code == 200, r.text
+    assert client.get("/api/v1/diagnostics/slow-queries", headers=auth_headers(other_token)).status_code == 401
+
+
+def test_stateless_token_is_not_accepted_for_a_reused_user_id(client, monkeypatch):
+    monkeypatch.setattr(settings, "STATELESS_AUTH", True)
+    token_versions.clear()
+    admin = register_user(client, "reuse_admin@example.com")
+    db = next(app.dependency_overrides[get_db]())
+    promote_to_admin(db, admin["id"])
+    admin_token = login(client, "reuse_admin@example.com")
+    departed = register_user(client, "reuse_departed@example.com")
+    promote_to_admin(db, departed["id"])
+    departed_token = login(client, "reuse_departed@example.com")
+
+    r = client.request("DELETE", "/api/v1/users/users/", json=[departed["id"]], headers=auth_headers(admin_token))
+    assert r.status_code == 200, r.text
+    # SQLite gives the highest deleted id to the next row; the newcomer starts at version 0 too
+    newcomer = register_user(client, "reuse_newcomer@example.com")
+    assert newcomer["id"] == departed["id"]
+    promote_to_admin(db, newcomer["id"])
+    assert client.get("/api/v1/diagnostics/slow-queries", headers=auth_headers(departed_token)).status_code == 401
+    newcomer_token = login(client, "reuse_newcomer@example.com")
+    assert client.get("/api/v1/diagnostics/slow-queries", headers=auth_headers(newcomer_token)).status_code == 200
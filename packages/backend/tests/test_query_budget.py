@@ -0,0 +1,63 @@
+from app.modules.contacts.models import Contact
+from app.db.session import get_db
+from main import app
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+
+def test_user_list_query_count_does_not_grow_with_users(client, query_budget):
+    admin = register_user(client, "budget_admin@example.com")
+    db = next(app.dependency_overrides[get_db]())
+    promote_to_admin(db, admin["id"])
+    token = login(client, "budget_admin@example.com")
+
+    # auth (cache miss: user + roles) + users + roles
+    with query_budget(4):
+        first = client.get("/api/v1/users/", headers=auth_headers(token))
+    assert first.status_code == 200
+
+    for i in range(5):
+        register_user(client, f"budget_extra{i}@example.com")
+
+    # Principal is cached now; five more users must not add any queries
+    with query_budget(2):
+        second = client.get("/api/v1/users/", headers=auth_headers(token))
+    assert len(second.json()) == len(first.json()) + 5
+    assert all(u["roles"] for u in second.json())
+
+
+def test_task_reads_do_not_load_roles(client, query_budget):
+    register_user(client, "budget_tasks@example.com")
+    token = login(client, "budget_tasks@example.com")
+    task = client.post("/api/v1/tasks/", json={"title": "Budgeted"}, headers=auth_headers(token)).json()
+    with query_budget(1):
+        assert client.get(f"/api/v1/tasks/{task['id']}", headers=auth_headers(token)).status_code == 200
+    # The page query is the only one; its ETag comes from the rendered page
+    with query_budget(1):
+        listing = client.get("/api/v1/tasks/", headers=auth_headers(token))
+        assert listing.status_code == 200
+    with query_budget(1):
+        cached = client.get("/api/v1/tasks/", headers={**auth_headers(token), "If-None-Match": listing.headers["etag"]})
+        assert cached.status_code == 304
+
+
+def test_registration_is_one_transaction(client, query_budget, session_factory):
+    register_user(client, "budget_reg_first@example.com")
+    # user + contact + role link + outbox email; the baseline role is already resolved
+    with query_budget(4):
+        created = register_user(client, "budget_reg_second@example.com")
+    assert [r["name"] for r in created["roles"]] == ["user"]
+
+    payload = {
+        "email": "budget_reg_second@example.com",
+        "password": "x",
+        "contact": {"email": "budget_reg_dupe@example.com", "first_name": "D", "last_name": "Upe"},
+    }
+    r = client.post("/api/v1/users/", json=payload)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Email already registered"
+    db = session_factory()
+    try:
+        # The duplicate's contact was rolled back with it
+        assert db.query(Contact).filter(Contact.email == "budget_reg_dupe@example.com").count() == 0
+    finally:
+        db.close()
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+from app.modules.reports.models import DailyRollup
+from app.modules.users.models import User
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+# Rollups are keyed by UTC day
+TODAY = datetime.utcnow().date().isoformat()
+
+
+def register_placed_user(client, email: str, region: str, unit: str) -> dict:
+    payload = {
+        "email": email,
+        "password": "password123",
+        "contact": {
+            "email": email,
+            "first_name": "Report",
+            "last_name": "User",
+            "phone_number": "123",
+            "postal_address": "addr",
+            "region": region,
+            "organizational_unit": unit,
+        },
+    }
+    r = client.post("/api/v1/users/", json=payload)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def summary(client, headers, dimension: str) -> dict:
+    r = client.get(
+        "/api/v1/reports/summary",
+        params={"dimension": dimension, "start": TODAY, "end": TODAY},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    return {row["key"]: row for row in r.json()}
+
+
+def test_rollups_track_task_and_asset_writes(client, session_factory, query_budget):
+    volunteer = register_placed_user(client, "rollup-volunteer@example.com", "Rollup North", "Rollup Unit A")
+    admin = register_user(client, "rollup-admin@example.com")
+    with session_factory() as db:
+        promote_to_admin(db, admin["id"])
+    volunteer_headers = auth_headers(login(client, "rollup-volunteer@example.com"))
+    headers = auth_headers(login(client, "rollup-admin@example.com"))
+
+    task_ids = []
+    for i in range(3):
+        r = client.post("/api/v1/tasks/", json={"title": f"Rollup {i}"}, headers=volunteer_headers)
+        assert r.status_code == 201, r.text
+        task_ids.append(r.json()["id"])
+    r = client.put(f"/api/v1/tasks/{task_ids[0]}", json={"status": "completed"}, headers=volunteer_headers)
+    assert r.status_code == 200, r.text
+    assert client.delete(f"/api/v1/tasks/{task_ids[2]}", headers=volunteer_headers).status_code == 200
+    r = client.post("/api/v1/assets/", json={"name": "Rollup radio"}, headers=headers)
+    assert r.status_code == 201, r.text
+    r = client.post(f"/api/v1/assets/{r.json()['id']}/assign/{volunteer['id']}", headers=headers)
+    assert r.status_code == 200, r.text
+
+    expected = {"tasks_created": 2, "tasks_completed": 1, "assets_assigned": 1}
+    # Reports read only the rollup table, whatever the size of tasks and assets
+    with query_budget(4) as counter:
+        by_user = summary(client, headers, "user")[str(volunteer["id"])]
+    assert not any("FROM tasks" in statement for statement in counter.statements)
+    assert {k: by_user[k] for k in expected} == expected
+    assert by_user["average_completion_seconds"] >= 0
+    by_region = summary(client, headers, "region")["Rollup North"]
+    assert {k: by_region[k] for k in expected} == expected
+    by_unit = summary(client, headers, "organizational_unit")["Rollup Unit A"]
+    assert {k: by_unit[k] for k in expected} == expected
+
+    r = client.get(
+        "/api/v1/reports/daily",
+        params={"dimension": "user", "key": str(volunteer["id"]), "start": TODAY, "end": TODAY},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    assert [(row["day"], row["tasks_created"]) for row in r.json()] == [(TODAY, 2)]
+
+    # Moving the volunteer to another region moves their history with them
+    contact_id = client.get("/api/v1/users/me/contact", headers=volunteer_headers).json()["id"]
+    r = client.put(f"/api/v1/contacts/{contact_id}", json={"region": "Rollup South"}, headers=volunteer_headers)
+    assert r.status_code == 200, r.text
+    regions = summary(client, headers, "region")
+    assert "Rollup North" not in regions
+    assert {k: regions["Rollup South"][k] for k in expected} == expected
+
+    with session_factory() as db:
+        incremental = sorted(
+            (row.dimension, row.day, row.key, row.tasks_created, row.tasks_completed, row.assets_assigned)
+            for row in db.query(DailyRollup)
+            if row.tasks_created or row.tasks_completed or row.assets_assigned
+        )
+    r = client.post("/api/v1/reports/rollups/rebuild", headers=headers)
+    assert r.status_code == 200, r.text
+    with session_factory() as db:
+        rebuilt = sorted(
+            (row.dimension, row.day, row.key, row.tasks_created, row.tasks_completed, row.assets_assigned)
+            for row in db.query(DailyRollup)
+        )
+    assert rebuilt == incremental
+    assert r.json()["rows"] == len(rebuilt)
+
+
+def test_reports_require_admin_and_a_valid_range(client, session_factory):
+    register_user(client, "rollup-reader@example.com")
+    headers = auth_headers(login(client, "rollup-reader@example.com"))
+    params = {"start": TODAY, "end": TODAY}
+    assert client.get("/api/v1/reports/daily", params=params, headers=headers).status_code == 403
+
+    with session_factory() as db:
+        promote_to_admin(db, db.query(User).filter(User.email == "rollup-reader@example.com").one().id)
+    headers = auth_headers(login(client, "rollup-reader@example.com"))
+    backwards = {"start": TODAY, "end": (datetime.utcnow().date() - timedelta(days=1)).isoformat()}
+    assert client.get("/api/v1/reports/daily", params=backwards, headers=headers).status_code == 400
@@ -0,0 +1,44 @@
+from app.db.slow_queries import parameter_shape, slow_query_log
+from test_roles import auth_headers, login, promote_to_admin, register_user
+
+
+def test_slow_query_log_records_route_and_parameter_shapes(client, session_factory, async_session_factory, monkeypatch):
+    slow_query_log.install(session_factory.kw["bind"], "test-sync")
+    slow_query_log.install(async_session_factory.kw["bind"].sync_engine, "test-async")
+    admin = register_user(client, "slowq_admin@example.com")
+    register_user(client, "slowq_user@example.com")
+    db = session_factory()
+    try:
+        promote_to_admin(db, admin["id"])
+    finally:
+        db.close()
+    admin_headers = auth_headers(login(client, "slowq_admin@example.com"))
+    user_headers = auth_headers(login(client, "slowq_user@example.com"))
+
+    slow_query_log.clear()
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0.0)
+    assert client.get("/api/v1/tasks/987654", headers=user_headers).status_code == 404
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 10_000.0)
+
+    response = client.get("/api/v1/diagnostics/slow-queries", headers=admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["threshold_ms"] == 10_000.0
+    entries = [e for e in body["entries"] if e["route"] == "GET /api/v1/tasks/{task_id}"]
+    task_lookup = next(e for e in entries if "FROM tasks" in e["statement"])
+    # Shapes only: the looked-up id never appears
+    assert "987654" not in str(task_lookup["parameters"])
+    assert "int" in str(task_lookup["parameters"])
+    assert task_lookup["plan"] is None  # EXPLAIN is only captured on Postgres
+    durations = [e["duration_ms"] for e in body["entries"]]
+    assert durations == sorted(durations, reverse=True)
+
+    assert client.get("/api/v1/diagnostics/slow-queries", headers=user_headers).status_code == 403
+    assert client.delete("/api/v1/diagnostics/slow-queries", headers=admin_headers).status_code == 204
+    assert client.get("/api/v1/diagnostics/slow-queries", headers=admin_headers).json()["entries"] == []
+
+
+def test_parameter_shape():
+    assert parameter_shape({"id": 1, "email": "a@b.c"}) == {"id": "int", "email": "str"}
+    assert parameter_shape((1, None)) == ["int", "NoneType"]
+    assert parameter_shape([{"id": 1}, {"id": 2}], executemany=True) == ["2 rows", {"id": "int"}]
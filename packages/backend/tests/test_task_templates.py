@@ -0,0 +1,167 @@
+import pytest
+from fastapi import HTTPException
+
+from app.db.pagination import encode_cursor
+from app.modules.task_templates import schemas as template_schemas
+from app.modules.task_templates import services as template_services
+from app.modules.task_templates.validators import validator_cache
+from app.modules.tasks import schemas as task_schemas
+from app.modules.tasks import services as task_services
+from app.modules.users.models import User
+
+
+def make_template(db, name):
+    return template_services.create_template(db, template_schemas.TaskTemplateCreate(
+        name=name,
+        fields_schema=[
+            {"name": "shift", "label": "Shift", "type": "select", "required": True, "options": ["am", "pm"]},
+            {"name": "hours", "label": "Hours", "type": "number"},
+            {"name": "start", "label": "Start", "type": "date"},
+            {"name": "driver", "label": "Driver", "type": "checkbox"},
+        ],
+    ))
+
+
+def make_owner(db, email):
+    user = User(email=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_custom_data_is_type_checked(session_factory):
+    db = session_factory()
+    template = make_template(db, "Roster shift")
+    owner = make_owner(db, "validator_owner@example.com")
+
+    def create(custom_data):
+        return task_services.create_task(db, task_schemas.TaskCreate(
+            title="Shift", owner_id=owner.id, template_id=template.id, custom_data=custom_data,
+        ))
+
+    task = create({"shift": "am", "hours": "4.5", "start": "2025-09-01", "driver": True})
+    assert task.custom_data["shift"] == "am"
+    # Optional non-text fields left blank by the form are accepted
+    create({"shift": "pm", "start": ""})
+
+    with pytest.raises(HTTPException) as missing:
+        create({"hours": 3})
+    assert "shift" in missing.value.detail
+
+    for bad in ({"shift": "night"}, {"shift": "am", "hours": "lots"}, {"shift": "am", "start": "someday"}):
+        with pytest.raises(HTTPException) as invalid:
+            create(bad)
+        assert invalid.value.status_code == 422
+    db.close()
+
+
+def test_template_update_invalidates_cached_validator(session_factory):
+    db = session_factory()
+    template = make_template(db, "Cached template")
+    first = validator_cache.get(db, template.id)
+    assert validator_cache.get(db, template.id) is first
+
+    template_services.update_template(db, template.id, template_schemas.TaskTemplateUpdate(
+        fields_schema=[{"name": "site", "label": "Site", "type": "text", "required": True}],
+    ))
+    assert template.version == 2
+    second = validator_cache.get(db, template.id)
+    assert second is not first
+    assert second.required == ["site"]
+
+    template_services.delete_template(db, template.id)
+    assert validator_cache.get(db, template.id) is None
+    db.close()
+
+
+def test_template_reads_are_cached_until_written(session_factory):
+    from app.db.query_counter import QueryCounter
+    from app.modules.task_templates.cache import template_cache
+
+    db = session_factory()
+    template = make_template(db, "Read-through template")
+    engine = session_factory.kw["bind"]
+    names = [t.name for t in template_services.get_all_templates(db)]
+    assert "Read-through template" in names
+    assert template_services.get_cached_template(db, template.id).version == 1
+
+    with QueryCounter(engine) as counter:
+        template_services.get_all_templates(db)
+        template_services.get_cached_template(db, template.id)
+        validator_cache.get(db, template.id)
+    assert counter.count == 0
+
+    template_services.update_template(db, template.id, template_schemas.TaskTemplateUpdate(description="Changed"))
+    assert template_services.get_cached_template(db, template.id).description == "Changed"
+    created = make_template(db, "Another template")
+    assert "Another template" in [t.name for t in template_services.get_all_templates(db)]
+    template_services.delete_template(db, created.id)
+    assert template_services.get_cached_template(db, created.id) is None
+    assert "Another template" not in [t.name for t in template_cache.list(db)]
+    db.close()
+
+
+def test_invalidation_reaches_caches_sharing_a_bus(session_factory):
+    import json
+
+    from app.core.invalidation import InvalidationBus, PostgresNotifyBus
+    from app.modules.task_templates.cache import INVALIDATION_CHANNEL, TemplateCache
+
+    bus = InvalidationBus()
+    worker_a, worker_b = TemplateCache(bus), TemplateCache(bus)
+    db = session_factory()
+    template = make_template(db, "Shared template")
+    assert worker_b.get(db, template.id).description is None
+    db.query(type(template)).filter_by(id=template.id).update({"description": "Edited elsewhere"})
+    db.commit()
+    assert worker_b.get(db, template.id).description is None
+    worker_a.invalidate(template.id)
+    assert worker_b.get(db, template.id).description == "Edited elsewhere"
+    db.close()
+
+    # NOTIFY payloads from other processes are dispatched; our own are skipped
+    pg_bus = PostgresNotifyBus(engine=None)
+    received = []
+    pg_bus.subscribe(INVALIDATION_CHANNEL, received.append)
+    pg_bus._handle(json.dumps({"origin": "other", "channel": INVALIDATION_CHANNEL, "key": "7"}))
+    pg_bus._handle(json.dumps({"origin": pg_bus.origin, "channel": INVALIDATION_CHANNEL, "key": "8"}))
+    assert received == ["7"]
+
+
+def test_template_cursor_follows_cached_order(session_factory):
+    db = session_factory()
+    for name in ("cursor Beta", "Cursor alpha", "cursor Äpfel"):
+        make_template(db, name)
+    templates = template_services.get_all_templates(db, limit=1000)
+    walked, cursor = [], None
+    while True:
+        page = template_services.get_all_templates(db, limit=2, cursor=cursor)
+        walked += [t.id for t in page]
+        if len(page) < 2:
+            break
+        cursor = encode_cursor(page[-1].name, page[-1].id)
+    assert walked == [t.id for t in templates]
+
+    for bad in (encode_cursor(None, 5), encode_cursor(3, 5), "not-a-cursor"):
+        with pytest.raises(HTTPException) as invalid:
+            template_services.get_all_templates(db, cursor=bad)
+        assert invalid.value.status_code == 400
+    db.close()
+
+
+def test_validator_cache_honours_template_version_after_a_missed_broadcast(session_factory):
+    from app.modules.task_templates.cache import template_cache
+
+    db = session_factory()
+    template = make_template(db, "Missed broadcast")
+    stale = validator_cache.get(db, template.id)
+    # Another worker updated the template, but its invalidation never arrived here
+    template.fields_schema = [{"name": "site", "label": "Site", "type": "text", "required": True}]
+    template.version += 1
+    db.commit()
+    assert validator_cache.get(db, template.id) is stale
+
+    # Once the template cache entry expires, the new version is picked up
+    template_cache.clear()
+    assert validator_cache.get(db, template.id).required == ["site"]
+    db.close()
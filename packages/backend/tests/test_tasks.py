@@ -42,3 +42,211 @@ def test_task_crud_cycle(client):
     assert del_resp.status_code == 200
     get_resp = client.get(f"/api/v1/tasks/{task_id}", headers=auth_headers(token))
     assert get_resp.status_code == 404
+
+def test_task_list_cursor_pagination(client):
+    token = create_and_login_user(client, email="pager@example.com")
+    created = []
+    for i in range(5):
+        r = client.post("/api/v1/tasks/", json={"title": f"Page {i}"}, headers=auth_headers(token))
+        assert r.status_code == 201, r.text
+        created.append(r.json()["id"])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/api/v1/tasks/", params=params, headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        seen.extend(t["id"] for t in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == created
+
+    # skip/limit keeps working for older clients and uses the same ordering
+    r = client.get("/api/v1/tasks/", params={"skip": 2, "limit": 2}, headers=auth_headers(token))
+    assert [t["id"] for t in r.json()] == created[2:4]
+
+    bad = client.get("/api/v1/tasks/", params={"cursor": "not-a-cursor"}, headers=auth_headers(token))
+    assert bad.status_code == 400
+
+def test_task_list_filters_and_sort(client):
+    token = create_and_login_user(client, email="filters@example.com")
+    specs = [
+        ("A", "pending", "2026-01-10T00:00:00"),
+        ("B", "in_progress", "2026-01-05T00:00:00"),
+        ("C", "pending", None),
+        ("D", "completed", "2026-02-01T00:00:00"),
+        ("E", "pending", "2026-01-20T00:00:00"),
+    ]
+    ids = {}
+    for title, task_status, due in specs:
+        r = client.post(
+            "/api/v1/tasks/",
+            json={"title": title, "status": task_status, "due_date": due},
+            headers=auth_headers(token),
+        )
+        assert r.status_code == 201, r.text
+        ids[title] = r.json()["id"]
+
+    def titles(params):
+        r = client.get("/api/v1/tasks/", params=params, headers=auth_headers(token))
+        assert r.status_code == 200, r.text
+        return [t["title"] for t in r.json()]
+
+    assert titles({"status": "pending"}) == ["A", "C", "E"]
+    assert titles({"status": ["pending", "completed"], "sort": "-title"}) == ["E", "D", "C", "A"]
+    assert titles({"due_after": "2026-01-06T00:00:00", "due_before": "2026-02-01T00:00:00"}) == ["A", "E"]
+    assert titles({"sort": "due_date"}) == ["B", "A", "E", "D", "C"]
+
+    # Cursor paging over a nullable, descending sort key keeps the same order
+    def walk(sort):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, "sort": sort}
+            if cursor:
+                params["cursor"] = cursor
+            r = client.get("/api/v1/tasks/", params=params, headers=auth_headers(token))
+            assert r.status_code == 200, r.text
+            seen.extend(t["title"] for t in r.json())
+            cursor = r.headers.get("X-Next-Cursor")
+            if not cursor:
+                return seen
+
+    assert walk("-due_date") == ["C", "D", "E", "A", "B"]
+    assert walk("due_date") == ["B", "A", "E", "D", "C"]
+
+    bad = client.get("/api/v1/tasks/", params={"sort": "description"}, headers=auth_headers(token))
+    assert bad.status_code == 400
+
+def test_bulk_task_create_single_insert_and_per_item_errors(client, session_factory):
+    from sqlalchemy import event
+    from app.db.session import get_db
+    from main import app
+    from test_roles import promote_to_admin
+
+    token = create_and_login_user(client, email="bulk_admin@example.com")
+    me = client.get("/api/v1/users/me", headers=auth_headers(token)).json()
+    db = next(app.dependency_overrides[get_db]())
+    promote_to_admin(db, me["id"])
+    token = client.post("/api/v1/token", data={"username": "bulk_admin@example.com", "password": "password123"}).json()["access_token"]
+    other_token = create_and_login_user(client, email="bulk_member@example.com")
+    other = client.get("/api/v1/users/me", headers=auth_headers(other_token)).json()
+
+    payload = {"tasks": [
+        {"title": "Setup", "owner_id": me["id"]},
+        {"title": "Ghost", "owner_id": 999999},
+        {"title": "Marshal", "owner_id": other["id"], "status": "in_progress"},
+        {"title": "Templated", "owner_id": other["id"], "template_id": 999999},
+        {"title": "Pack down", "owner_id": other["id"]},
+    ]}
+
+    inserts = []
+    engine = session_factory.kw["bind"]
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tasks"):
+            inserts.append(statement)
+    event.listen(engine, "before_cursor_execute", count_inserts)
+    try:
+        r = client.post("/api/v1/tasks/bulk", json=payload, headers=auth_headers(token))
+    finally:
+        event.remove(engine, "before_cursor_execute", count_inserts)
+
+    assert r.status_code == 201, r.text
+    body = r.json()
+    assert [t["title"] for t in body["created"]] == ["Setup", "Marshal", "Pack down"]
+    assert [e["index"] for e in body["errors"]] == [1, 3]
+    assert len(inserts) == 1
+
+    forbidden = client.post("/api/v1/tasks/bulk", json=payload, headers=auth_headers(other_token))
+    assert forbidden.status_code == 403
+
+def test_status_board_counters_and_reconcile(client, session_factory):
+    from sqlalchemy import func
+    from app.modules.tasks.models import Task, TaskStatus, TaskStatusCount
+    from test_roles import promote_to_admin
+
+    token = create_and_login_user(client, email="board@example.com")
+    me = client.get("/api/v1/users/me", headers=auth_headers(token)).json()
+    ids = []
+    for task_status in ["pending", "pending", "in_progress", "completed"]:
+        r = client.post("/api/v1/tasks/", json={"title": "Board", "status": task_status}, headers=auth_headers(token))
+        ids.append(r.json()["id"])
+    client.put(f"/api/v1/tasks/{ids[0]}", json={"status": "completed"}, headers=auth_headers(token))
+    client.put(f"/api/v1/tasks/{ids[1]}", json={"title": "Renamed"}, headers=auth_headers(token))
+    client.delete(f"/api/v1/tasks/{ids[2]}", headers=auth_headers(token))
+
+    board = client.get("/api/v1/tasks/board", headers=auth_headers(token))
+    assert board.status_code == 200, board.text
+    assert board.json() == {
+        "owner_id": me["id"],
+        "counts": {"pending": 1, "in_progress": 0, "completed": 2, "cancelled": 0},
+        "total": 3,
+    }
+    assert client.get("/api/v1/tasks/board/all", headers=auth_headers(token)).status_code == 403
+
+    db = session_factory()
+    try:
+        promote_to_admin(db, me["id"])
+        actual = dict(db.query(Task.status, func.count()).group_by(Task.status).all())
+        # Simulate drift on the user's counters
+        row = db.get(TaskStatusCount, (me["id"], TaskStatus.COMPLETED))
+        row.count = 42
+        db.commit()
+    finally:
+        db.close()
+    token = client.post("/api/v1/token", data={"username": "board@example.com", "password": "password123"}).json()["access_token"]
+
+    org = client.get("/api/v1/tasks/board/all", headers=auth_headers(token)).json()
+    assert org["total"] == sum(actual.values())
+    assert org["counts"]["completed"] == actual.get(TaskStatus.COMPLETED, 0)
+
+    r = client.post("/api/v1/tasks/board/reconcile", headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    assert r.json()["corrected"] >= 1
+    mine = client.get("/api/v1/tasks/board/all", params={"owner_id": me["id"]}, headers=auth_headers(token)).json()
+    assert mine["counts"]["completed"] == 2
+
+
+def test_reconciler_needs_no_leader_lock_off_postgres(session_factory):
+    from app.modules.tasks.counters import StatusCountReconciler
+
+    reconciler = StatusCountReconciler(session_factory, interval_seconds=3600)
+    # Advisory-lock leadership only applies on Postgres
+    assert reconciler.is_leader()
+    reconciler.run_once()
+    assert reconciler.run_once() == 0
+    reconciler.stop()
+
+
+def test_update_counts_status_committed_by_another_session(client, session_factory, monkeypatch):
+    from app.modules.tasks import services
+    from app.modules.tasks.models import Task, TaskStatus
+
+    token = create_and_login_user(client, email="board_race@example.com")
+    task_id = client.post("/api/v1/tasks/", json={"title": "Race", "status": "pending"}, headers=auth_headers(token)).json()["id"]
+
+    get_task = services.get_task
+
+    def get_task_then_race(db, task_id, for_update=False):
+        task = get_task(db, task_id, for_update)
+        if not for_update:
+            # Another request starts the task after the router loaded it, before the locked re-read
+            other = session_factory()
+            try:
+                other.get(Task, task_id).status = TaskStatus.IN_PROGRESS
+                services.record_status_change(other, task.owner_id, TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+                other.commit()
+            finally:
+                other.close()
+        return task
+
+    monkeypatch.setattr(services, "get_task", get_task_then_race)
+    r = client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"}, headers=auth_headers(token))
+    assert r.status_code == 200, r.text
+    monkeypatch.undo()
+
+    counts = client.get("/api/v1/tasks/board", headers=auth_headers(token)).json()["counts"]
+    assert counts == {"pending": 0, "in_progress": 0, "completed": 1, "cancelled": 0}